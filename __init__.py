@@ -11,4 +11,5 @@ from .config import Config
 from .dbc_loader import DBCLoader
 from .asc_parser import ASCParser
 from .data_processor import DataProcessor
-from .csv_writer import CSVWriter
\ No newline at end of file
+from .csv_writer import CSVWriter
+from .arrow_writer import ArrowWriter
\ No newline at end of file
@@ -0,0 +1,425 @@
+# asc_to_csv/arrow_writer.py
+"""
+列式文件输出模块
+将与CSVWriter相同的分组数据写为Parquet或Feather（Arrow IPC）文件，
+列带有int/float/分类类型，单位等信号信息保存在列元数据中（需要安装pyarrow）
+"""
+
+import os
+import contextlib
+from typing import Any, Dict, Iterator, List, Tuple
+from collections.abc import Mapping
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+from csv_writer import CSVWriter
+from long_writer import LongWriter
+from sample_store import AggregatedView
+
+
+# 输出格式到文件扩展名的映射
+OUTPUT_FORMATS = {
+    "csv": ".csv",
+    "parquet": ".parquet",
+    "feather": ".feather",
+}
+
+# 各列式格式支持的压缩方式（第一个为默认）
+ARROW_COMPRESSIONS = {
+    "parquet": ("zstd", "snappy", "gzip", "brotli", "lz4", "none"),
+    "feather": ("zstd", "lz4", "none"),
+}
+
+# 每个记录批次（Parquet行组）的行数，限制写入时的内存占用
+ARROW_BATCH_ROWS = 8192
+
+
+def arrow_available() -> bool:
+    """判断是否可以输出列式文件（pyarrow已安装）"""
+    return pa is not None
+
+
+def create_writer(config) -> CSVWriter:
+    """
+    按配置创建输出写入器
+    
+    Args:
+        config: 配置对象
+    
+    Returns:
+        CSVWriter: output_layout为long时为LongWriter，output_format不为csv时为ArrowWriter
+    """
+    writer_options = dict(
+        output_dir=config.output_dir,
+        encoding=config.csv_encoding,
+        group_size=config.group_size,
+        fill_interval=config.fill_interval,
+        sample_interval=config.sample_interval,
+        fill_strategy=config.fill_strategy,
+        fill_max_age=config.fill_max_age
+    )
+    csv_options = dict(
+        compression=config.csv_compression,
+        compression_level=config.csv_compression_level,
+        compression_threads=config.csv_compression_threads
+    )
+    if config.output_layout == "long":
+        return LongWriter(**writer_options, **csv_options)
+    if config.output_format != "csv":
+        return ArrowWriter(
+            output_format=config.output_format,
+            compression=config.arrow_compression,
+            **writer_options
+        )
+    return CSVWriter(**writer_options, **csv_options)
+
+
+class _Categories:
+    """
+    分类列的字典
+    
+    跨批次只追加新类别，后一批次的字典总以前一批次的字典为前缀，
+    Feather文件可以只写字典增量，Parquet各行组的编码也保持一致。
+    """
+    
+    __slots__ = ('codes', 'names')
+    
+    def __init__(self):
+        self.codes: Dict[str, int] = {}
+        self.names: List[str] = []
+    
+    def encode(self, values) -> "pa.DictionaryArray":
+        """
+        将一列值编码为字典数组（值按str转换，与CSV中的文本一致）
+        
+        Args:
+            values: 值序列，空值为None
+        
+        Returns:
+            pa.DictionaryArray: int32下标 + string字典
+        """
+        codes = self.codes
+        indices = []
+        for value in values:
+            if value is None:
+                indices.append(None)
+                continue
+            text = str(value)
+            code = codes.get(text)
+            if code is None:
+                code = codes[text] = len(self.names)
+                self.names.append(text)
+            indices.append(code)
+        return pa.DictionaryArray.from_arrays(
+            pa.array(indices, type=pa.int32()),
+            pa.array(self.names, type=pa.string())
+        )
+
+
+class ArrowWriter(CSVWriter):
+    """
+    列式文件写入器
+    
+    分组方式、空值填充和Summary.csv与CSVWriter相同，分组文件和信号总览文件
+    写为Parquet或Feather。列名为信号短名称（同一文件中重名时为"消息::信号"），
+    单位、完整信号名称、消息和DBC保存在列元数据中。每列的类型由采样数据确定：
+    含枚举等非数值的信号为分类列，其余为int64或float64（linear填充时整数列为float64）。
+    列式文件不插入分组空行（group_size仅对CSV有效）。
+    
+    Attributes:
+        output_format: 输出格式（parquet或feather）
+        compression: 压缩方式（见ARROW_COMPRESSIONS）
+    """
+    
+    def __init__(
+        self,
+        output_dir: str,
+        output_format: str = "parquet",
+        compression: str = "zstd",
+        **kwargs
+    ):
+        """
+        初始化列式文件写入器
+        
+        Args:
+            output_dir: 输出目录
+            output_format: 输出格式（parquet或feather）
+            compression: 压缩方式
+            **kwargs: 传给CSVWriter的其他参数
+        """
+        super().__init__(output_dir, **kwargs)
+        if output_format not in ARROW_COMPRESSIONS:
+            raise ValueError(f"未知的列式输出格式: {output_format}")
+        if compression not in ARROW_COMPRESSIONS[output_format]:
+            raise ValueError(f"{output_format}不支持压缩方式: {compression}")
+        if not arrow_available():
+            raise RuntimeError(f"输出{output_format}格式需要安装pyarrow")
+        
+        self.output_format = output_format
+        self.compression = compression
+        self.extension = OUTPUT_FORMATS[output_format]
+        self._column_kinds: Dict[str, str] = {}
+    
+    def write_all(
+        self,
+        sorted_groups: List[str],
+        classified_signals: Dict[str, List[str]],
+        time_ticks: List[int],
+        aggregated_data: Mapping,
+        signal_info: Dict[str, Dict[str, str]],
+        statistics: Dict[str, int]
+    ) -> List[str]:
+        """
+        写入所有文件（先确定每列的类型，其余同CSVWriter.write_all）
+        
+        Args:
+            sorted_groups: 排序后的分组列表
+            classified_signals: 分类后的信号
+            time_ticks: 升序的采样桶号
+            aggregated_data: 聚合后的数据
+            signal_info: 信号信息
+            statistics: 统计信息
+        
+        Returns:
+            List[str]: 生成的文件列表
+        """
+        all_signals = sorted({sig_name for signals in classified_signals.values() for sig_name in signals})
+        with self._stage("infer_kinds"):
+            self._column_kinds = self._infer_kinds(aggregated_data, all_signals)
+        return super().write_all(
+            sorted_groups, classified_signals, time_ticks,
+            aggregated_data, signal_info, statistics
+        )
+    
+    def _infer_kinds(self, aggregated_data: Mapping, signals: List[str]) -> Dict[str, str]:
+        """
+        确定每个信号列的类型
+        
+        数据来自SampleStore时直接按列存储判断（有非数值为category，浮点数组为float，
+        否则为int），其他映射遍历一次所有值。
+        
+        Args:
+            aggregated_data: 聚合后的数据
+            signals: 信号列表
+        
+        Returns:
+            Dict[str, str]: 信号名称到"int"、"float"或"category"的映射
+        """
+        kinds: Dict[str, str] = {}
+        store = aggregated_data.store if isinstance(aggregated_data, AggregatedView) else None
+        if store is not None:
+            for sig_name in signals:
+                signal_id = store.signal_ids.get(sig_name)
+                if signal_id is None:
+                    continue
+                column = store.columns[signal_id]
+                if column.objects:
+                    kinds[sig_name] = "category"
+                elif column.values.typecode == 'd':
+                    kinds[sig_name] = "float"
+                else:
+                    kinds[sig_name] = "int"
+        else:
+            for row in aggregated_data.values():
+                for sig_name, value in row.items():
+                    if value is None or kinds.get(sig_name) == "category":
+                        continue
+                    if type(value) is int:
+                        kinds.setdefault(sig_name, "int")
+                    elif type(value) is float:
+                        kinds[sig_name] = "float"
+                    else:
+                        kinds[sig_name] = "category"
+        
+        result = {}
+        for sig_name in signals:
+            kind = kinds.get(sig_name, "float")
+            if kind == "int" and self.fill_strategy == "linear":
+                kind = "float"
+            result[sig_name] = kind
+        return result
+    
+    def _field(self, sig_name: str, column_name: str, signal_info: Dict) -> "pa.Field":
+        """
+        创建信号列的字段（类型和元数据）
+        
+        Args:
+            sig_name: 完整信号名称
+            column_name: 列名
+            signal_info: 信号信息
+        
+        Returns:
+            pa.Field: 字段
+        """
+        kind = self._column_kinds.get(sig_name, "float")
+        if kind == "category":
+            arrow_type = pa.dictionary(pa.int32(), pa.string())
+        elif kind == "int":
+            arrow_type = pa.int64()
+        else:
+            arrow_type = pa.float64()
+        
+        info = signal_info.get(sig_name, {})
+        metadata = {
+            'signal': sig_name,
+            'unit': info.get('unit', ''),
+            'message': info.get('message', ''),
+            'dbc': info.get('dbc', ''),
+        }
+        return pa.field(column_name, arrow_type, metadata=metadata)
+    
+    def _schema(self, signals: List[str], signal_info: Dict) -> "pa.Schema":
+        """
+        创建文件的表结构
+        
+        Args:
+            signals: 信号列表（列顺序）
+            signal_info: 信号信息
+        
+        Returns:
+            pa.Schema: 第0列为时间，其后为信号列
+        """
+        short_names = [sig_name.split('::')[-1] for sig_name in signals]
+        fields = [pa.field("Time[s]", pa.float64(), metadata={'unit': 's'})]
+        for sig_name, short_name in zip(signals, short_names):
+            column_name = short_name
+            if short_names.count(short_name) > 1:
+                column_name = '::'.join(sig_name.split('::')[-2:])
+            fields.append(self._field(sig_name, column_name, signal_info))
+        
+        metadata = {
+            'sample_interval': str(self.sample_interval),
+            'fill_strategy': self.fill_strategy,
+            'fill_interval': str(self.fill_interval),
+        }
+        return pa.schema(fields, metadata=metadata)
+    
+    def _open_file(self, stack: contextlib.ExitStack, file_path: str, schema: "pa.Schema"):
+        """
+        打开列式文件写入器
+        
+        Args:
+            stack: 负责关闭写入器的ExitStack
+            file_path: 文件路径
+            schema: 表结构
+        
+        Returns:
+            写入器（pq.ParquetWriter或pa.ipc.RecordBatchFileWriter）
+        """
+        if self.output_format == "parquet":
+            writer = pq.ParquetWriter(file_path, schema, compression=self.compression)
+        else:
+            options = pa.ipc.IpcWriteOptions(
+                compression=None if self.compression == "none" else self.compression,
+                emit_dictionary_deltas=True
+            )
+            writer = pa.ipc.new_file(file_path, schema, options=options)
+        return stack.enter_context(writer)
+    
+    def _write_data_files(
+        self,
+        sorted_groups: List[str],
+        classified_signals: Dict,
+        all_sorted_signals: List[str],
+        rows: Iterator[Tuple[int, List[Any]]],
+        signal_info: Dict
+    ) -> Tuple[List[str], str]:
+        """
+        一次遍历写入所有分组文件和信号总览文件
+        
+        每ARROW_BATCH_ROWS行转换一次列数组，各分组文件的批次直接引用总览批次中的列，
+        每列只转换一次。
+        
+        Args:
+            sorted_groups: 排序后的分组
+            classified_signals: 分类信号
+            all_sorted_signals: 排序后的全部信号（总览文件列顺序）
+            rows: 填充后的行，值与all_sorted_signals同序
+            signal_info: 信号信息
+        
+        Returns:
+            Tuple[List[str], str]: (分组文件路径列表, 总览文件路径)
+        """
+        # 总览批次第0列为时间，信号列从1开始
+        column_of = {
+            sig_name: index
+            for index, sig_name in enumerate(all_sorted_signals, start=1)
+        }
+        categories = {
+            sig_name: _Categories()
+            for sig_name in all_sorted_signals
+            if self._column_kinds.get(sig_name) == "category"
+        }
+        
+        group_files = []
+        group_outputs = []
+        with contextlib.ExitStack() as stack:
+            for group_name in sorted_groups:
+                file_path = os.path.join(self.output_dir, f"{group_name}{self.extension}")
+                sorted_signals = sorted(classified_signals[group_name])
+                schema = self._schema(sorted_signals, signal_info)
+                writer = self._open_file(stack, file_path, schema)
+                indices = [0] + [column_of[sig_name] for sig_name in sorted_signals]
+                group_files.append(file_path)
+                group_outputs.append((writer, schema, indices))
+            
+            all_signals_path = os.path.join(self.output_dir, f"All_Signals{self.extension}")
+            all_schema = self._schema(all_sorted_signals, signal_info)
+            all_writer = self._open_file(stack, all_signals_path, all_schema)
+            
+            ticks: List[int] = []
+            batch_rows: List[List[Any]] = []
+            for tick, values in rows:
+                ticks.append(tick)
+                batch_rows.append(values)
+                if len(ticks) >= ARROW_BATCH_ROWS:
+                    self._write_batch(ticks, batch_rows, all_sorted_signals, categories, all_writer, all_schema, group_outputs)
+                    ticks, batch_rows = [], []
+            if ticks:
+                self._write_batch(ticks, batch_rows, all_sorted_signals, categories, all_writer, all_schema, group_outputs)
+        
+        return group_files, all_signals_path
+    
+    def _write_batch(
+        self,
+        ticks: List[int],
+        batch_rows: List[List[Any]],
+        signals: List[str],
+        categories: Dict[str, _Categories],
+        all_writer,
+        all_schema: "pa.Schema",
+        group_outputs: List[Tuple]
+    ) -> None:
+        """
+        将一批行转换为列数组并写入所有文件
+        
+        Args:
+            ticks: 采样桶号
+            batch_rows: 与ticks同序的值列表
+            signals: 全部信号（值列表顺序）
+            categories: 分类列的字典
+            all_writer: 总览文件写入器
+            all_schema: 总览文件表结构
+            group_outputs: [(写入器, 表结构, 总览列下标), ...]
+        """
+        interval = self.sample_interval
+        arrays = [pa.array([round(tick * interval, 1) for tick in ticks], type=pa.float64())]
+        columns = zip(*batch_rows) if signals else ()
+        for sig_name, arrow_type, values in zip(signals, all_schema.types[1:], columns):
+            if sig_name in categories:
+                arrays.append(categories[sig_name].encode(values))
+            else:
+                arrays.append(pa.array(values, type=arrow_type))
+        
+        all_writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=all_schema))
+        for writer, schema, indices in group_outputs:
+            writer.write_batch(pa.RecordBatch.from_arrays([arrays[index] for index in indices], schema=schema))
+    
+    def _summary_format_rows(self) -> List[List[str]]:
+        """汇总文件中的输出格式信息"""
+        return [["输出格式", self.output_format], ["压缩方式", self.compression]]
@@ -4,12 +4,34 @@ ASC文件解析模块
 负责解析ASC文件并提取CAN帧数据
 """
 
-import re
 import gc
-from typing import Dict, Set, Tuple, Optional
-from collections import defaultdict
+import io
+import os
+import re
+import mmap
+import heapq
+import contextlib
+from operator import itemgetter
+from typing import Dict, Iterator, List, Set, Tuple, Optional, Union
 import cantools
 
+from sample_store import SampleStore, SignalColumn
+from frame_decoder import FrameDecoder, DEFAULT_CACHE_SIZE
+from batch_decoder import BatchDecoder, MessageBatch, numpy_available
+from input_compression import detect_input_compression, open_compressed_input
+from progress import ProgressCallback, ProgressReporter, PROGRESS_BYTES, PROGRESS_LINES
+
+
+# 帧ID缓存中"尚未查询"的标记（None表示已查询但未映射）
+_UNSEEN = object()
+
+_DIRECTIONS = ('Rx', 'Tx')
+_DIRECTIONS_BYTES = (b'Rx', b'Tx')
+
+# 帧ID字段（与ASC_PATTERN中的帧ID部分一致；int(..., 16)还会接受0x前缀、符号和下划线）
+_FRAME_ID_PATTERN = re.compile(r'[0-9A-Fa-f]+x?')
+_FRAME_ID_PATTERN_BYTES = re.compile(rb'[0-9A-Fa-f]+x?')
+
 
 class ASCParser:
     """
@@ -18,67 +40,83 @@ class ASCParser:
     负责解析ASC文件，提取CAN帧并解码信号
     
     Attributes:
-        sampled_data: 采样后的数据
+        sampled_data: 采样后的数据（列式存储，见SampleStore）
         found_signals: 发现的信号集合
         original_count: 原始数据点数
+        progress: 进度回调（见progress.ProgressCallback），报告已读取的字节数和已解码的帧数，None表示不报告
     """
     
     ASC_PATTERN = r'^(\d+\.\d+)\s+(\d+)\s+([0-9A-Fa-f]+x?)\s+(Rx|Tx)\s+d\s+(\d+)\s+(([0-9A-Fa-f]{2}\s*)+)$'
     MAX_MEMORY_SIGNALS = 10000
     MAX_MEMORY_TIMESTAMPS = 100000
+    ENCODINGS = ('utf-8', 'gbk', 'gb2312', 'latin-1')
+    READERS = ('mmap', 'text')
     
-    def __init__(self, sample_interval: float = 0.1, debug: bool = False):
+    def __init__(
+        self,
+        sample_interval: float = 0.1,
+        debug: bool = False,
+        reader: str = "mmap",
+        default_reducer: str = "last",
+        signal_reducers: Optional[Dict[str, str]] = None,
+        decode_cache_size: int = DEFAULT_CACHE_SIZE,
+        compiled_decoders: bool = False,
+        batch_decode: bool = False
+    ):
         """
         初始化ASC解析器
         
         Args:
             sample_interval: 采样间隔（秒）
             debug: 是否启用调试模式
+            reader: 读取方式，"mmap"按字节行读取内存映射文件，"text"按文本逐行解码读取
+            default_reducer: 默认聚合方式（见sample_store.REDUCERS）
+            signal_reducers: 信号名称通配符模式到聚合方式的映射
+            decode_cache_size: 解码结果缓存条目数，0表示不缓存
+            compiled_decoders: 是否为每个消息生成专用解码器
+            batch_decode: 是否按消息批量解码（需要numpy，未安装时逐帧解码）
         """
         self.sample_interval = sample_interval
         self.debug = debug
-        self.sampled_data: Dict[float, Dict[str, list]] = defaultdict(lambda: defaultdict(list))
+        self.reader = reader
+        self.decode_cache_size = decode_cache_size
+        self.compiled_decoders = compiled_decoders
+        self.batch_decode = batch_decode
+        self.sampled_data = SampleStore(sample_interval, default_reducer, signal_reducers)
         self.found_signals: Set[str] = set()
         self.original_count: int = 0
+        self.progress: Optional[ProgressCallback] = None
+        self._progress = ProgressReporter(None, "parse")
         self._memory_warning_shown = False
+        self._frame_id_cache: Dict[Union[str, bytes], Optional[int]] = {}
+        self._message_columns: Dict[int, Dict[str, SignalColumn]] = {}
+        self._decoder: Optional[FrameDecoder] = None
+        self._batch_decoder: Optional[BatchDecoder] = None
     
     def parse(self, asc_file: str, message_map: Dict) -> bool:
         """
         解析ASC文件
         
         Args:
-            asc_file: ASC文件路径
+            asc_file: ASC文件路径（可以是gzip/bz2/xz/zstd/lz4压缩文件）
             message_map: 消息映射（来自DBCLoader）
-            
+        
         Returns:
             bool: 是否成功解析
         """
         try:
-            encodings = ['utf-8', 'gbk', 'gb2312', 'latin-1']
-            file_handle = None
-            
-            for encoding in encodings:
-                try:
-                    file_handle = open(asc_file, 'r', encoding=encoding)
-                    file_handle.read(1024)
-                    file_handle.seek(0)
-                    break
-                except (UnicodeDecodeError, UnicodeError):
-                    if file_handle:
-                        file_handle.close()
-                    continue
+            self._prepare(message_map)
+            self._start_progress(os.path.getsize(asc_file))
             
-            if file_handle is None:
-                print(f"错误：无法识别文件编码 - {asc_file}")
+            compression = detect_input_compression(asc_file)
+            if self.reader == "mmap" and compression is None:
+                self._parse_mapped(asc_file, message_map, 0, None)
+            elif not self._parse_stream(asc_file, message_map):
                 return False
             
-            with file_handle as f:
-                for line in f:
-                    self._parse_line(line, message_map)
-                    self._check_memory_usage()
-            
+            self._progress.finish(frames=self.original_count)
             return True
-            
+        
         except FileNotFoundError:
             print(f"错误：文件不存在 - {asc_file}")
             return False
@@ -93,6 +131,256 @@ class ASCParser:
             print(f"解析ASC文件失败: {type(e).__name__}: {e}")
             return False
     
+    def parse_merged(self, asc_files: List[str], message_map: Dict) -> bool:
+        """
+        将多个ASC文件按时间戳合并为一个数据流解析
+        
+        用于记录仪分段保存的文件（_001.asc、_002.asc…）或同一次测试的多通道日志，
+        各文件的时间戳须基于同一时间基准。每个文件顺序读取，用堆做k路归并，
+        内存中每个文件只保留当前一行；时间戳相同时按asc_files中的顺序。
+        
+        Args:
+            asc_files: ASC文件路径列表（可以是压缩文件）
+            message_map: 消息映射（来自DBCLoader）
+        
+        Returns:
+            bool: 是否成功解析
+        """
+        try:
+            self._prepare(message_map)
+            self._start_progress(sum(os.path.getsize(asc_file) for asc_file in asc_files))
+            
+            with contextlib.ExitStack() as stack:
+                streams = []
+                raw_files = []
+                for asc_file in asc_files:
+                    encoding = None
+                    if self.reader != "mmap":
+                        encoding = self.detect_encoding(asc_file)
+                        if encoding is None:
+                            print(f"错误：无法识别文件编码 - {asc_file}")
+                            return False
+                    stream, raw_file = self._open_lines(stack, asc_file, encoding)
+                    streams.append(stream)
+                    raw_files.append(raw_file)
+                parse_line = self._parse_line_bytes if self.reader == "mmap" else self._parse_line
+                
+                merged = heapq.merge(*(self._timed_lines(stream) for stream in streams), key=itemgetter(0))
+                for line_number, (_, line) in enumerate(merged, 1):
+                    parse_line(line, message_map)
+                    self._check_memory_usage()
+                    if not line_number % PROGRESS_LINES:
+                        self._progress.update(sum(raw_file.tell() for raw_file in raw_files), self.original_count)
+            
+            self._flush_batches(message_map)
+            self._progress.finish(frames=self.original_count)
+            return True
+        
+        except FileNotFoundError as e:
+            print(f"错误：文件不存在 - {e.filename}")
+            return False
+        except PermissionError as e:
+            print(f"错误：无权限访问文件 - {e.filename}")
+            return False
+        except MemoryError:
+            print("错误：内存不足，请尝试增加采样间隔或处理较小的文件")
+            self.clear()
+            return False
+        except Exception as e:
+            print(f"解析ASC文件失败: {type(e).__name__}: {e}")
+            return False
+    
+    @staticmethod
+    def _open_lines(stack: contextlib.ExitStack, asc_file: str, encoding: Optional[str] = None):
+        """
+        打开ASC文件用于按行读取（压缩文件流式解压）
+        
+        Args:
+            stack: 打开的文件注册到此ExitStack，随其关闭
+            asc_file: ASC文件路径
+            encoding: 文本编码，None表示按字节行读取
+        
+        Returns:
+            Tuple: (按行迭代的读取流, 底层文件)，底层文件的tell()为已读取的（压缩）字节数
+        """
+        raw_file = stack.enter_context(open(asc_file, 'rb'))
+        stream = raw_file
+        compression = detect_input_compression(asc_file)
+        if compression is not None:
+            stream = stack.enter_context(open_compressed_input(raw_file, compression))
+        if encoding is not None:
+            stream = stack.enter_context(io.TextIOWrapper(stream, encoding=encoding))
+        return stream, raw_file
+    
+    @staticmethod
+    def _timed_lines(lines: Iterator) -> Iterator[Tuple[float, Union[str, bytes]]]:
+        """
+        筛选以时间戳开头的行
+        
+        文件头、注释等行不参与归并，直接跳过。
+        
+        Args:
+            lines: 文本行或字节行
+        
+        Returns:
+            Iterator[Tuple[float, Union[str, bytes]]]: (时间戳, 行)
+        """
+        for line in lines:
+            head = line.split(None, 1)
+            if not head:
+                continue
+            try:
+                timestamp = float(head[0])
+            except ValueError:
+                continue
+            yield timestamp, line
+    
+    def parse_range(
+        self,
+        asc_file: str,
+        message_map: Dict,
+        start: int,
+        end: int,
+        encoding: str
+    ) -> None:
+        """
+        解析ASC文件中的一个字节区间
+        
+        供并行解析使用，区间边界须对齐到行首（见parallel_parser.split_file_ranges）。
+        起始位置落在[start, end)内的行属于本区间。异常直接抛出，由调用方处理。
+        
+        Args:
+            asc_file: ASC文件路径
+            message_map: 消息映射
+            start: 起始字节偏移
+            end: 结束字节偏移（不含）
+            encoding: 文件编码（来自detect_encoding，mmap读取方式下不使用）
+        """
+        self._prepare(message_map)
+        
+        if self.reader == "mmap":
+            self._parse_mapped(asc_file, message_map, start, end)
+            return
+        
+        position = start
+        with open(asc_file, 'rb') as f:
+            f.seek(start)
+            for raw_line in f:
+                if position >= end:
+                    break
+                position += len(raw_line)
+                self._parse_line(raw_line.decode(encoding, errors='replace'), message_map)
+        self._flush_batches(message_map)
+    
+    def _parse_mapped(self, asc_file: str, message_map: Dict, start: int, end: Optional[int]) -> None:
+        """
+        通过内存映射按字节行解析文件
+        
+        数据帧行是纯ASCII，直接在bytes上切分和转换，不做文本解码；
+        注释、文件头等其他行（可能含GBK文本）在字节层面即被跳过。
+        
+        Args:
+            asc_file: ASC文件路径
+            message_map: 消息映射
+            start: 起始字节偏移
+            end: 结束字节偏移（不含），None表示到文件末尾
+        """
+        with open(asc_file, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if end is None:
+                    end = len(mapped)
+                mapped.seek(start)
+                readline = mapped.readline
+                parse_line = self._parse_line_bytes
+                position = start
+                next_report = start + PROGRESS_BYTES
+                
+                while position < end:
+                    line = readline()
+                    if not line:
+                        break
+                    position += len(line)
+                    parse_line(line, message_map)
+                    self._check_memory_usage()
+                    if position >= next_report:
+                        next_report = position + PROGRESS_BYTES
+                        self._progress.update(position, self.original_count)
+        
+        self._flush_batches(message_map)
+    
+    def _parse_stream(self, asc_file: str, message_map: Dict) -> bool:
+        """
+        按行流式解析ASC文件（压缩文件流式解压）
+        
+        压缩文件无法内存映射，mmap读取方式下逐个字节行解析（与_parse_mapped相同），
+        text读取方式下按探测到的编码逐行解码。
+        
+        Args:
+            asc_file: ASC文件路径
+            message_map: 消息映射
+        
+        Returns:
+            bool: 是否成功解析
+        """
+        encoding = None
+        parse_line = self._parse_line_bytes
+        if self.reader != "mmap":
+            encoding = self.detect_encoding(asc_file)
+            if encoding is None:
+                print(f"错误：无法识别文件编码 - {asc_file}")
+                return False
+            parse_line = self._parse_line
+        
+        with contextlib.ExitStack() as stack:
+            lines, raw_file = self._open_lines(stack, asc_file, encoding)
+            for line_number, line in enumerate(lines, 1):
+                parse_line(line, message_map)
+                self._check_memory_usage()
+                if not line_number % PROGRESS_LINES:
+                    self._progress.update(raw_file.tell(), self.original_count)
+        
+        self._flush_batches(message_map)
+        return True
+    
+    def _start_progress(self, total: int) -> None:
+        """
+        开始报告一次解析的进度
+        
+        Args:
+            total: 输入文件总字节数
+        """
+        self._progress = ProgressReporter(self.progress, "parse", total)
+    
+    @staticmethod
+    def detect_encoding(asc_file: str) -> Optional[str]:
+        """
+        探测ASC文件编码
+        
+        依次尝试ENCODINGS中的编码读取文件开头1KB，压缩文件读取解压后的开头。
+        
+        Args:
+            asc_file: ASC文件路径
+        
+        Returns:
+            Optional[str]: 可用的编码，均失败时返回None
+        """
+        compression = detect_input_compression(asc_file)
+        for encoding in ASCParser.ENCODINGS:
+            try:
+                if compression is None:
+                    f = open(asc_file, 'r', encoding=encoding)
+                else:
+                    f = io.TextIOWrapper(open_compressed_input(asc_file, compression), encoding=encoding)
+                with f:
+                    f.read(1024)
+                return encoding
+            except (UnicodeDecodeError, UnicodeError):
+                continue
+        return None
+    
     def _check_memory_usage(self):
         """检查内存使用情况并发出警告"""
         if self._memory_warning_shown:
@@ -105,47 +393,154 @@ class ASCParser:
             print(f"警告：数据量较大（{timestamp_count}个时间点，{signal_count}个信号），可能占用较多内存")
             self._memory_warning_shown = True
     
+    def _prepare(self, message_map: Dict) -> None:
+        """
+        为新的message_map清空帧ID和信号列缓存并创建帧解码器（每次解析开始时调用）
+        
+        Args:
+            message_map: 消息映射
+        """
+        self._frame_id_cache.clear()
+        self._message_columns.clear()
+        self._decoder = FrameDecoder(
+            message_map,
+            cache_size=self.decode_cache_size,
+            compiled=self.compiled_decoders
+        )
+        self._batch_decoder = None
+        if self.batch_decode and numpy_available():
+            self._batch_decoder = BatchDecoder(message_map)
+    
+    def _lookup_frame_id(self, id_token: Union[str, bytes], message_map: Dict) -> Optional[int]:
+        """
+        将帧ID文本解析为已映射的帧ID
+        
+        结果按原始文本缓存，同一帧ID在整个文件中只做一次int转换和映射查询。
+        
+        Args:
+            id_token: ASC行中的帧ID字段（如"18FF50E5x"或b"18FF50E5x"）
+            message_map: 消息映射
+        
+        Returns:
+            Optional[int]: 帧ID；格式错误或不在message_map中时返回None
+        """
+        pattern = _FRAME_ID_PATTERN_BYTES if isinstance(id_token, bytes) else _FRAME_ID_PATTERN
+        frame_id = None
+        if pattern.fullmatch(id_token):
+            frame_id = int(id_token[:-1] if id_token[-1:] in ('x', b'x') else id_token, 16)
+        if frame_id not in message_map:
+            frame_id = None
+        self._frame_id_cache[id_token] = frame_id
+        return frame_id
+    
     def _parse_line(self, line: str, message_map: Dict) -> None:
         """
         解析单行ASC数据
         
+        快速路径：按空白切分一次，先用廉价的字段检查排除注释、文件头和
+        非数据帧行，再查帧ID缓存跳过未映射的帧，最后才检查并转换时间戳和数据域。
+        接受的行格式与ASC_PATTERN一致：时间戳只能是"数字.数字"（float()还会接受
+        负号、指数和inf/nan），通道号和数据长度只能是数字，帧ID的格式在_lookup_frame_id中检查。
+        
         Args:
             line: ASC文件中的一行
             message_map: 消息映射
         """
-        line = line.strip()
+        parts = line.split(None, 6)
+        if len(parts) < 7 or parts[4] != 'd':
+            return
         
-        if not line or line.startswith(';'):
+        id_token = parts[2]
+        frame_id = self._frame_id_cache.get(id_token, _UNSEEN)
+        if frame_id is _UNSEEN:
+            frame_id = self._lookup_frame_id(id_token, message_map)
+        if frame_id is None:
             return
         
-        match = re.match(self.ASC_PATTERN, line)
-        if not match:
+        if parts[3] not in _DIRECTIONS or not parts[5].isdecimal() or not parts[1].isdecimal():
+            return
+        whole, dot, fraction = parts[0].partition('.')
+        if not (dot and whole.isdecimal() and fraction.isdecimal()):
             return
         
         try:
-            timestamp = float(match.group(1))
-            frame_id_str = match.group(3)
-            frame_id = int(frame_id_str.replace('x', ''), 16)
-            data_hex = match.group(6).replace(' ', '')
-            data = bytes.fromhex(data_hex)
-            
-            if frame_id not in message_map:
-                return
-            
+            timestamp = float(parts[0])
+            data = bytes.fromhex(parts[6])
+        except ValueError:
+            return
+        
+        self._decode_frame(timestamp, frame_id, data, message_map)
+    
+    def _parse_line_bytes(self, line: bytes, message_map: Dict) -> None:
+        """
+        解析单行ASC数据（bytes版本，供mmap读取方式使用）
+        
+        与_parse_line逻辑相同，但直接处理未解码的字节行。
+        
+        Args:
+            line: ASC文件中的一行（bytes）
+            message_map: 消息映射
+        """
+        parts = line.split(None, 6)
+        if len(parts) < 7 or parts[4] != b'd':
+            return
+        
+        id_token = parts[2]
+        frame_id = self._frame_id_cache.get(id_token, _UNSEEN)
+        if frame_id is _UNSEEN:
+            frame_id = self._lookup_frame_id(id_token, message_map)
+        if frame_id is None:
+            return
+        
+        if parts[3] not in _DIRECTIONS_BYTES or not parts[5].isdigit() or not parts[1].isdigit():
+            return
+        whole, dot, fraction = parts[0].partition(b'.')
+        if not (dot and whole.isdigit() and fraction.isdigit()):
+            return
+        
+        try:
+            timestamp = float(parts[0])
+            data = bytes.fromhex(parts[6].decode('ascii'))
+        except ValueError:
+            return
+        
+        self._decode_frame(timestamp, frame_id, data, message_map)
+    
+    def _decode_frame(self, timestamp: float, frame_id: int, data: bytes, message_map: Dict) -> None:
+        """
+        解码一帧并写入采样数据
+        
+        Args:
+            timestamp: 帧时间戳（秒）
+            frame_id: 帧ID（已确认在message_map中）
+            data: 数据域
+            message_map: 消息映射
+        """
+        try:
             self.original_count += 1
-            sampled_time = round(timestamp / self.sample_interval) * self.sample_interval
+            bucket = round(timestamp / self.sample_interval)
+            
+            if self._batch_decoder is not None:
+                batch = self._batch_decoder.batch(frame_id)
+                if batch is not None:
+                    if batch.append(bucket, data) >= self._batch_decoder.batch_rows:
+                        self._flush_batch(batch, message_map)
+                    return
             
             msg_info = message_map[frame_id]
-            msg = msg_info['message']
-            dbc_name = msg_info['dbc_name']
+            decoded = self._decoder.decode(frame_id, data)
             
-            decoded = msg.decode(data)
+            columns = self._message_columns.get(frame_id)
+            if columns is None:
+                columns = self._message_columns[frame_id] = {}
             
+            position = self.sampled_data.locate(bucket)
             for signal_name, value in decoded.items():
-                full_signal_name = f"{dbc_name}::{msg.name}::{signal_name}"
-                self.sampled_data[sampled_time][full_signal_name].append(value)
-                self.found_signals.add(full_signal_name)
-                
+                column = columns.get(signal_name)
+                if column is None:
+                    column = columns[signal_name] = self._register_signal(msg_info, signal_name)
+                column.put(position, value)
+        
         except ValueError as e:
             if self.debug:
                 print(f"  数据格式错误: {e}")
@@ -156,6 +551,57 @@ class ASCParser:
             if self.debug:
                 print(f"  解码错误: {type(e).__name__}: {e}")
     
+    def _flush_batches(self, message_map: Dict) -> None:
+        """
+        解码并写入所有批次中缓冲的帧（每个解析区间结束时调用）
+        
+        Args:
+            message_map: 消息映射
+        """
+        if self._batch_decoder is None:
+            return
+        for batch in self._batch_decoder.pending():
+            self._flush_batch(batch, message_map)
+    
+    def _flush_batch(self, batch: MessageBatch, message_map: Dict) -> None:
+        """
+        解码一个消息批次并按帧顺序写入采样数据
+        
+        Args:
+            batch: 消息批次
+            message_map: 消息映射
+        """
+        buckets, signals = batch.decode()
+        msg_info = message_map[batch.frame_id]
+        
+        columns = self._message_columns.get(batch.frame_id)
+        if columns is None:
+            columns = self._message_columns[batch.frame_id] = {}
+        
+        positions = self.sampled_data.locate_many(buckets)
+        for signal_name, values in signals:
+            column = columns.get(signal_name)
+            if column is None:
+                column = columns[signal_name] = self._register_signal(msg_info, signal_name)
+            put = column.put
+            for position, value in zip(positions, values):
+                put(position, value)
+    
+    def _register_signal(self, msg_info: Dict, signal_name: str) -> SignalColumn:
+        """
+        登记一个首次解码出的信号并返回其列
+        
+        Args:
+            msg_info: message_map中的消息信息
+            signal_name: 信号名称（不含DBC和消息前缀）
+        
+        Returns:
+            SignalColumn: 信号的列存储
+        """
+        full_signal_name = f"{msg_info['dbc_name']}::{msg_info['message'].name}::{signal_name}"
+        self.found_signals.add(full_signal_name)
+        return self.sampled_data.column(full_signal_name)
+    
     def get_statistics(self) -> Tuple[int, int, int]:
         """
         获取解析统计信息
@@ -175,6 +621,10 @@ class ASCParser:
         self.found_signals.clear()
         self.original_count = 0
         self._memory_warning_shown = False
+        self._frame_id_cache.clear()
+        self._message_columns.clear()
+        self._decoder = None
+        self._batch_decoder = None
         gc.collect()
     
     def __del__(self):
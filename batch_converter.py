@@ -0,0 +1,365 @@
+# asc_to_csv/batch_converter.py
+"""
+批量转换模块
+将多个ASC文件分发到进程池中并发转换，每个文件输出到独立的子目录，并生成批量汇总报告
+"""
+
+import io
+import gc
+import os
+import csv
+import glob
+import time
+import contextlib
+import dataclasses
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional
+
+from config import Config
+from dbc_loader import DBCLoader
+from input_compression import INPUT_COMPRESSIONS, find_compressed_input
+from main import ASCToCSVConverter
+
+
+BATCH_SUMMARY_FILE = "Batch_Summary.csv"
+
+# 目录输入时收集的文件扩展名（含压缩的ASC文件）
+ASC_SUFFIXES = (".asc",) + tuple(f".asc{suffix}" for suffix, _ in INPUT_COMPRESSIONS.values())
+
+_GLOB_CHARS = ('*', '?', '[')
+
+# 工作进程内的DBC加载器，由_init_worker在进程启动时加载一次
+_worker_dbc_loader: Optional[DBCLoader] = None
+
+
+def expand_asc_inputs(asc_inputs: List[str]) -> List[str]:
+    """
+    展开批量转换的输入
+    
+    目录展开为其中的ASC文件（不递归），通配符模式展开为匹配的文件，
+    不存在的文件查找同名的压缩文件，仍不存在时原样保留（转换时报告失败）。
+    
+    Args:
+        asc_inputs: ASC文件、目录或通配符模式列表
+    
+    Returns:
+        List[str]: 去重后的ASC文件列表，保持输入顺序，同一项展开的文件按名称排序
+    """
+    asc_files = []
+    for asc_input in asc_inputs:
+        if os.path.isdir(asc_input):
+            asc_files.extend(sorted(
+                os.path.join(asc_input, name) for name in os.listdir(asc_input)
+                if name.lower().endswith(ASC_SUFFIXES) and os.path.isfile(os.path.join(asc_input, name))
+            ))
+        elif any(char in asc_input for char in _GLOB_CHARS):
+            asc_files.extend(sorted(path for path in glob.glob(asc_input) if os.path.isfile(path)))
+        elif os.path.exists(asc_input):
+            asc_files.append(asc_input)
+        else:
+            asc_files.append(find_compressed_input(asc_input) or asc_input)
+    
+    return list(dict.fromkeys(os.path.normpath(asc_file) for asc_file in asc_files))
+
+
+def output_subdir_names(asc_files: List[str]) -> List[str]:
+    """
+    为每个ASC文件生成输出子目录名
+    
+    去掉.asc及压缩扩展名，重名时依次追加_2、_3等后缀。
+    
+    Args:
+        asc_files: ASC文件列表
+    
+    Returns:
+        List[str]: 与asc_files一一对应的子目录名
+    """
+    suffixes = sorted(ASC_SUFFIXES, key=len, reverse=True)
+    names = []
+    used = set()
+    for asc_file in asc_files:
+        base_name = os.path.basename(asc_file)
+        for suffix in suffixes:
+            if base_name.lower().endswith(suffix):
+                base_name = base_name[:-len(suffix)]
+                break
+        base_name = base_name or "asc"
+        
+        name = base_name
+        index = 2
+        while name.lower() in used:
+            name = f"{base_name}_{index}"
+            index += 1
+        used.add(name.lower())
+        names.append(name)
+    return names
+
+
+def _last_error(log: str) -> str:
+    """
+    从转换日志中提取最后一条错误信息
+    
+    Args:
+        log: 转换过程的输出
+    
+    Returns:
+        str: 含"错误"或"失败"的最后一行，没有时为最后一个非空行
+    """
+    lines = [line.strip() for line in log.splitlines() if line.strip()]
+    for line in reversed(lines):
+        if "错误" in line or "失败" in line:
+            return line
+    return lines[-1] if lines else "未知错误"
+
+
+def convert_file(config: Config, dbc_loader: DBCLoader) -> Dict[str, Any]:
+    """
+    转换单个ASC文件（输出被捕获，不打印）
+    
+    Args:
+        config: 该文件的配置（asc_file和output_dir已设置）
+        dbc_loader: 已加载的DBC加载器
+    
+    Returns:
+        Dict[str, Any]: 转换结果，包括asc_file、output_dir、success、seconds、
+            sampled_count、signal_count和error
+    """
+    result = {
+        'asc_file': config.asc_file,
+        'output_dir': config.output_dir,
+        'success': False,
+        'seconds': 0.0,
+        'sampled_count': 0,
+        'signal_count': 0,
+        'error': ""
+    }
+    
+    start = time.perf_counter()
+    log = io.StringIO()
+    try:
+        converter = ASCToCSVConverter(config, dbc_loader)
+        with contextlib.redirect_stdout(log):
+            result['success'] = converter.run()
+        if result['success']:
+            _, result['sampled_count'], result['signal_count'] = converter.asc_parser.get_statistics()
+        else:
+            result['error'] = _last_error(log.getvalue())
+    except MemoryError:
+        result['error'] = "内存不足"
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    
+    result['asc_file'] = config.asc_file
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+def _init_worker(config: Config) -> None:
+    """
+    工作进程初始化：加载一次DBC文件（主进程已加载过，DBC缓存命中）
+    
+    Args:
+        config: 批量转换的配置
+    """
+    global _worker_dbc_loader
+    loader = DBCLoader(config.get_signal_selector(), config.get_dbc_cache())
+    with contextlib.redirect_stdout(io.StringIO()):
+        if not loader.load(config.dbc_files):
+            raise RuntimeError(f"工作进程加载DBC文件失败: {config.dbc_files}")
+    _worker_dbc_loader = loader
+
+
+def _convert_task(config: Config) -> Dict[str, Any]:
+    """
+    在工作进程中转换一个ASC文件
+    
+    Args:
+        config: 该文件的配置
+    
+    Returns:
+        Dict[str, Any]: 转换结果（见convert_file）
+    """
+    result = convert_file(config, _worker_dbc_loader)
+    gc.collect()
+    return result
+
+
+class BatchConverter:
+    """
+    批量转换器
+    
+    DBC文件只在主进程加载一次（同时写入DBC缓存），工作进程启动时从缓存加载，
+    之后每个进程依次转换分配到的ASC文件。每个文件输出到 output_dir/<文件名> 子目录，
+    全部完成后在output_dir下写入Batch_Summary.csv。
+    
+    Attributes:
+        results: 按输入顺序排列的转换结果（见convert_file）
+    """
+    
+    def __init__(self, config: Config):
+        """
+        初始化批量转换器
+        
+        Args:
+            config: 配置对象（asc_files为批量输入）
+        """
+        self.config = config
+        self.results: List[Dict[str, Any]] = []
+    
+    def run(self) -> bool:
+        """
+        运行批量转换
+        
+        Returns:
+            bool: 是否全部转换成功
+        """
+        if not self.config.validate():
+            return False
+        
+        asc_files = expand_asc_inputs(self.config.asc_files)
+        if not asc_files:
+            print(f"错误：未找到要转换的ASC文件 - {', '.join(self.config.asc_files)}")
+            return False
+        
+        if not self.config.output_dir:
+            print("错误：输出目录未设置")
+            return False
+        if not self.config.create_output_dir():
+            return False
+        
+        workers = self._worker_count(len(asc_files))
+        print(f"批量转换: {len(asc_files)}个ASC文件, {workers}个进程")
+        print(f"输出目录: {self.config.output_dir}")
+        
+        print("\n正在加载DBC文件...")
+        dbc_loader = DBCLoader(self.config.get_signal_selector(), self.config.get_dbc_cache())
+        if not dbc_loader.load(self.config.dbc_files):
+            return False
+        
+        file_configs = [
+            dataclasses.replace(
+                self.config,
+                asc_file=asc_file,
+                merge_files=[],
+                asc_files=[],
+                output_dir=os.path.join(self.config.output_dir, name),
+                # 进程池中每个文件单进程解析，避免进程数相乘
+                workers=self.config.workers if workers == 1 else 1,
+                # 各文件的输出被捕获，进度由批量转换逐个文件报告
+                show_progress=False
+            )
+            for asc_file, name in zip(asc_files, output_subdir_names(asc_files))
+        ]
+        
+        print("\n正在转换...")
+        start = time.perf_counter()
+        results = {}
+        if workers == 1:
+            for config in file_configs:
+                result = convert_file(config, dbc_loader)
+                results[config.output_dir] = result
+                self._print_result(len(results), len(file_configs), result)
+        else:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(self.config,)
+            ) as executor:
+                futures = {executor.submit(_convert_task, config): config for config in file_configs}
+                for future in as_completed(futures):
+                    config = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = {
+                            'asc_file': config.asc_file,
+                            'output_dir': config.output_dir,
+                            'success': False,
+                            'seconds': 0.0,
+                            'sampled_count': 0,
+                            'signal_count': 0,
+                            'error': f"工作进程异常: {type(e).__name__}: {e}"
+                        }
+                    results[config.output_dir] = result
+                    self._print_result(len(results), len(file_configs), result)
+        total_seconds = time.perf_counter() - start
+        
+        self.results = [results[config.output_dir] for config in file_configs]
+        summary_file = self._write_batch_summary(workers, total_seconds)
+        
+        failed = [result for result in self.results if not result['success']]
+        print(f"\n批量转换完成: 成功 {len(self.results) - len(failed)}, 失败 {len(failed)}, 总耗时 {total_seconds:.2f}秒")
+        print(f"批量汇总: {summary_file}")
+        for result in failed:
+            print(f"  失败: {result['asc_file']} - {result['error']}")
+        
+        return not failed
+    
+    def _worker_count(self, file_count: int) -> int:
+        """
+        计算进程池大小
+        
+        Args:
+            file_count: 文件数量
+        
+        Returns:
+            int: 进程数（不超过文件数）
+        """
+        workers = self.config.batch_workers
+        if workers == -1:
+            workers = os.cpu_count() or 1
+        return max(1, min(workers, file_count))
+    
+    @staticmethod
+    def _print_result(index: int, total: int, result: Dict[str, Any]) -> None:
+        """
+        打印单个文件的转换结果
+        
+        Args:
+            index: 已完成的文件数
+            total: 文件总数
+            result: 转换结果
+        """
+        status = "成功" if result['success'] else f"失败（{result['error']}）"
+        print(f"  [{index}/{total}] {os.path.basename(result['asc_file'])}: {status} {result['seconds']:.2f}秒")
+    
+    def _write_batch_summary(self, workers: int, total_seconds: float) -> str:
+        """
+        写入批量汇总文件
+        
+        Args:
+            workers: 进程数
+            total_seconds: 总耗时（秒）
+        
+        Returns:
+            str: 文件路径
+        """
+        summary_filename = os.path.join(self.config.output_dir, BATCH_SUMMARY_FILE)
+        succeeded = sum(1 for result in self.results if result['success'])
+        
+        with open(summary_filename, 'w', newline='', encoding=self.config.csv_encoding) as csvfile:
+            writer = csv.writer(csvfile)
+            
+            writer.writerow(["批量转换汇总报告"])
+            writer.writerow([])
+            writer.writerow(["文件总数", len(self.results)])
+            writer.writerow(["成功", succeeded])
+            writer.writerow(["失败", len(self.results) - succeeded])
+            writer.writerow(["进程数", workers])
+            writer.writerow(["总耗时", f"{total_seconds:.2f}秒"])
+            writer.writerow([])
+            writer.writerow(["各文件详情"])
+            writer.writerow(["ASC文件", "输出目录", "状态", "耗时(秒)", "采样后时间点数", "信号数", "错误信息"])
+            
+            for result in self.results:
+                writer.writerow([
+                    result['asc_file'],
+                    os.path.basename(result['output_dir']),
+                    "成功" if result['success'] else "失败",
+                    f"{result['seconds']:.2f}",
+                    result['sampled_count'],
+                    result['signal_count'],
+                    result['error']
+                ])
+        
+        return summary_filename
@@ -0,0 +1,260 @@
+# asc_to_csv/batch_decoder.py
+"""
+批量解码模块
+按帧ID收集数据域，拼成连续的uint8矩阵后用NumPy一次性提取所有信号（需要安装numpy）
+"""
+
+from array import array
+from typing import Any, Collection, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from frame_decoder import signal_conversion
+
+
+# 单个消息累积多少帧后解码一次，限制缓冲区内存
+BATCH_ROWS = 65536
+
+# 矩阵按8字节对齐后整体视为一个64位整数，更长的消息（CAN FD）逐帧解码
+_WORD_BYTES = 8
+
+
+def numpy_available() -> bool:
+    """判断是否可以使用批量解码（numpy已安装）"""
+    return np is not None
+
+
+class MessageBatch:
+    """
+    单个消息的待解码数据
+    
+    数据域按到达顺序追加到连续缓冲区，桶号同序保存；decode时整体转换为
+    (帧数, 8) 的uint8矩阵，按小端和大端各视为一列uint64，再对每个信号做移位、掩码、
+    符号扩展和线性变换。转换结果与cantools的Message.decode一致（包括int/float类型），
+    带枚举的信号按原始值逐个转换。
+    
+    Attributes:
+        frame_id: 帧ID
+        length: 消息长度（字节）
+        payloads: 数据域缓冲区（每帧length字节）
+        buckets: 每帧的采样区间桶号
+    """
+    
+    __slots__ = ('frame_id', 'length', 'fields', 'payloads', 'buckets')
+    
+    def __init__(self, frame_id: int, message, signal_names: Optional[Collection[str]] = None):
+        """
+        初始化消息批次
+        
+        Args:
+            frame_id: 帧ID
+            message: cantools消息对象（须通过supports检查）
+            signal_names: 只解码这些信号，None表示全部
+        """
+        self.frame_id = frame_id
+        self.length = message.length
+        self.fields: List[Tuple] = []
+        self.payloads = bytearray()
+        self.buckets = array('q')
+        
+        padding = (_WORD_BYTES - self.length) * 8
+        for signal in message.signals:
+            if signal_names is not None and signal.name not in signal_names:
+                continue
+            
+            big_endian = signal.byte_order != 'little_endian'
+            if big_endian:
+                msb = (self.length - 1 - signal.start // 8) * 8 + signal.start % 8
+                shift = msb - signal.length + 1 + padding
+            else:
+                shift = signal.start
+            
+            self.fields.append((signal.name, big_endian, shift, signal) + self._conversion(signal))
+    
+    @staticmethod
+    def supports(message) -> bool:
+        """
+        判断消息能否批量解码
+        
+        Args:
+            message: cantools消息对象
+        
+        Returns:
+            bool: 非多路复用、非容器、长度不超过8字节且浮点信号均为32/64位时为True
+        """
+        if message.is_multiplexed() or getattr(message, 'is_container', False):
+            return False
+        if not 0 < message.length <= _WORD_BYTES:
+            return False
+        for signal in message.signals:
+            if signal.is_float and signal.length not in (32, 64):
+                return False
+            if signal.byte_order == 'little_endian':
+                low = signal.start
+            else:
+                low = (message.length - 1 - signal.start // 8) * 8 + signal.start % 8 - signal.length + 1
+            if low < 0 or low + signal.length > message.length * 8:
+                return False
+        return True
+    
+    @staticmethod
+    def _conversion(signal) -> Tuple:
+        """
+        确定信号的向量化转换方式
+        
+        Args:
+            signal: cantools信号对象
+        
+        Returns:
+            Tuple: (方式, 比例, 偏移)，方式为"identity"、"linear"或"scalar"（逐个调用signal_conversion）
+        """
+        conversion = getattr(signal, 'conversion', None)
+        if conversion is not None:
+            if conversion.choices:
+                return ('scalar', None, None)
+            if conversion.scale == 1 and conversion.offset == 0:
+                return ('identity', None, None)
+            scale, offset = conversion.scale, conversion.offset
+        else:
+            if signal.choices:
+                return ('scalar', None, None)
+            scale, offset = signal.scale, signal.offset
+        
+        # 无符号64位整数与Python整数运算可能溢出，退回逐个转换
+        if signal.length == 64 and not signal.is_signed and not signal.is_float:
+            return ('scalar', None, None)
+        return ('linear', scale, offset)
+    
+    def __len__(self) -> int:
+        return len(self.buckets)
+    
+    def append(self, bucket: int, data: bytes) -> int:
+        """
+        追加一帧
+        
+        Args:
+            bucket: 采样区间桶号
+            data: 数据域（超出消息长度的部分被忽略）
+        
+        Returns:
+            int: 当前缓冲的帧数
+        
+        Raises:
+            ValueError: 数据域短于消息长度（与cantools解码时的行为一致，该帧被丢弃）
+        """
+        if len(data) < self.length:
+            raise ValueError(f"Wrong data size: {len(data)} instead of {self.length} bytes")
+        self.payloads += data[:self.length]
+        self.buckets.append(bucket)
+        return len(self.buckets)
+    
+    def decode(self) -> Tuple[array, List[Tuple[str, List[Any]]]]:
+        """
+        解码并清空缓冲的所有帧
+        
+        Returns:
+            Tuple[array, List[Tuple[str, List[Any]]]]: (桶号, [(信号名称, 按帧顺序的值列表), ...])
+        """
+        buckets = self.buckets
+        count = len(buckets)
+        matrix = np.zeros((count, _WORD_BYTES), dtype=np.uint8)
+        matrix[:, :self.length] = np.frombuffer(bytes(self.payloads), dtype=np.uint8).reshape(count, self.length)
+        self.payloads = bytearray()
+        self.buckets = array('q')
+        
+        words = {
+            False: matrix.view('<u8').ravel(),
+            True: matrix.view('>u8').ravel().astype(np.uint64),
+        }
+        
+        signals = []
+        for name, big_endian, shift, signal, kind, scale, offset in self.fields:
+            raw = (words[big_endian] >> np.uint64(shift)) & np.uint64((1 << signal.length) - 1)
+            
+            if signal.is_float:
+                if signal.length == 32:
+                    with np.errstate(invalid='ignore'):
+                        value = raw.astype(np.uint32).view(np.float32).astype(np.float64)
+                else:
+                    value = raw.view(np.float64)
+            elif signal.is_signed:
+                unused = np.uint64(64 - signal.length)
+                value = (raw << unused).astype(np.int64) >> np.int64(unused)
+            elif signal.length < 64:
+                value = raw.astype(np.int64)
+            else:
+                value = raw
+            
+            if kind == 'linear':
+                values = (value * scale + offset).tolist()
+            elif kind == 'identity':
+                values = value.tolist()
+            else:
+                convert = signal_conversion(signal)
+                values = [convert(item) for item in value.tolist()]
+            signals.append((name, values))
+        
+        return buckets, signals
+
+
+class BatchDecoder:
+    """
+    批量解码器
+    
+    为message_map中每个可批量解码的消息维护一个MessageBatch，
+    不支持的消息返回None，由调用方逐帧解码。消息带有'signals'时只解码这些信号。
+    
+    Attributes:
+        message_map: 消息映射（来自DBCLoader）
+        batch_rows: 单个消息缓冲的帧数上限
+    """
+    
+    def __init__(
+        self,
+        message_map: Dict,
+        batch_rows: int = BATCH_ROWS
+    ):
+        """
+        初始化批量解码器
+        
+        Args:
+            message_map: 消息映射（来自DBCLoader）
+            batch_rows: 单个消息缓冲的帧数上限
+        """
+        self.message_map = message_map
+        self.batch_rows = batch_rows
+        self._batches: Dict[int, Optional[MessageBatch]] = {}
+    
+    def batch(self, frame_id: int) -> Optional[MessageBatch]:
+        """
+        获取帧ID对应的消息批次
+        
+        Args:
+            frame_id: 帧ID（须在message_map中）
+        
+        Returns:
+            Optional[MessageBatch]: 消息不支持批量解码时返回None
+        """
+        try:
+            return self._batches[frame_id]
+        except KeyError:
+            pass
+        
+        msg_info = self.message_map[frame_id]
+        batch = None
+        if MessageBatch.supports(msg_info['message']):
+            batch = MessageBatch(frame_id, msg_info['message'], msg_info.get('signals'))
+        self._batches[frame_id] = batch
+        return batch
+    
+    def pending(self) -> List[MessageBatch]:
+        """
+        获取所有有待解码数据的批次
+        
+        Returns:
+            List[MessageBatch]: 消息批次列表
+        """
+        return [batch for batch in self._batches.values() if batch is not None and len(batch)]
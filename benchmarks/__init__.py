@@ -0,0 +1,5 @@
+# asc_to_csv/benchmarks/__init__.py
+"""
+性能基准测试包
+包含合成数据生成和各处理阶段的吞吐量测试脚本
+"""
@@ -0,0 +1,114 @@
+# asc_to_csv/benchmarks/bench_decoder.py
+"""
+帧解码基准测试
+对比cantools直接解码与FrameDecoder（解码缓存、专用解码器）、BatchDecoder（NumPy批量解码）的吞吐量（帧/秒）
+
+用法:
+    python benchmarks/bench_decoder.py [--frames N] [--repeat N] [--repeat-ratio R] [--cache-size N]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from frame_decoder import FrameDecoder, DEFAULT_CACHE_SIZE
+from batch_decoder import BatchDecoder, numpy_available
+from benchmarks.synthetic import generate_frames
+from benchmarks.bench_parse_line import build_message_map
+
+
+def time_frames_per_second(decode, frames: list, repeat: int) -> float:
+    """
+    多次运行取最快一次，返回帧/秒
+    
+    Args:
+        decode: 解码函数 (帧ID, 数据域) -> 信号字典
+        frames: (帧ID, 数据域) 列表
+        repeat: 重复次数
+    
+    Returns:
+        float: 每秒解码帧数
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for frame_id, data in frames:
+            decode(frame_id, data)
+        best = min(best, time.perf_counter() - start)
+    return len(frames) / best
+
+
+def time_batch_frames_per_second(message_map: dict, frames: list, repeat: int) -> float:
+    """
+    批量解码：按帧ID缓冲后整体解码，多次运行取最快一次，返回帧/秒
+    
+    Args:
+        message_map: 消息映射
+        frames: (帧ID, 数据域) 列表
+        repeat: 重复次数
+    
+    Returns:
+        float: 每秒解码帧数
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        decoder = BatchDecoder(message_map)
+        start = time.perf_counter()
+        for bucket, (frame_id, data) in enumerate(frames):
+            batch = decoder.batch(frame_id)
+            if batch.append(bucket, data) >= decoder.batch_rows:
+                batch.decode()
+        for batch in decoder.pending():
+            batch.decode()
+        best = min(best, time.perf_counter() - start)
+    return len(frames) / best
+
+
+def main() -> int:
+    """基准测试入口"""
+    arg_parser = argparse.ArgumentParser(description="帧解码吞吐量基准测试")
+    arg_parser.add_argument("--frames", type=int, default=200000, help="帧数量")
+    arg_parser.add_argument("--repeat", type=int, default=3, help="重复次数（取最快）")
+    arg_parser.add_argument("--repeat-ratio", type=float, default=0.9, help="重复上一次数据域的概率")
+    arg_parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE, help="解码缓存条目数")
+    args = arg_parser.parse_args()
+    
+    frames = generate_frames(args.frames, repeat_ratio=args.repeat_ratio)
+    message_map = build_message_map()
+    
+    def cantools_decode(frame_id, data):
+        return message_map[frame_id]['message'].decode(data)
+    
+    variants = [
+        ("cantools", cantools_decode),
+        ("缓存", FrameDecoder(message_map, cache_size=args.cache_size).decode),
+        ("专用解码器", FrameDecoder(message_map, cache_size=0, compiled=True).decode),
+        ("缓存+专用解码器", FrameDecoder(message_map, cache_size=args.cache_size, compiled=True).decode),
+    ]
+    
+    for name, decode in variants[1:]:
+        for frame_id, data in frames[:1000]:
+            if decode(frame_id, data) != cantools_decode(frame_id, data):
+                print(f"错误：{name}解码结果与cantools不一致 帧ID=0x{frame_id:X} 数据={data.hex()}")
+                return 1
+    
+    print(f"帧数: {len(frames)}  重复比例: {args.repeat_ratio}  缓存条目: {args.cache_size}")
+    baseline = None
+    for name, decode in variants:
+        rate = time_frames_per_second(decode, frames, args.repeat)
+        baseline = baseline or rate
+        print(f"{name:<10} {rate:>12,.0f} 帧/秒  {rate / baseline:>6.2f}x")
+    
+    if numpy_available():
+        rate = time_batch_frames_per_second(message_map, frames, args.repeat)
+        print(f"{'批量解码':<10} {rate:>12,.0f} 帧/秒  {rate / baseline:>6.2f}x")
+    else:
+        print("未安装numpy，跳过批量解码")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+# asc_to_csv/benchmarks/bench_output.py
+"""
+输出格式基准测试
+对比CSVWriter（含各CSV压缩方式）、LongWriter（长表）与ArrowWriter（Parquet/Feather及各压缩方式）的写入耗时和文件大小
+
+用法:
+    python benchmarks/bench_output.py [--ticks N] [--signals N] [--density D] [--repeat N]
+"""
+
+import io
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import contextlib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from csv_writer import CSVWriter
+from long_writer import LongWriter
+from arrow_writer import ArrowWriter, ARROW_COMPRESSIONS, arrow_available
+from output_compression import CSV_COMPRESSIONS, compression_available
+from data_processor import DataProcessor
+from benchmarks.synthetic import generate_sample_store
+
+
+def time_write(create_writer, data_processor: DataProcessor, signal_info: dict, repeat: int):
+    """
+    多次写入取最快一次
+    
+    Args:
+        create_writer: 输出目录 -> 写入器
+        data_processor: 已聚合和分组的数据处理器
+        signal_info: 信号信息
+        repeat: 重复次数
+    
+    Returns:
+        Tuple[float, int]: (写入秒数, 分组文件和总览文件的总字节数)
+    """
+    best = float('inf')
+    size = 0
+    for _ in range(repeat):
+        output_dir = tempfile.mkdtemp(prefix="bench_output_")
+        try:
+            writer = create_writer(output_dir)
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                created_files = writer.write_all(
+                    sorted_groups=data_processor.sorted_groups,
+                    classified_signals=data_processor.classified_signals,
+                    time_ticks=data_processor.get_time_ticks(),
+                    aggregated_data=data_processor.aggregated_data,
+                    signal_info=signal_info,
+                    statistics={}
+                )
+            best = min(best, time.perf_counter() - start)
+            size = sum(
+                os.path.getsize(file_path) for file_path in created_files
+                if not file_path.endswith("Summary.csv")
+            )
+        finally:
+            shutil.rmtree(output_dir, ignore_errors=True)
+    return best, size
+
+
+def main() -> int:
+    """基准测试入口"""
+    arg_parser = argparse.ArgumentParser(description="输出格式写入耗时和文件大小基准测试")
+    arg_parser.add_argument("--ticks", type=int, default=20000, help="采样区间数")
+    arg_parser.add_argument("--signals", type=int, default=180, help="信号数量")
+    arg_parser.add_argument("--density", type=float, default=0.3, help="每个信号在每个采样区间有值的概率")
+    arg_parser.add_argument("--repeat", type=int, default=3, help="重复次数（取最快）")
+    args = arg_parser.parse_args()
+    
+    store, signal_info = generate_sample_store(args.ticks, args.signals, density=args.density)
+    data_processor = DataProcessor()
+    data_processor.aggregate(store)
+    data_processor.classify_signals(set(store.signal_names))
+    
+    variants = [
+        ("csv", lambda output_dir: CSVWriter(output_dir)),
+        ("csv/long", lambda output_dir: LongWriter(output_dir)),
+    ]
+    for compression in CSV_COMPRESSIONS:
+        if compression != "none" and compression_available(compression):
+            variants.append((
+                f"csv/{compression}",
+                lambda output_dir, c=compression: CSVWriter(output_dir, compression=c, compression_threads=-1)
+            ))
+    if arrow_available():
+        for output_format, compressions in ARROW_COMPRESSIONS.items():
+            for compression in compressions:
+                variants.append((
+                    f"{output_format}/{compression}",
+                    lambda output_dir, f=output_format, c=compression: ArrowWriter(output_dir, f, c)
+                ))
+    else:
+        print("未安装pyarrow，只测试CSV")
+    
+    print(f"采样区间: {args.ticks}  信号数: {args.signals}  分组数: {len(data_processor.sorted_groups)}  有值概率: {args.density}")
+    baseline = None
+    for name, create_writer in variants:
+        seconds, size = time_write(create_writer, data_processor, signal_info, args.repeat)
+        baseline = baseline or (seconds, size)
+        print(
+            f"{name:<16} {seconds:>8.2f} 秒 {seconds / baseline[0]:>6.2f}x  "
+            f"{size / 1024 / 1024:>9.2f} MB {size / baseline[1]:>7.1%}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+# asc_to_csv/benchmarks/bench_parse_line.py
+"""
+ASC行解析基准测试
+对比旧版逐行正则解析与ASCParser当前快速路径的吞吐量（行/秒）
+
+用法:
+    python benchmarks/bench_parse_line.py [--frames N] [--repeat N]
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+from collections import defaultdict
+
+import cantools
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from asc_parser import ASCParser
+from benchmarks.synthetic import SYNTHETIC_DBC, generate_asc_lines
+
+
+class LegacyLineParser:
+    """
+    旧版行解析器（基准参考实现）
+    
+    保留原ASCParser._parse_line的逻辑：每行未编译正则匹配，
+    先转换时间戳和数据域，再判断帧ID是否已映射。
+    """
+    
+    ASC_PATTERN = ASCParser.ASC_PATTERN
+    
+    def __init__(self, sample_interval: float = 0.1):
+        self.sample_interval = sample_interval
+        self.sampled_data = defaultdict(lambda: defaultdict(list))
+        self.original_count = 0
+    
+    def parse_line(self, line: str, message_map: dict) -> None:
+        line = line.strip()
+        if not line or line.startswith(';'):
+            return
+        
+        match = re.match(self.ASC_PATTERN, line)
+        if not match:
+            return
+        
+        try:
+            timestamp = float(match.group(1))
+            frame_id = int(match.group(3).replace('x', ''), 16)
+            data = bytes.fromhex(match.group(6).replace(' ', ''))
+            
+            if frame_id not in message_map:
+                return
+            
+            self.original_count += 1
+            sampled_time = round(timestamp / self.sample_interval) * self.sample_interval
+            msg_info = message_map[frame_id]
+            msg = msg_info['message']
+            for signal_name, value in msg.decode(data).items():
+                full_signal_name = f"{msg_info['dbc_name']}::{msg.name}::{signal_name}"
+                self.sampled_data[sampled_time][full_signal_name].append(value)
+        except Exception:
+            pass
+
+
+def build_message_map() -> dict:
+    """由合成DBC构建与DBCLoader相同结构的消息映射"""
+    db = cantools.database.load_string(SYNTHETIC_DBC, 'dbc', strict=False)
+    return {
+        msg.frame_id: {'message': msg, 'dbc_name': 'synthetic.dbc'}
+        for msg in db.messages
+    }
+
+
+def time_lines_per_second(parse_line, lines: list, message_map: dict, repeat: int) -> float:
+    """
+    多次运行取最快一次，返回行/秒
+    
+    Args:
+        parse_line: 行解析函数
+        lines: ASC行列表
+        message_map: 消息映射
+        repeat: 重复次数
+    
+    Returns:
+        float: 每秒处理行数
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for line in lines:
+            parse_line(line, message_map)
+        best = min(best, time.perf_counter() - start)
+    return len(lines) / best
+
+
+def main() -> int:
+    """基准测试入口"""
+    arg_parser = argparse.ArgumentParser(description="ASC行解析吞吐量基准测试")
+    arg_parser.add_argument("--frames", type=int, default=200000, help="合成数据帧数量")
+    arg_parser.add_argument("--repeat", type=int, default=3, help="重复次数（取最快）")
+    args = arg_parser.parse_args()
+    
+    lines = generate_asc_lines(args.frames)
+    message_map = build_message_map()
+    
+    legacy = LegacyLineParser()
+    legacy_rate = time_lines_per_second(legacy.parse_line, lines, message_map, args.repeat)
+    
+    parser = ASCParser()
+    parser._prepare(message_map)
+    current_rate = time_lines_per_second(parser._parse_line, lines, message_map, args.repeat)
+    
+    if legacy.original_count != parser.original_count:
+        print(f"错误：解析帧数不一致 旧版={legacy.original_count} 当前={parser.original_count}")
+        return 1
+    
+    print(f"行数: {len(lines)}  已映射帧: {parser.original_count // args.repeat}")
+    print(f"旧版解析:   {legacy_rate:>12,.0f} 行/秒")
+    print(f"当前解析:   {current_rate:>12,.0f} 行/秒")
+    print(f"加速比:     {current_rate / legacy_rate:>12.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
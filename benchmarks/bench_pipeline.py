@@ -0,0 +1,314 @@
+# asc_to_csv/benchmarks/bench_pipeline.py
+"""
+转换流程分阶段基准测试
+生成可复现的合成ASC/DBC工作负载，分别计时DBC加载、解析、聚合、分组、填充和写入各阶段，
+报告行/秒、MB/秒和峰值内存，结果可保存为JSON供不同提交之间对比
+
+用法:
+    python benchmarks/bench_pipeline.py [--duration S] [--bus-load N] [--packs N]
+        [--extended-ratio R] [--unmapped-ratio R] [--comment-ratio R] [--channels N]
+        [--seed N] [--sample-interval S] [--fill STRATEGY] [--reader READER]
+        [--repeat N] [--output FILE] [--work-dir DIR]
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import contextlib
+import subprocess
+import dataclasses
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import ASC_READERS
+from asc_parser import ASCParser
+from dbc_loader import DBCLoader
+from data_processor import DataProcessor
+from csv_writer import CSVWriter
+from gap_fill import FILL_STRATEGIES
+from instrumentation import peak_rss_mb
+from benchmarks.synthetic import WorkloadSpec, generate_workload
+
+
+# 流程阶段（按执行顺序）
+STAGES = ("dbc_load", "parse", "aggregate", "classify", "fill", "write")
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def git_commit() -> Optional[str]:
+    """
+    当前代码的提交号
+    
+    Returns:
+        Optional[str]: 提交号（有未提交修改时追加"-dirty"），不在git仓库中时返回None
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=REPO_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f"{commit}-dirty" if dirty else commit
+
+
+def measure(func: Callable[[], Any]) -> Tuple[Any, Dict[str, Optional[float]]]:
+    """
+    运行一个阶段并记录耗时和内存
+    
+    峰值内存为进程自启动以来的峰值（阶段结束时读取），不会在阶段之间重置。
+    
+    Args:
+        func: 阶段函数
+    
+    Returns:
+        Tuple[Any, Dict[str, Optional[float]]]: (阶段返回值, {seconds, cpu_seconds, peak_rss_mb})
+    """
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    result = func()
+    return result, {
+        'seconds': time.perf_counter() - wall_start,
+        'cpu_seconds': time.process_time() - cpu_start,
+        'peak_rss_mb': peak_rss_mb()
+    }
+
+
+def run_pipeline(
+    dbc_file: str,
+    asc_file: str,
+    sample_interval: float,
+    fill_strategy: str,
+    reader: str
+) -> Tuple[Dict[str, Dict[str, Optional[float]]], Dict[str, int]]:
+    """
+    依次运行各阶段一次
+    
+    fill阶段只生成填充后的行而不写文件；write阶段为CSVWriter.write_all，
+    其中包含写入过程中流式进行的填充。
+    
+    Args:
+        dbc_file: DBC文件路径
+        asc_file: ASC文件路径
+        sample_interval: 采样间隔（秒）
+        fill_strategy: 空值填充方式
+        reader: ASC读取方式
+    
+    Returns:
+        Tuple[Dict, Dict[str, int]]: (各阶段计时, 数据统计)
+    """
+    timings = {}
+    output_dir = tempfile.mkdtemp(prefix="bench_pipeline_")
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            dbc_loader = DBCLoader()
+            loaded, timings['dbc_load'] = measure(lambda: dbc_loader.load([dbc_file]))
+            if not loaded:
+                raise RuntimeError(f"加载DBC文件失败: {dbc_file}")
+            
+            parser = ASCParser(sample_interval=sample_interval, reader=reader)
+            parsed, timings['parse'] = measure(lambda: parser.parse(asc_file, dbc_loader.message_map))
+            if not parsed:
+                raise RuntimeError(f"解析ASC文件失败: {asc_file}")
+            
+            data_processor = DataProcessor()
+            _, timings['aggregate'] = measure(lambda: data_processor.aggregate(parser.sampled_data))
+            _, timings['classify'] = measure(lambda: data_processor.classify_signals(parser.found_signals))
+            
+            writer = CSVWriter(output_dir, sample_interval=sample_interval, fill_strategy=fill_strategy)
+            time_ticks = data_processor.get_time_ticks()
+            all_signals = sorted({
+                sig_name for signals in data_processor.classified_signals.values() for sig_name in signals
+            })
+            _, timings['fill'] = measure(lambda: sum(1 for _ in writer._filled_rows(
+                time_ticks, data_processor.aggregated_data, all_signals
+            )))
+            _, timings['write'] = measure(lambda: writer.write_all(
+                sorted_groups=data_processor.sorted_groups,
+                classified_signals=data_processor.classified_signals,
+                time_ticks=time_ticks,
+                aggregated_data=data_processor.aggregated_data,
+                signal_info=dbc_loader.signal_info,
+                statistics={}
+            ))
+        
+        original_count, sampled_count, signal_count = parser.get_statistics()
+        counts = {
+            'frames': original_count,
+            'sampled_count': sampled_count,
+            'signal_count': signal_count,
+            'output_bytes': sum(
+                os.path.getsize(os.path.join(output_dir, name)) for name in os.listdir(output_dir)
+            )
+        }
+        return timings, counts
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+
+def run_benchmark(
+    spec: WorkloadSpec,
+    sample_interval: float = 0.1,
+    fill_strategy: str = "bucket",
+    reader: str = "mmap",
+    repeat: int = 1,
+    work_dir: Optional[str] = None,
+    warmup: int = 0,
+    statistic: str = "min"
+) -> Dict[str, Any]:
+    """
+    生成工作负载并运行基准测试
+    
+    Args:
+        spec: 工作负载参数
+        sample_interval: 采样间隔（秒）
+        fill_strategy: 空值填充方式
+        reader: ASC读取方式
+        repeat: 重复次数
+        work_dir: 保存合成文件的目录，None表示使用临时目录并在结束后删除
+        warmup: 计时前不计时运行的次数（预热文件缓存、DBC缓存和解码器）
+        statistic: 每个阶段取各次中的哪一次，min为最快，median为中位数
+    
+    Returns:
+        Dict[str, Any]: 可序列化为JSON的结果
+    """
+    directory = work_dir or tempfile.mkdtemp(prefix="bench_workload_")
+    try:
+        dbc_file, asc_file, line_count = generate_workload(spec, directory)
+        asc_bytes = os.path.getsize(asc_file)
+        
+        for _ in range(warmup):
+            run_pipeline(dbc_file, asc_file, sample_interval, fill_strategy, reader)
+        
+        runs: Dict[str, List[Dict[str, Optional[float]]]] = {}
+        counts: Dict[str, int] = {}
+        for _ in range(repeat):
+            timings, counts = run_pipeline(dbc_file, asc_file, sample_interval, fill_strategy, reader)
+            for stage, timing in timings.items():
+                runs.setdefault(stage, []).append(timing)
+    finally:
+        if work_dir is None:
+            shutil.rmtree(directory, ignore_errors=True)
+    
+    best = {}
+    for stage, timings in runs.items():
+        timings.sort(key=lambda timing: timing['seconds'])
+        best[stage] = timings[len(timings) // 2 if statistic == "median" else 0]
+    
+    # 各阶段吞吐量均按ASC输入计算，便于比较各阶段在端到端耗时中的占比
+    stages = {}
+    for stage in STAGES:
+        timing = dict(best[stage])
+        seconds = max(timing['seconds'], 1e-9)
+        timing['lines_per_second'] = line_count / seconds
+        timing['mb_per_second'] = asc_bytes / 1024 / 1024 / seconds
+        stages[stage] = timing
+    total_seconds = sum(best[stage]['seconds'] for stage in STAGES)
+    
+    return {
+        'commit': git_commit(),
+        'timestamp': datetime.now().isoformat(timespec="seconds"),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'workload': dict(
+            dataclasses.asdict(spec),
+            sample_interval=sample_interval,
+            fill_strategy=fill_strategy,
+            reader=reader,
+            asc_lines=line_count,
+            asc_bytes=asc_bytes
+        ),
+        'counts': counts,
+        'repeat': repeat,
+        'warmup': warmup,
+        'statistic': statistic,
+        'stages': stages,
+        'total': {
+            'seconds': total_seconds,
+            'lines_per_second': line_count / max(total_seconds, 1e-9),
+            'mb_per_second': asc_bytes / 1024 / 1024 / max(total_seconds, 1e-9),
+            'peak_rss_mb': peak_rss_mb()
+        }
+    }
+
+
+def print_result(result: Dict[str, Any]) -> None:
+    """
+    打印基准测试结果表
+    
+    Args:
+        result: run_benchmark的结果
+    """
+    workload = result['workload']
+    counts = result['counts']
+    print(
+        f"提交: {result['commit'] or '未知'}  Python {result['python']}  "
+        f"ASC: {workload['asc_lines']}行 {workload['asc_bytes'] / 1024 / 1024:.1f} MB  "
+        f"已映射帧: {counts['frames']}  时间点: {counts['sampled_count']}  信号: {counts['signal_count']}"
+    )
+    print(f"{'阶段':<10} {'耗时(秒)':>10} {'CPU(秒)':>10} {'行/秒':>14} {'MB/秒':>10} {'峰值内存(MB)':>14}")
+    rows = list(result['stages'].items()) + [("total", dict(result['total'], cpu_seconds=None))]
+    for stage, timing in rows:
+        cpu = "" if timing['cpu_seconds'] is None else f"{timing['cpu_seconds']:.3f}"
+        rss = "" if timing['peak_rss_mb'] is None else f"{timing['peak_rss_mb']:.1f}"
+        print(
+            f"{stage:<10} {timing['seconds']:>10.3f} {cpu:>10} "
+            f"{timing['lines_per_second']:>14,.0f} {timing['mb_per_second']:>10.2f} {rss:>14}"
+        )
+
+
+def main() -> int:
+    """基准测试入口"""
+    defaults = WorkloadSpec()
+    arg_parser = argparse.ArgumentParser(description="转换流程分阶段吞吐量和内存基准测试")
+    arg_parser.add_argument("--duration", type=float, default=defaults.duration, help="记录时长（秒）")
+    arg_parser.add_argument("--bus-load", type=float, default=defaults.bus_load, help="总线负载（帧/秒）")
+    arg_parser.add_argument("--packs", type=int, default=defaults.packs, help="BatP电池包数量")
+    arg_parser.add_argument("--extended-ratio", type=float, default=defaults.extended_ratio, help="扩展帧消息占比")
+    arg_parser.add_argument("--unmapped-ratio", type=float, default=defaults.unmapped_ratio, help="未映射帧占比")
+    arg_parser.add_argument("--comment-ratio", type=float, default=defaults.comment_ratio, help="注释和事件行比例")
+    arg_parser.add_argument("--channels", type=int, default=defaults.channels, help="CAN通道数")
+    arg_parser.add_argument("--seed", type=int, default=defaults.seed, help="随机种子")
+    arg_parser.add_argument("--sample-interval", type=float, default=0.1, help="采样间隔（秒）")
+    arg_parser.add_argument("--fill", choices=FILL_STRATEGIES, default="bucket", help="空值填充方式")
+    arg_parser.add_argument("--reader", choices=ASC_READERS, default="mmap", help="ASC读取方式")
+    arg_parser.add_argument("--repeat", type=int, default=1, help="重复次数（每个阶段取最快）")
+    arg_parser.add_argument("--output", help="结果JSON文件路径")
+    arg_parser.add_argument("--work-dir", help="保留合成ASC/DBC文件的目录（默认使用临时目录）")
+    args = arg_parser.parse_args()
+    
+    spec = WorkloadSpec(
+        duration=args.duration,
+        bus_load=args.bus_load,
+        packs=args.packs,
+        extended_ratio=args.extended_ratio,
+        unmapped_ratio=args.unmapped_ratio,
+        comment_ratio=args.comment_ratio,
+        channels=args.channels,
+        seed=args.seed
+    )
+    result = run_benchmark(spec, args.sample_interval, args.fill, args.reader, max(1, args.repeat), args.work_dir)
+    print_result(result)
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"结果已保存: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,278 @@
+# asc_to_csv/benchmarks/regression_check.py
+"""
+性能回归检查
+用一组固定的合成工作负载运行转换流程（ASCParser、DataProcessor、CSVWriter），
+将各阶段的行/秒和峰值内存与保存的基准JSON对比，超出容差时打印对比表并以非零状态退出
+
+基准与机器相关，应在运行检查的同一台机器（或同规格的CI机器）上生成：
+    python benchmarks/regression_check.py --update-baseline
+
+用法:
+    python benchmarks/regression_check.py [--baseline FILE] [--workload NAME ...]
+        [--tolerance R] [--memory-tolerance R] [--min-seconds S] [--repeat N]
+        [--warmup N] [--statistic median|min] [--output FILE] [--update-baseline]
+
+退出状态: 0为无回归，1为存在回归，2为基准文件缺失或与工作负载不匹配
+"""
+
+import os
+import sys
+import json
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import WorkloadSpec
+from benchmarks.bench_pipeline import STAGES, run_benchmark, git_commit
+
+
+# 默认基准文件
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# 固定的回归检查工作负载：名称 -> (工作负载参数, run_benchmark的其他参数)
+REGRESSION_WORKLOADS: Dict[str, Tuple[WorkloadSpec, Dict[str, Any]]] = {
+    # 默认负载：标准帧和扩展帧各半，少量未映射帧
+    "default": (WorkloadSpec(duration=60.0), {}),
+    # 高总线负载、多电池包：解码和聚合为主
+    "dense": (WorkloadSpec(duration=20.0, bus_load=8000.0, packs=24, channels=4), {}),
+    # 大量未映射帧和注释行，文本方式读取：行过滤和逐行解析为主
+    "noisy_text": (
+        WorkloadSpec(duration=60.0, unmapped_ratio=0.6, comment_ratio=0.2),
+        {'reader': "text"}
+    ),
+    # 细采样间隔、长记录：时间点多，填充和写入为主
+    "fine_sampling": (WorkloadSpec(duration=300.0, bus_load=500.0), {'sample_interval': 0.01}),
+}
+
+# 检查的指标：(指标名, 显示名称, 越大越好)
+_THROUGHPUT_METRIC = ("lines_per_second", "行/秒", True)
+_MEMORY_METRIC = ("peak_rss_mb", "峰值内存(MB)", False)
+
+
+def _run_isolated(spec: WorkloadSpec, options: Dict[str, Any], repeat: int, warmup: int, statistic: str) -> Dict[str, Any]:
+    """
+    在新进程中运行一个工作负载
+    
+    峰值常驻内存是进程自启动以来的峰值，每个工作负载在单独的进程中运行，
+    避免前一个工作负载的内存峰值影响后一个。
+    
+    Args:
+        spec: 工作负载参数
+        options: run_benchmark的其他参数
+        repeat: 重复次数
+        warmup: 预热次数
+        statistic: 各次结果的取法（min或median）
+    
+    Returns:
+        Dict[str, Any]: run_benchmark的结果
+    """
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+        return executor.submit(
+            run_benchmark, spec, repeat=repeat, warmup=warmup, statistic=statistic, **options
+        ).result()
+
+
+def run_workloads(names: List[str], repeat: int, warmup: int = 1, statistic: str = "median") -> Dict[str, Dict[str, Any]]:
+    """
+    运行回归检查工作负载
+    
+    Args:
+        names: 工作负载名称
+        repeat: 重复次数
+        warmup: 每个工作负载计时前的预热次数
+        statistic: 各次结果的取法（min为最快，median为中位数）
+    
+    Returns:
+        Dict[str, Dict[str, Any]]: 工作负载名称 -> run_benchmark的结果
+    """
+    results = {}
+    for name in names:
+        spec, options = REGRESSION_WORKLOADS[name]
+        print(f"运行工作负载 {name}（{spec.frame_count}帧）...", flush=True)
+        results[name] = _run_isolated(spec, options, repeat, warmup, statistic)
+    return results
+
+
+def _change(baseline: float, current: float) -> float:
+    """相对变化（current相对baseline）"""
+    return (current - baseline) / baseline if baseline else 0.0
+
+
+def compare_results(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    tolerance: float,
+    memory_tolerance: float,
+    min_seconds: float
+) -> Tuple[List[List[str]], List[str]]:
+    """
+    对比一个工作负载的当前结果与基准
+    
+    各阶段的行/秒下降超过tolerance、或峰值内存增长超过memory_tolerance时判为回归；
+    基准耗时短于min_seconds的阶段计时噪声太大，只列出不判断。
+    
+    Args:
+        baseline: 基准结果（run_benchmark的结果）
+        current: 当前结果
+        tolerance: 吞吐量允许下降的比例
+        memory_tolerance: 峰值内存允许增长的比例
+        min_seconds: 参与判断的最短阶段耗时（秒）
+    
+    Returns:
+        Tuple[List[List[str]], List[str]]: (对比表的行, 回归描述列表)
+    """
+    rows = []
+    regressions = []
+    
+    def check(stage: str, metric: Tuple[str, str, bool], old: Dict[str, Any], new: Dict[str, Any], skip: bool) -> None:
+        key, label, higher_is_better = metric
+        if old.get(key) is None or new.get(key) is None:
+            return
+        change = _change(old[key], new[key])
+        limit = tolerance if higher_is_better else memory_tolerance
+        regressed = -change > limit if higher_is_better else change > limit
+        if skip:
+            status = "跳过（耗时过短）"
+        elif regressed:
+            status = "回归"
+            regressions.append(f"{stage} {label}: {old[key]:,.1f} -> {new[key]:,.1f}（{change:+.1%}，容差{limit:.0%}）")
+        else:
+            status = "正常"
+        rows.append([stage, label, f"{old[key]:,.1f}", f"{new[key]:,.1f}", f"{change:+.1%}", status])
+    
+    for stage in STAGES:
+        old = baseline['stages'][stage]
+        check(stage, _THROUGHPUT_METRIC, old, current['stages'][stage], old['seconds'] < min_seconds)
+    check("total", _THROUGHPUT_METRIC, baseline['total'], current['total'], False)
+    check("total", _MEMORY_METRIC, baseline['total'], current['total'], False)
+    return rows, regressions
+
+
+def _workload_mismatch(baseline: Dict[str, Any], current: Dict[str, Any]) -> Optional[str]:
+    """
+    检查基准与当前结果是否可比
+    
+    Args:
+        baseline: 基准结果
+        current: 当前结果
+    
+    Returns:
+        Optional[str]: 不可比的原因，可比时返回None
+    """
+    # 合成文件的行数和字节数由工作负载参数和生成器决定，
+    # 数据统计由解析结果决定，任何一个变化都说明比较的已不是同一份工作
+    keys = ("asc_lines", "asc_bytes")
+    if any(baseline['workload'].get(key) != current['workload'].get(key) for key in keys):
+        return "工作负载参数或生成器已变化"
+    if baseline['counts'] != current['counts']:
+        return f"解析结果已变化（基准 {baseline['counts']}，当前 {current['counts']}）"
+    return None
+
+
+def print_table(rows: List[List[str]]) -> None:
+    """
+    打印对比表
+    
+    Args:
+        rows: 对比表的行
+    """
+    header = ["阶段", "指标", "基准", "当前", "变化", "状态"]
+    widths = [10, 14, 16, 16, 9, 0]
+    for row in [header] + rows:
+        print("  " + " ".join(
+            cell.ljust(width) if index < 2 or index == 5 else cell.rjust(width)
+            for index, (cell, width) in enumerate(zip(row, widths))
+        ).rstrip())
+
+
+def main() -> int:
+    """回归检查入口"""
+    arg_parser = argparse.ArgumentParser(description="转换流程性能回归检查")
+    arg_parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="基准JSON文件")
+    arg_parser.add_argument(
+        "--workload", nargs="+", choices=list(REGRESSION_WORKLOADS),
+        default=list(REGRESSION_WORKLOADS), help="要运行的工作负载（默认全部）"
+    )
+    arg_parser.add_argument("--tolerance", type=float, default=0.25, help="行/秒允许下降的比例")
+    arg_parser.add_argument("--memory-tolerance", type=float, default=0.10, help="峰值内存允许增长的比例")
+    arg_parser.add_argument("--min-seconds", type=float, default=0.2, help="参与判断的最短阶段耗时（秒）")
+    arg_parser.add_argument("--repeat", type=int, default=5, help="重复次数")
+    arg_parser.add_argument("--warmup", type=int, default=1, help="每个工作负载计时前的预热次数")
+    arg_parser.add_argument(
+        "--statistic", choices=("median", "min"), default="median",
+        help="各阶段耗时取各次的中位数或最快一次"
+    )
+    arg_parser.add_argument("--output", help="保存本次结果的JSON文件")
+    arg_parser.add_argument("--update-baseline", action="store_true", help="用本次结果更新基准文件")
+    args = arg_parser.parse_args()
+    
+    baseline_data = None
+    if not args.update_baseline:
+        if not os.path.exists(args.baseline):
+            print(f"错误：基准文件不存在 - {args.baseline}（先用--update-baseline生成）")
+            return 2
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline_data = json.load(f)
+        missing = [name for name in args.workload if name not in baseline_data['workloads']]
+        if missing:
+            print(f"错误：基准文件中没有工作负载 - {', '.join(missing)}（用--update-baseline更新）")
+            return 2
+    
+    results = run_workloads(args.workload, max(1, args.repeat), max(0, args.warmup), args.statistic)
+    current_data = {'commit': git_commit(), 'workloads': results}
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(current_data, f, ensure_ascii=False, indent=2)
+        print(f"结果已保存: {args.output}")
+    
+    if args.update_baseline:
+        if os.path.exists(args.baseline):
+            with open(args.baseline, 'r', encoding='utf-8') as f:
+                baseline_data = json.load(f)
+            baseline_data['workloads'].update(results)
+            baseline_data['commit'] = current_data['commit']
+        else:
+            baseline_data = current_data
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline_data, f, ensure_ascii=False, indent=2)
+        print(f"基准已更新: {args.baseline}（{', '.join(results)}）")
+        return 0
+    
+    print(f"\n基准提交: {baseline_data.get('commit') or '未知'}  当前提交: {current_data['commit'] or '未知'}")
+    print(f"容差: 行/秒下降{args.tolerance:.0%}，峰值内存增长{args.memory_tolerance:.0%}")
+    
+    all_regressions = []
+    mismatched = []
+    for name, result in results.items():
+        baseline = baseline_data['workloads'][name]
+        print(f"\n工作负载 {name}:")
+        mismatch = _workload_mismatch(baseline, result)
+        if mismatch:
+            print(f"  无法比较: {mismatch}，请用--update-baseline更新基准")
+            mismatched.append(name)
+            continue
+        rows, regressions = compare_results(
+            baseline, result, args.tolerance, args.memory_tolerance, args.min_seconds
+        )
+        print_table(rows)
+        all_regressions.extend(f"{name}: {regression}" for regression in regressions)
+    
+    print()
+    if all_regressions:
+        print(f"❌ 发现{len(all_regressions)}项性能回归：")
+        for regression in all_regressions:
+            print(f"  {regression}")
+        return 1
+    if mismatched:
+        print(f"⚠ 工作负载与基准不匹配: {', '.join(mismatched)}")
+        return 2
+    print("✅ 未发现性能回归")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
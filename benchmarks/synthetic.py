@@ -0,0 +1,367 @@
+# asc_to_csv/benchmarks/synthetic.py
+"""
+合成测试数据模块
+生成可复现的ASC行和配套的DBC定义，供基准测试使用
+"""
+
+import os
+import random
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+from sample_store import SampleStore
+
+
+SYNTHETIC_DBC = '''VERSION ""
+
+NS_ :
+
+BS_:
+
+BU_: BMS
+
+BO_ 256 BatP3_BMS_CellVolt: 8 BMS
+ SG_ P3_MaxCellVlt : 0|16@1+ (0.001,0) [0|65.535] "V" Vector__XXX
+ SG_ P3_MinCellVlt : 16|16@1+ (0.001,0) [0|65.535] "V" Vector__XXX
+ SG_ P3_Temp : 32|8@1- (1,-40) [-40|215] "degC" Vector__XXX
+ SG_ P3_State : 40|4@1+ (1,0) [0|15] "" Vector__XXX
+
+BO_ 257 BatP4_BMS_Current: 8 BMS
+ SG_ P4_Current : 7|16@0- (0.1,0) [-3276.8|3276.7] "A" Vector__XXX
+ SG_ P4_Volt : 23|12@0+ (0.5,0) [0|2047.5] "V" Vector__XXX
+
+BO_ 2566869221 VCU_Status: 8 BMS
+ SG_ VCU_Mode : 0|3@1+ (1,0) [0|7] "" Vector__XXX
+ SG_ VCU_Speed : 8|16@1+ (0.01,0) [0|655.35] "km/h" Vector__XXX
+
+VAL_ 256 P3_State 0 "Standby" 1 "Charge" 2 "Discharge" 3 "Fault" ;
+'''
+
+# (帧ID文本, DLC)，前三个在SYNTHETIC_DBC中有定义，其余为未映射帧
+SYNTHETIC_FRAMES = [
+    ("100", 8),
+    ("101", 8),
+    ("18FF50E5x", 8),
+    ("300", 8),
+    ("7DF", 8),
+    ("1FFFFFFFx", 8),
+]
+
+ASC_HEADER = [
+    "date Wed Jan 30 10:33:58.000 am 2026",
+    "base hex  timestamps absolute",
+    "internal events logged",
+    "// version 13.0.0",
+    "Begin Triggerblock Wed Jan 30 10:33:58.000 am 2026",
+    "   0.000000 Start of measurement",
+]
+
+
+def generate_asc_lines(frame_count: int, seed: int = 0, comment_ratio: float = 0.01) -> List[str]:
+    """
+    生成合成ASC行
+    
+    Args:
+        frame_count: 数据帧数量
+        seed: 随机种子
+        comment_ratio: 注释行占比
+    
+    Returns:
+        List[str]: ASC文件行（含换行符）
+    """
+    rng = random.Random(seed)
+    lines = [line + "\n" for line in ASC_HEADER]
+    timestamp = 0.0
+    
+    for _ in range(frame_count):
+        timestamp += rng.uniform(0.0005, 0.002)
+        frame_id, dlc = rng.choice(SYNTHETIC_FRAMES)
+        data = " ".join(f"{rng.randrange(256):02X}" for _ in range(dlc))
+        lines.append(f"{timestamp:11.6f} 1  {frame_id:<16} Rx   d {dlc} {data}\n")
+        
+        if rng.random() < comment_ratio:
+            lines.append("; 注释 comment line\n")
+    
+    lines.append("End TriggerBlock\n")
+    return lines
+
+
+def generate_frames(frame_count: int, seed: int = 0, repeat_ratio: float = 0.9) -> List[Tuple[int, bytes]]:
+    """
+    生成已映射帧的 (帧ID, 数据域) 序列
+    
+    按repeat_ratio的概率重复同一帧ID上一次的数据域，模拟BMS状态帧长时间不变的情况。
+    
+    Args:
+        frame_count: 帧数量
+        seed: 随机种子
+        repeat_ratio: 重复上一次数据域的概率
+    
+    Returns:
+        List[Tuple[int, bytes]]: 帧列表
+    """
+    rng = random.Random(seed)
+    mapped_ids = [
+        int(frame_id.rstrip('x'), 16)
+        for frame_id, _ in SYNTHETIC_FRAMES[:3]
+    ]
+    last_payload = {}
+    frames = []
+    
+    for _ in range(frame_count):
+        frame_id = rng.choice(mapped_ids)
+        data = last_payload.get(frame_id)
+        if data is None or rng.random() >= repeat_ratio:
+            data = last_payload[frame_id] = bytes(rng.randrange(256) for _ in range(8))
+        frames.append((frame_id, data))
+    
+    return frames
+
+
+# 合成采样数据中枚举信号的取值
+SYNTHETIC_STATES = ("Standby", "Charge", "Discharge", "Fault")
+
+
+def generate_sample_store(
+    tick_count: int,
+    signal_count: int,
+    seed: int = 0,
+    density: float = 0.3
+) -> Tuple[SampleStore, Dict[str, Dict[str, str]]]:
+    """
+    生成合成采样数据
+    
+    信号平均分布在BatP1~BatP8和Other分组中，依次为浮点（电压）、整数（温度）和枚举（状态）信号，
+    每个采样区间内每个信号按density的概率有值。
+    
+    Args:
+        tick_count: 采样区间数
+        signal_count: 信号数量
+        seed: 随机种子
+        density: 每个信号在每个采样区间有值的概率
+    
+    Returns:
+        Tuple[SampleStore, Dict[str, Dict[str, str]]]: (采样数据, 与DBCLoader.signal_info结构相同的信号信息)
+    """
+    rng = random.Random(seed)
+    store = SampleStore()
+    signal_info = {}
+    columns = []
+    
+    for index in range(signal_count):
+        group = index % 9
+        message = f"BatP{group + 1}_BMS_Msg{index // 9}" if group < 8 else f"VCU_Msg{index // 9}"
+        kind = index // 9 % 3
+        short_name = ("CellVlt", "Temp", "State")[kind] + str(index)
+        full_name = f"synthetic.dbc::{message}::{short_name}"
+        signal_info[full_name] = {
+            'unit': ("V", "degC", "")[kind],
+            'message': message,
+            'dbc': 'synthetic.dbc'
+        }
+        columns.append((store.column(full_name), kind))
+    
+    for tick in range(tick_count):
+        position = store.locate(tick)
+        for column, kind in columns:
+            if rng.random() >= density:
+                continue
+            if kind == 0:
+                column.put(position, round(rng.uniform(3.0, 4.2), 3))
+            elif kind == 1:
+                column.put(position, rng.randrange(-40, 80))
+            else:
+                column.put(position, rng.choice(SYNTHETIC_STATES))
+    
+    return store, signal_info
+
+
+@dataclass
+class WorkloadSpec:
+    """
+    合成ASC/DBC工作负载参数
+    
+    Attributes:
+        duration: 记录时长（秒）
+        bus_load: 总线负载（帧/秒，所有通道合计）
+        packs: BatP电池包数量，每个包有电压、温度、状态3个消息
+        extended_ratio: 使用扩展帧ID的消息占比
+        unmapped_ratio: DBC中未定义的帧占比
+        comment_ratio: 注释和事件行数相对于数据帧数的比例
+        channels: CAN通道数
+        seed: 随机种子
+    """
+    
+    duration: float = 60.0
+    bus_load: float = 2000.0
+    packs: int = 8
+    extended_ratio: float = 0.5
+    unmapped_ratio: float = 0.2
+    comment_ratio: float = 0.01
+    channels: int = 2
+    seed: int = 0
+    
+    @property
+    def frame_count(self) -> int:
+        """数据帧数量"""
+        return int(self.duration * self.bus_load)
+
+
+# 工作负载中的未映射帧（帧ID文本, DLC），与生成的消息ID不重叠
+WORKLOAD_UNMAPPED_FRAMES = [
+    ("7DF", 8),
+    ("7E8", 8),
+    ("1FFFFFFFx", 8),
+    ("18DAF110x", 8),
+]
+
+# 每个电池包的消息：(消息名后缀, [SG_行模板])，模板中的{p}为包编号
+_PACK_MESSAGES = [
+    ("BMS_CellVolt", [
+        f" SG_ P{{p}}_CellVlt{index + 1} : {index * 16}|16@1+ (0.001,0) [0|65.535] \"V\" Vector__XXX"
+        for index in range(4)
+    ]),
+    ("BMS_Temp", [
+        f" SG_ P{{p}}_Temp{index + 1} : {index * 8}|8@1- (1,-40) [-40|215] \"degC\" Vector__XXX"
+        for index in range(8)
+    ]),
+    ("BMS_Status", [
+        " SG_ P{p}_Current : 7|16@0- (0.1,0) [-3276.8|3276.7] \"A\" Vector__XXX",
+        " SG_ P{p}_SOC : 16|8@1+ (0.5,0) [0|127.5] \"%\" Vector__XXX",
+        " SG_ P{p}_State : 24|4@1+ (1,0) [0|15] \"\" Vector__XXX",
+    ]),
+]
+
+_OTHER_MESSAGES = [
+    ("VCU_Status", [
+        " SG_ VCU_Mode : 0|3@1+ (1,0) [0|7] \"\" Vector__XXX",
+        " SG_ VCU_Speed : 8|16@1+ (0.01,0) [0|655.35] \"km/h\" Vector__XXX",
+    ]),
+    ("VCU_Torque", [
+        " SG_ VCU_TorqueReq : 0|16@1- (0.1,0) [-3276.8|3276.7] \"Nm\" Vector__XXX",
+        " SG_ VCU_TorqueAct : 16|16@1- (0.1,0) [-3276.8|3276.7] \"Nm\" Vector__XXX",
+    ]),
+]
+
+
+def workload_messages(spec: WorkloadSpec) -> List[Tuple[int, bool, str, List[str]]]:
+    """
+    生成工作负载的消息定义
+    
+    Args:
+        spec: 工作负载参数
+    
+    Returns:
+        List[Tuple[int, bool, str, List[str]]]: (帧ID, 是否扩展帧, 消息名, SG_行) 列表
+    """
+    rng = random.Random(spec.seed)
+    named = [
+        (f"BatP{pack}_{suffix}", [line.format(p=pack) for line in signal_lines])
+        for pack in range(1, spec.packs + 1)
+        for suffix, signal_lines in _PACK_MESSAGES
+    ] + _OTHER_MESSAGES
+    
+    messages = []
+    for index, (name, signal_lines) in enumerate(named):
+        extended = rng.random() < spec.extended_ratio
+        frame_id = 0x18FF0000 + index if extended else 0x100 + index
+        messages.append((frame_id, extended, name, signal_lines))
+    return messages
+
+
+def generate_workload_dbc(spec: WorkloadSpec) -> str:
+    """
+    生成与工作负载配套的DBC文本
+    
+    Args:
+        spec: 工作负载参数
+    
+    Returns:
+        str: DBC文件内容
+    """
+    lines = ['VERSION ""', '', 'NS_ :', '', 'BS_:', '', 'BU_: BMS', '']
+    value_tables = []
+    for frame_id, extended, name, signal_lines in workload_messages(spec):
+        dbc_id = frame_id | 0x80000000 if extended else frame_id
+        lines.append(f"BO_ {dbc_id} {name}: 8 BMS")
+        lines.extend(signal_lines)
+        lines.append("")
+        for line in signal_lines:
+            signal_name = line.split()[1]
+            if signal_name.endswith("_State"):
+                value_tables.append(f'VAL_ {dbc_id} {signal_name} 0 "Standby" 1 "Charge" 2 "Discharge" 3 "Fault" ;')
+    lines.extend(value_tables)
+    return "\n".join(lines) + "\n"
+
+
+def write_workload_asc(spec: WorkloadSpec, asc_file: str) -> int:
+    """
+    按工作负载参数流式写入合成ASC文件
+    
+    帧间隔围绕1/bus_load随机抖动，按unmapped_ratio混入未映射帧，
+    按comment_ratio穿插注释行和通道事件行。
+    
+    Args:
+        spec: 工作负载参数
+        asc_file: ASC文件路径
+    
+    Returns:
+        int: 写入的行数
+    """
+    rng = random.Random(spec.seed)
+    frames = [
+        (f"{frame_id:X}x" if extended else f"{frame_id:X}", 8)
+        for frame_id, extended, _, _ in workload_messages(spec)
+    ]
+    interval = 1.0 / spec.bus_load
+    timestamp = 0.0
+    line_count = 0
+    
+    with open(asc_file, 'w', encoding='utf-8', newline='\n') as f:
+        lines = [line + "\n" for line in ASC_HEADER]
+        for _ in range(spec.frame_count):
+            timestamp += interval * rng.uniform(0.5, 1.5)
+            if rng.random() < spec.unmapped_ratio:
+                frame_id, dlc = rng.choice(WORKLOAD_UNMAPPED_FRAMES)
+            else:
+                frame_id, dlc = rng.choice(frames)
+            channel = rng.randrange(1, spec.channels + 1)
+            data = rng.getrandbits(dlc * 8).to_bytes(dlc, 'little').hex(' ').upper()
+            lines.append(f"{timestamp:11.6f} {channel}  {frame_id:<16} Rx   d {dlc} {data}\n")
+            
+            if rng.random() < spec.comment_ratio:
+                if rng.random() < 0.5:
+                    lines.append("; 注释 comment line\n")
+                else:
+                    lines.append(f"{timestamp:11.6f} CAN {channel} Status:chip status error active\n")
+            
+            if len(lines) >= 10000:
+                line_count += len(lines)
+                f.writelines(lines)
+                lines = []
+        
+        lines.append("End TriggerBlock\n")
+        line_count += len(lines)
+        f.writelines(lines)
+    
+    return line_count
+
+
+def generate_workload(spec: WorkloadSpec, directory: str) -> Tuple[str, str, int]:
+    """
+    在目录中生成合成DBC和ASC文件
+    
+    Args:
+        spec: 工作负载参数
+        directory: 输出目录
+    
+    Returns:
+        Tuple[str, str, int]: (DBC文件路径, ASC文件路径, ASC行数)
+    """
+    os.makedirs(directory, exist_ok=True)
+    dbc_file = os.path.join(directory, "synthetic.dbc")
+    asc_file = os.path.join(directory, "synthetic.asc")
+    with open(dbc_file, 'w', encoding='utf-8') as f:
+        f.write(generate_workload_dbc(spec))
+    line_count = write_workload_asc(spec, asc_file)
+    return dbc_file, asc_file, line_count
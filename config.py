@@ -5,15 +5,28 @@
 """
 
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Dict, List, Optional
 import os
+import re
 import json
 
+from sample_store import REDUCERS
+from batch_decoder import numpy_available
+from dbc_loader import SignalSelector
+from dbc_cache import DBCCache
+from gap_fill import FILL_STRATEGIES, fill_available
+from arrow_writer import OUTPUT_FORMATS, ARROW_COMPRESSIONS, arrow_available
+from long_writer import OUTPUT_LAYOUTS
+from output_compression import CSV_COMPRESSIONS, COMPRESSION_LEVELS, compression_available
+from input_compression import detect_input_compression, find_compressed_input, input_compression_available
+from profiler import PROFILE_MODES, PROFILE_STAGES, Profiler
+
 
 CONFIG_FILE_NAME = "config.json"
 
 ALLOWED_PATH_EXTENSIONS = {'.asc', '.dbc', '.csv'}
 MAX_PATH_LENGTH = 4096
+ASC_READERS = ("mmap", "text")
 
 
 def sanitize_path(path: str) -> str:
@@ -22,7 +35,7 @@ def sanitize_path(path: str) -> str:
     
     Args:
         path: 原始路径
-        
+    
     Returns:
         str: 清理后的路径
     """
@@ -78,6 +91,34 @@ class Config:
         group_size: 分组大小
         csv_encoding: CSV文件编码
         debug: 是否启用调试模式
+        workers: 解析进程数（1为单进程）
+        asc_reader: ASC读取方式（"mmap"为内存映射字节读取，"text"为文本解码读取）
+        default_reducer: 采样区间内的默认聚合方式（last/first/mean/min/max/count/rms）
+        signal_reducers: 按信号指定聚合方式，键为匹配完整信号名称的通配符模式
+        decode_cache_size: 解码结果缓存条目数（按帧ID和数据域缓存，0为不缓存）
+        compiled_decoders: 是否为每个消息生成专用解码器（不支持的消息回退到cantools）
+        batch_decode: 是否按消息批量向量化解码（需要numpy）
+        signal_include: 信号白名单，匹配完整信号名称的通配符模式（"re:"开头为正则表达式），为空表示全部
+        signal_exclude: 信号黑名单，模式格式同signal_include
+        dbc_cache: 是否缓存DBC解析结果（按路径、修改时间、大小和内容哈希自动失效）
+        dbc_cache_dir: DBC缓存目录，为空时使用用户缓存目录
+        fill_interval: 空值填充区间（秒，bucket填充方式使用）
+        fill_strategy: 空值填充方式（bucket/ffill/linear/none）
+        fill_max_age: 最大填充时长（秒，ffill和linear方式使用），0表示不限制
+        output_format: 输出格式（csv/parquet/feather，parquet和feather需要pyarrow）
+        arrow_compression: parquet/feather文件的压缩方式
+        output_layout: 输出布局（wide为每个时间点一行的宽表，long为每个观测一行的长表，仅支持csv）
+        csv_compression: CSV分组文件和总览文件的压缩方式（none/gzip/xz/zstd/lz4，zstd和lz4需要对应的库）
+        csv_compression_level: CSV压缩级别，None表示默认级别
+        csv_compression_threads: zstd压缩线程数（0为单线程，-1为全部CPU核心）
+        merge_files: 按时间戳合并为一个数据流转换的ASC文件列表（分段文件或多通道日志），非空时代替asc_file
+        asc_files: 批量转换的输入，每项为ASC文件、目录或通配符模式，非空时忽略asc_file
+        batch_workers: 批量转换的进程数（-1为全部CPU核心）
+        trace_memory: 是否用tracemalloc记录各阶段的内存分配峰值（会明显降低转换速度）
+        profile: 性能剖析方式（none、cprofile、sample），剖析结果写入输出目录
+        profile_stage: 剖析范围（all为整个转换，或parse、write等单个阶段）
+        profile_interval: sample方式的调用栈采样间隔（秒）
+        show_progress: 命令行转换时是否在stderr显示解析和写入进度（stderr不是终端时不显示）
     """
     
     asc_file: str = ""
@@ -87,6 +128,34 @@ class Config:
     group_size: int = 5
     csv_encoding: str = "utf-8-sig"
     debug: bool = False
+    workers: int = 1
+    asc_reader: str = "mmap"
+    default_reducer: str = "last"
+    signal_reducers: Dict[str, str] = field(default_factory=dict)
+    decode_cache_size: int = 4096
+    compiled_decoders: bool = False
+    batch_decode: bool = False
+    signal_include: List[str] = field(default_factory=list)
+    signal_exclude: List[str] = field(default_factory=list)
+    dbc_cache: bool = True
+    dbc_cache_dir: str = ""
+    fill_interval: float = 0.5
+    fill_strategy: str = "bucket"
+    fill_max_age: float = 0.0
+    output_format: str = "csv"
+    arrow_compression: str = "zstd"
+    output_layout: str = "wide"
+    csv_compression: str = "none"
+    csv_compression_level: Optional[int] = None
+    csv_compression_threads: int = -1
+    merge_files: List[str] = field(default_factory=list)
+    asc_files: List[str] = field(default_factory=list)
+    batch_workers: int = -1
+    trace_memory: bool = False
+    profile: str = "none"
+    profile_stage: str = "all"
+    profile_interval: float = 0.005
+    show_progress: bool = True
     
     def validate(self) -> bool:
         """
@@ -95,22 +164,7 @@ class Config:
         Returns:
             bool: 配置是否有效
         """
-        if not self.asc_file:
-            print("错误：ASC文件路径未设置")
-            return False
-        
-        try:
-            self.asc_file = sanitize_path(self.asc_file)
-        except ValueError as e:
-            print(f"错误：ASC文件路径无效 - {e}")
-            return False
-        
-        if not os.path.exists(self.asc_file):
-            print(f"错误：ASC文件不存在 - {self.asc_file}")
-            return False
-        
-        if not os.access(self.asc_file, os.R_OK):
-            print(f"错误：无权限读取ASC文件 - {self.asc_file}")
+        if not self.asc_files and not self._validate_asc_file():
             return False
         
         if not self.dbc_files:
@@ -143,8 +197,196 @@ class Config:
             print("错误：分组大小必须大于0")
             return False
         
+        if self.fill_interval <= 0:
+            print("错误：空值填充间隔必须大于0")
+            return False
+        
+        if self.fill_strategy not in FILL_STRATEGIES:
+            print(f"错误：空值填充方式无效 - {self.fill_strategy}（可选: {', '.join(FILL_STRATEGIES)}）")
+            return False
+        
+        if self.fill_strategy not in ("bucket", "none") and not fill_available():
+            print(f"错误：空值填充方式{self.fill_strategy}需要安装numpy")
+            return False
+        
+        if self.fill_max_age < 0:
+            print("错误：最大填充时长不能为负数")
+            return False
+        
+        if self.output_format not in OUTPUT_FORMATS:
+            print(f"错误：输出格式无效 - {self.output_format}（可选: {', '.join(OUTPUT_FORMATS)}）")
+            return False
+        
+        if self.output_layout not in OUTPUT_LAYOUTS:
+            print(f"错误：输出布局无效 - {self.output_layout}（可选: {', '.join(OUTPUT_LAYOUTS)}）")
+            return False
+        
+        if self.output_layout == "long" and self.output_format != "csv":
+            print("错误：长表布局仅支持csv输出格式")
+            return False
+        
+        if self.csv_compression not in CSV_COMPRESSIONS:
+            print(f"错误：CSV压缩方式无效 - {self.csv_compression}（可选: {', '.join(CSV_COMPRESSIONS)}）")
+            return False
+        
+        if not compression_available(self.csv_compression):
+            library = "zstandard" if self.csv_compression == "zstd" else self.csv_compression
+            print(f"错误：CSV压缩方式{self.csv_compression}需要安装{library}")
+            return False
+        
+        if self.csv_compression != "none" and self.csv_compression_level is not None:
+            low, high, _ = COMPRESSION_LEVELS[self.csv_compression]
+            if not low <= self.csv_compression_level <= high:
+                print(f"错误：{self.csv_compression}压缩级别必须在{low}~{high}之间")
+                return False
+        
+        if self.csv_compression_threads < -1:
+            print("错误：压缩线程数必须大于等于-1")
+            return False
+        
+        if self.batch_workers == 0 or self.batch_workers < -1:
+            print("错误：批量转换进程数必须大于0或为-1")
+            return False
+        
+        if self.profile not in PROFILE_MODES:
+            print(f"错误：剖析方式无效 - {self.profile}（可选: {', '.join(PROFILE_MODES)}）")
+            return False
+        
+        if self.profile_stage not in PROFILE_STAGES:
+            print(f"错误：剖析范围无效 - {self.profile_stage}（可选: {', '.join(PROFILE_STAGES)}）")
+            return False
+        
+        if self.profile_interval <= 0:
+            print("错误：剖析采样间隔必须大于0")
+            return False
+        
+        if self.output_format != "csv":
+            if not arrow_available():
+                print(f"错误：输出格式{self.output_format}需要安装pyarrow")
+                return False
+            compressions = ARROW_COMPRESSIONS[self.output_format]
+            if self.arrow_compression not in compressions:
+                print(f"错误：{self.output_format}压缩方式无效 - {self.arrow_compression}（可选: {', '.join(compressions)}）")
+                return False
+        
+        if self.workers <= 0:
+            print("错误：解析进程数必须大于0")
+            return False
+        
+        if self.asc_reader not in ASC_READERS:
+            print(f"错误：ASC读取方式无效 - {self.asc_reader}（可选: {', '.join(ASC_READERS)}）")
+            return False
+        
+        if self.decode_cache_size < 0:
+            print("错误：解码缓存大小不能为负数")
+            return False
+        
+        if self.batch_decode and not numpy_available():
+            print("警告：未安装numpy，批量解码不可用，将逐帧解码")
+        
+        try:
+            self.get_signal_selector()
+        except re.error as e:
+            print(f"错误：信号选择模式无效 - {e.pattern}: {e}")
+            return False
+        
+        for reducer in [self.default_reducer, *self.signal_reducers.values()]:
+            if reducer not in REDUCERS:
+                print(f"错误：聚合方式无效 - {reducer}（可选: {', '.join(REDUCERS)}）")
+                return False
+        
+        return True
+    
+    def _validate_asc_file(self) -> bool:
+        """
+        验证ASC文件路径（merge_files非空时逐个验证）
+        
+        Returns:
+            bool: ASC文件是否有效
+        """
+        if self.merge_files:
+            for i, merge_file in enumerate(self.merge_files):
+                asc_file = self._check_asc_path(merge_file)
+                if asc_file is None:
+                    return False
+                self.merge_files[i] = asc_file
+            return True
+        
+        if not self.asc_file:
+            print("错误：ASC文件路径未设置")
+            return False
+        
+        asc_file = self._check_asc_path(self.asc_file)
+        if asc_file is None:
+            return False
+        self.asc_file = asc_file
         return True
     
+    @staticmethod
+    def _check_asc_path(asc_file: str) -> Optional[str]:
+        """
+        检查单个ASC文件路径（不存在时查找同名的压缩文件）
+        
+        Args:
+            asc_file: ASC文件路径
+        
+        Returns:
+            Optional[str]: 清理后的实际文件路径，无效时返回None
+        """
+        try:
+            asc_file = sanitize_path(asc_file)
+        except ValueError as e:
+            print(f"错误：ASC文件路径无效 - {e}")
+            return None
+        
+        if not os.path.exists(asc_file):
+            compressed_file = find_compressed_input(asc_file)
+            if compressed_file is None:
+                print(f"错误：ASC文件不存在 - {asc_file}")
+                return None
+            print(f"提示：使用压缩的ASC文件 - {compressed_file}")
+            asc_file = compressed_file
+        
+        if not os.access(asc_file, os.R_OK):
+            print(f"错误：无权限读取ASC文件 - {asc_file}")
+            return None
+        
+        asc_compression = detect_input_compression(asc_file)
+        if asc_compression is not None and not input_compression_available(asc_compression):
+            print(f"错误：读取{asc_compression}压缩的ASC文件需要安装{'zstandard' if asc_compression == 'zstd' else asc_compression}")
+            return None
+        
+        return asc_file
+    
+    def get_signal_selector(self) -> SignalSelector:
+        """
+        创建信号选择器
+        
+        Returns:
+            SignalSelector: 按signal_include和signal_exclude选择信号
+        """
+        return SignalSelector(self.signal_include, self.signal_exclude)
+    
+    def get_dbc_cache(self) -> Optional[DBCCache]:
+        """
+        创建DBC缓存
+        
+        Returns:
+            Optional[DBCCache]: 未启用缓存时返回None
+        """
+        if not self.dbc_cache:
+            return None
+        return DBCCache(self.dbc_cache_dir)
+    
+    def get_profiler(self) -> Profiler:
+        """
+        创建性能剖析器
+        
+        Returns:
+            Profiler: 按profile、profile_stage和profile_interval剖析（profile为none时不剖析）
+        """
+        return Profiler(self.profile, self.profile_stage, self.profile_interval)
+    
     def create_output_dir(self) -> bool:
         """
         创建输出目录
@@ -180,7 +422,7 @@ def load_config_from_json(config_path: str) -> dict:
     
     Args:
         config_path: 配置文件路径
-        
+    
     Returns:
         dict: 配置字典
     """
@@ -195,7 +437,7 @@ def resolve_path(path: str, base_dir: str = None) -> str:
     Args:
         path: 原始路径
         base_dir: 基准目录（用于解析相对路径）
-        
+    
     Returns:
         str: 解析后的绝对路径
     """
@@ -228,43 +470,93 @@ def get_config() -> Config:
     config_path = get_config_path()
     
     if config_path:
-        print(f"加载配置文件: {config_path}")
-        config_dir = os.path.dirname(config_path)
-        
-        try:
-            config_data = load_config_from_json(config_path)
-        except json.JSONDecodeError as e:
-            print(f"错误：配置文件格式错误 - {e}")
-            return Config()
-        except Exception as e:
-            print(f"错误：加载配置文件失败 - {e}")
-            return Config()
-        
-        try:
-            asc_file = resolve_path(config_data.get("asc_file", ""), config_dir)
-            dbc_files = [
-                resolve_path(dbc, config_dir) 
-                for dbc in config_data.get("dbc_files", [])
-            ]
-            output_dir = resolve_path(config_data.get("output_dir", ""), config_dir)
-            
-            return Config(
-                asc_file=asc_file,
-                dbc_files=dbc_files,
-                output_dir=output_dir,
-                sample_interval=float(config_data.get("sample_interval", 0.1)),
-                group_size=int(config_data.get("group_size", 5)),
-                csv_encoding=config_data.get("csv_encoding", "utf-8-sig"),
-                debug=bool(config_data.get("debug", False))
-            )
-        except (ValueError, TypeError) as e:
-            print(f"错误：配置参数无效 - {e}")
-            return Config()
+        return load_config(config_path)
     
     print("警告：未找到配置文件，请创建config.json或设置环境变量ASC_TO_CSV_CONFIG")
     return Config()
 
 
+def load_config(config_path: str) -> Config:
+    """
+    从JSON配置文件创建配置对象（相对路径相对于配置文件所在目录）
+    
+    Args:
+        config_path: 配置文件路径
+    
+    Returns:
+        Config: 配置对象，文件无效时为默认空配置
+    """
+    print(f"加载配置文件: {config_path}")
+    config_dir = os.path.dirname(config_path)
+    
+    try:
+        config_data = load_config_from_json(config_path)
+    except json.JSONDecodeError as e:
+        print(f"错误：配置文件格式错误 - {e}")
+        return Config()
+    except Exception as e:
+        print(f"错误：加载配置文件失败 - {e}")
+        return Config()
+    
+    try:
+        asc_file = resolve_path(config_data.get("asc_file", ""), config_dir)
+        dbc_files = [
+            resolve_path(dbc, config_dir) 
+            for dbc in config_data.get("dbc_files", [])
+        ]
+        output_dir = resolve_path(config_data.get("output_dir", ""), config_dir)
+        
+        return Config(
+            asc_file=asc_file,
+            dbc_files=dbc_files,
+            output_dir=output_dir,
+            sample_interval=float(config_data.get("sample_interval", 0.1)),
+            group_size=int(config_data.get("group_size", 5)),
+            csv_encoding=config_data.get("csv_encoding", "utf-8-sig"),
+            debug=bool(config_data.get("debug", False)),
+            workers=int(config_data.get("workers", 1)),
+            asc_reader=config_data.get("asc_reader", "mmap"),
+            default_reducer=config_data.get("default_reducer", "last"),
+            signal_reducers=dict(config_data.get("signal_reducers", {})),
+            decode_cache_size=int(config_data.get("decode_cache_size", 4096)),
+            compiled_decoders=bool(config_data.get("compiled_decoders", False)),
+            batch_decode=bool(config_data.get("batch_decode", False)),
+            signal_include=list(config_data.get("signal_include", [])),
+            signal_exclude=list(config_data.get("signal_exclude", [])),
+            dbc_cache=bool(config_data.get("dbc_cache", True)),
+            dbc_cache_dir=resolve_path(config_data.get("dbc_cache_dir", ""), config_dir),
+            fill_interval=float(config_data.get("fill_interval", 0.5)),
+            fill_strategy=config_data.get("fill_strategy", "bucket"),
+            fill_max_age=float(config_data.get("fill_max_age", 0.0)),
+            output_format=config_data.get("output_format", "csv"),
+            arrow_compression=config_data.get("arrow_compression", "zstd"),
+            output_layout=config_data.get("output_layout", "wide"),
+            csv_compression=config_data.get("csv_compression", "none"),
+            csv_compression_level=(
+                None if config_data.get("csv_compression_level") is None
+                else int(config_data["csv_compression_level"])
+            ),
+            csv_compression_threads=int(config_data.get("csv_compression_threads", -1)),
+            merge_files=[
+                resolve_path(merge_file, config_dir)
+                for merge_file in config_data.get("merge_files", [])
+            ],
+            asc_files=[
+                resolve_path(asc_input, config_dir)
+                for asc_input in config_data.get("asc_files", [])
+            ],
+            batch_workers=int(config_data.get("batch_workers", -1)),
+            trace_memory=bool(config_data.get("trace_memory", False)),
+            profile=config_data.get("profile", "none"),
+            profile_stage=config_data.get("profile_stage", "all"),
+            profile_interval=float(config_data.get("profile_interval", 0.005)),
+            show_progress=bool(config_data.get("show_progress", True))
+        )
+    except (ValueError, TypeError) as e:
+        print(f"错误：配置参数无效 - {e}")
+        return Config()
+
+
 def get_default_config() -> Config:
     """
     获取配置（兼容旧接口）
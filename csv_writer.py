@@ -7,10 +7,21 @@ CSV文件输出模块
 
 import os
 import csv
-from typing import Dict, List, Set, Any, Optional
-from collections import defaultdict
+import contextlib
+from operator import itemgetter
+from typing import Dict, Iterator, List, Set, Any, Optional, Tuple
+from collections.abc import Mapping
 
 from utils import safe_value
+from sample_store import AggregatedView
+from gap_fill import ColumnFiller, fill_available
+from output_compression import CSV_COMPRESSIONS, COMPRESSION_LEVELS, CompressedOutput, open_text_output
+from instrumentation import PerformanceReport
+from progress import ProgressCallback, ProgressReporter, PROGRESS_ROWS
+
+
+# 输出文件的写缓冲大小，所有分组文件同时打开，较大的缓冲减少系统调用次数
+WRITE_BUFFER_SIZE = 1024 * 1024
 
 
 class CSVWriter:
@@ -24,14 +35,31 @@ class CSVWriter:
         encoding: 文件编码
         group_size: 分组大小
         fill_interval: 填充时间间隔（秒）
+        sample_interval: 采样间隔（秒），采样桶号 × 采样间隔 = 采样时间
+        fill_strategy: 填充方式（见gap_fill.FILL_STRATEGIES）
+        fill_max_age: 最大填充时长（秒，ffill和linear方式使用），0表示不限制
+        compression: 分组文件和总览文件的压缩方式（见output_compression.CSV_COMPRESSIONS）
+        compression_level: 压缩级别，None表示默认级别
+        compression_threads: zstd工作线程数（0为单线程，-1为全部CPU核心）
+        extension: 分组文件和总览文件的扩展名（含压缩后缀）
+        report: 性能报告，设置后记录填充、写入各阶段并写入汇总文件，None表示不记录
+        progress: 写入进度回调（见progress.ProgressCallback），None表示不报告
     """
     
+    extension = ".csv"
+    
     def __init__(
         self, 
         output_dir: str, 
         encoding: str = "utf-8-sig", 
         group_size: int = 5,
-        fill_interval: float = 0.5
+        fill_interval: float = 0.5,
+        sample_interval: float = 0.1,
+        fill_strategy: str = "bucket",
+        fill_max_age: float = 0.0,
+        compression: str = "none",
+        compression_level: Optional[int] = None,
+        compression_threads: int = 0
     ):
         """
         初始化CSV写入器
@@ -41,87 +69,114 @@ class CSVWriter:
             encoding: 文件编码
             group_size: 分组大小
             fill_interval: 填充时间间隔（秒），默认0.5秒
+            sample_interval: 采样间隔（秒），默认0.1秒
+            fill_strategy: 填充方式，默认bucket（同一填充区间内填充）
+            fill_max_age: 最大填充时长（秒），0表示不限制
+            compression: 压缩方式，默认不压缩
+            compression_level: 压缩级别，None表示默认级别
+            compression_threads: zstd工作线程数
         """
         self.output_dir = output_dir
         self.encoding = encoding
         self.group_size = group_size
         self.fill_interval = fill_interval
+        self.sample_interval = sample_interval
+        self.fill_strategy = fill_strategy
+        self.fill_max_age = fill_max_age
+        self.compression = compression
+        self.compression_level = compression_level
+        self.compression_threads = compression_threads
+        self.extension = ".csv" + CSV_COMPRESSIONS[compression]
+        self._outputs: List[Tuple[str, CompressedOutput]] = []
+        self.report: Optional[PerformanceReport] = None
+        self.progress: Optional[ProgressCallback] = None
+        
+        ratio = fill_interval / sample_interval
+        self._ticks_per_fill = round(ratio) if abs(ratio - round(ratio)) < 1e-9 and round(ratio) > 0 else None
     
-    def _get_time_bucket(self, timestamp: float) -> int:
+    def _get_time_bucket(self, tick: int) -> int:
         """
-        计算时间戳所属的时间区间编号
+        计算采样桶号所属的填充区间编号
         
-        每0.5秒为一个区间：
-        - [0, 0.5) -> 0  (即 0.0, 0.1, 0.2, 0.3, 0.4 秒)
-        - [0.5, 1.0) -> 1 (即 0.5, 0.6, 0.7, 0.8, 0.9 秒)
-        - [1.0, 1.5) -> 2
+        填充间隔为采样间隔的整数倍时直接做整数除法，不受浮点误差影响。
+        以采样间隔0.1秒、填充间隔0.5秒为例：
+        - 桶号 0~4  (0.0~0.4秒) -> 0
+        - 桶号 5~9  (0.5~0.9秒) -> 1
+        - 桶号 10~14 (1.0~1.4秒) -> 2
         ...
         
         Args:
-            timestamp: 时间戳
-            
+            tick: 采样桶号
+        
         Returns:
-            int: 时间区间编号
+            int: 填充区间编号
         """
-        return int(timestamp // self.fill_interval)
+        if self._ticks_per_fill is not None:
+            return tick // self._ticks_per_fill
+        return int(tick * self.sample_interval // self.fill_interval)
     
     def _fill_missing_values(
         self,
-        sorted_timestamps: List[float],
-        aggregated_data: Dict[float, Dict[str, Any]],
+        time_ticks: List[int],
+        aggregated_data: Mapping,
         signals: List[str]
-    ) -> Dict[float, Dict[str, Any]]:
+    ) -> Iterator[Tuple[int, List[Any]]]:
         """
-        填充缺失值
+        填充缺失值（未安装numpy时bucket方式的逐行实现）
         
-        使用同一时间区间内的有效值填充空值：
-        1. 首先收集每个时间区间内所有时间戳的所有有效值
-        2. 然后使用这些有效值填充该区间内所有时间戳的空值
+        按填充区间流式处理，内存中只保留一个区间的行：
+        1. 首先收集该区间内所有时间戳的所有有效值
+        2. 然后使用这些有效值填充该区间内所有时间戳的空值并输出
         
         Args:
-            sorted_timestamps: 排序后的时间戳列表
+            time_ticks: 升序的采样桶号列表
             aggregated_data: 原始聚合数据
             signals: 信号列表
-            
+        
         Returns:
-            Dict[float, Dict[str, Any]]: 填充后的数据
+            Iterator[Tuple[int, List[Any]]]: (采样桶号, 与signals同序的填充后值列表)
         """
-        bucket_values: Dict[int, Dict[str, Any]] = defaultdict(dict)
-        bucket_timestamps: Dict[int, List[float]] = defaultdict(list)
+        window_rows: List[Tuple[int, List[Any]]] = []
+        current_bucket = None
         
-        for timestamp in sorted_timestamps:
-            bucket = self._get_time_bucket(timestamp)
-            bucket_timestamps[bucket].append(timestamp)
-            original_data = aggregated_data.get(timestamp, {})
-            
-            for sig_name in signals:
-                if sig_name in original_data and original_data[sig_name] is not None:
-                    bucket_values[bucket][sig_name] = original_data[sig_name]
-        
-        filled_data = {}
-        for timestamp in sorted_timestamps:
-            bucket = self._get_time_bucket(timestamp)
-            original_data = aggregated_data.get(timestamp, {})
-            filled_row = {}
-            
-            for sig_name in signals:
-                if sig_name in original_data and original_data[sig_name] is not None:
-                    filled_row[sig_name] = original_data[sig_name]
-                elif sig_name in bucket_values[bucket]:
-                    filled_row[sig_name] = bucket_values[bucket][sig_name]
-                else:
-                    filled_row[sig_name] = None
-            
-            filled_data[timestamp] = filled_row
+        for tick in time_ticks:
+            bucket = self._get_time_bucket(tick)
+            if bucket != current_bucket and window_rows:
+                yield from self._fill_window(window_rows)
+                window_rows = []
+            current_bucket = bucket
+            original_data = aggregated_data.get(tick, {})
+            window_rows.append((tick, [original_data.get(sig_name) for sig_name in signals]))
         
-        return filled_data
+        if window_rows:
+            yield from self._fill_window(window_rows)
+    
+    @staticmethod
+    def _fill_window(window_rows: List[Tuple[int, List[Any]]]) -> Iterator[Tuple[int, List[Any]]]:
+        """
+        用同一填充区间内每列最后一个有效值填充该区间的空值
+        
+        Args:
+            window_rows: 区间内的行 [(采样桶号, 值列表), ...]
+        
+        Returns:
+            Iterator[Tuple[int, List[Any]]]: 填充后的行
+        """
+        latest = list(window_rows[0][1])
+        for _, values in window_rows[1:]:
+            for index, value in enumerate(values):
+                if value is not None:
+                    latest[index] = value
+        
+        for tick, values in window_rows:
+            yield tick, [latest[index] if value is None else value for index, value in enumerate(values)]
     
     def write_all(
         self,
         sorted_groups: List[str],
         classified_signals: Dict[str, List[str]],
-        sorted_timestamps: List[float],
-        aggregated_data: Dict[float, Dict[str, Any]],
+        time_ticks: List[int],
+        aggregated_data: Mapping,
         signal_info: Dict[str, Dict[str, str]],
         statistics: Dict[str, int]
     ) -> List[str]:
@@ -131,96 +186,149 @@ class CSVWriter:
         Args:
             sorted_groups: 排序后的分组列表
             classified_signals: 分类后的信号
-            sorted_timestamps: 排序后的时间戳
+            time_ticks: 升序的采样桶号
             aggregated_data: 聚合后的数据
             signal_info: 信号信息
             statistics: 统计信息
-            
+        
         Returns:
             List[str]: 生成的文件列表
         """
-        created_files = []
-        
         all_signals = []
         for signals in classified_signals.values():
             all_signals.extend(signals)
         all_signals = sorted(set(all_signals))
         
-        filled_data = self._fill_missing_values(
-            sorted_timestamps, aggregated_data, all_signals
-        )
+        # 填充在写入过程中逐块进行，不在内存中保存完整的填充结果
+        rows = self._filled_rows(time_ticks, aggregated_data, all_signals)
+        with self._stage("write"):
+            group_files, all_signals_file = self._write_data_files(
+                sorted_groups, classified_signals, all_signals,
+                self._tracked(self._timed("fill", rows), time_ticks), signal_info
+            )
         
         print(f"  已完成空值填充（填充间隔: {self.fill_interval}秒）")
+        for filename in group_files:
+            print(f"  创建文件: {filename}")
         
-        for group_name in sorted_groups:
-            signals = classified_signals[group_name]
-            filename = self._write_group_file(
-                group_name, signals, sorted_timestamps, 
-                filled_data, signal_info
+        with self._stage("summary"):
+            summary_file = self._write_summary_file(
+                sorted_groups, classified_signals, time_ticks, 
+                statistics, signal_info
             )
-            created_files.append(filename)
         
-        summary_file = self._write_summary_file(
-            sorted_groups, classified_signals, sorted_timestamps, 
-            statistics, signal_info
-        )
+        print(f"  创建总览文件: {all_signals_file}")
         
-        all_signals_file = self._write_all_signals_file(
-            classified_signals, sorted_timestamps, 
-            filled_data, signal_info
-        )
+        return group_files + [summary_file, all_signals_file]
+    
+    def _filled_rows(
+        self,
+        time_ticks: List[int],
+        aggregated_data: Mapping,
+        signals: List[str]
+    ) -> Iterator[Tuple[int, List[Any]]]:
+        """
+        按所选填充方式生成填充后的行
+        
+        行按需生成（流式），内存中只保留一个填充块。数据来自SampleStore且已安装numpy时
+        按列填充（见gap_fill.ColumnFiller），否则使用逐行实现（仅支持bucket和none方式）。
         
-        return created_files + [summary_file, all_signals_file]
+        Args:
+            time_ticks: 升序的采样桶号
+            aggregated_data: 聚合后的数据
+            signals: 信号列表（输出列顺序）
+        
+        Returns:
+            Iterator[Tuple[int, List[Any]]]: (采样桶号, 与signals同序的值列表)
+        """
+        if fill_available() and isinstance(aggregated_data, AggregatedView) and aggregated_data.store is not None:
+            filler = ColumnFiller(
+                aggregated_data.store, signals, self.fill_strategy,
+                self.fill_interval, self.fill_max_age
+            )
+            return filler.rows()
+        
+        if self.fill_strategy == "bucket":
+            return self._fill_missing_values(time_ticks, aggregated_data, signals)
+        if self.fill_strategy != "none":
+            raise RuntimeError(f"填充方式{self.fill_strategy}需要安装numpy")
+        
+        return (
+            (tick, [aggregated_data.get(tick, {}).get(sig_name) for sig_name in signals])
+            for tick in time_ticks
+        )
     
-    def _write_group_file(
+    def _write_data_files(
         self,
-        group_name: str,
-        signals: List[str],
-        sorted_timestamps: List[float],
-        filled_data: Dict,
+        sorted_groups: List[str],
+        classified_signals: Dict,
+        all_sorted_signals: List[str],
+        rows: Iterator[Tuple[int, List[Any]]],
         signal_info: Dict
-    ) -> str:
+    ) -> Tuple[List[str], str]:
         """
-        写入单个分组文件
+        一次遍历写入所有分组文件和信号总览文件
+        
+        所有文件同时打开，每个时间点只构建一次总览行（全部信号），
+        各分组行按预先计算的列下标从总览行中取出，
+        写入耗时只与数据量有关，与分组数量无关。
         
         Args:
-            group_name: 分组名称
-            signals: 信号列表
-            sorted_timestamps: 排序后的时间戳
-            filled_data: 填充后的数据
+            sorted_groups: 排序后的分组
+            classified_signals: 分类信号
+            all_sorted_signals: 排序后的全部信号（总览文件列顺序）
+            rows: 填充后的行，值与all_sorted_signals同序
             signal_info: 信号信息
-            
+        
         Returns:
-            str: 文件路径
+            Tuple[List[str], str]: (分组文件路径列表, 总览文件路径)
         """
-        csv_filename = os.path.join(self.output_dir, f"{group_name}.csv")
-        sorted_signals = sorted(signals)
+        # 总览行第0列为时间，信号列从1开始
+        column_of = {
+            sig_name: index
+            for index, sig_name in enumerate(all_sorted_signals, start=1)
+        }
         
-        header = self._generate_header(sorted_signals, signal_info)
-        
-        with open(csv_filename, 'w', newline='', encoding=self.encoding) as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerow(header)
+        group_files = []
+        group_outputs = []
+        with contextlib.ExitStack() as stack:
+            for group_name in sorted_groups:
+                csv_filename = os.path.join(self.output_dir, f"{group_name}{self.extension}")
+                sorted_signals = sorted(classified_signals[group_name])
+                csvfile = stack.enter_context(self._open_output(csv_filename))
+                writer = csv.writer(csvfile)
+                writer.writerow(self._generate_header(sorted_signals, signal_info))
+                
+                columns = itemgetter(0, *(column_of[sig_name] for sig_name in sorted_signals))
+                group_files.append(csv_filename)
+                group_outputs.append((writer.writerow, columns))
+            
+            all_signals_filename = os.path.join(self.output_dir, f"All_Signals{self.extension}")
+            all_signals_csv = stack.enter_context(self._open_output(all_signals_filename))
+            all_signals_writer = csv.writer(all_signals_csv)
+            all_signals_writer.writerow(self._generate_header(all_sorted_signals, signal_info))
             
             group_count = 0
-            for timestamp in sorted_timestamps:
-                data = filled_data.get(timestamp, {})
-                row = self._build_row(timestamp, sorted_signals, data)
-                writer.writerow(row)
-                group_count += 1
+            for tick, values in rows:
+                row = self._build_row(tick, values)
+                all_signals_writer.writerow(row)
                 
+                for writerow, columns in group_outputs:
+                    writerow(columns(row))
+                
+                group_count += 1
                 if group_count >= self.group_size:
-                    writer.writerow([])
+                    for writerow, _ in group_outputs:
+                        writerow(())
                     group_count = 0
         
-        print(f"  创建文件: {csv_filename}")
-        return csv_filename
+        return group_files, all_signals_filename
     
     def _write_summary_file(
         self,
         sorted_groups: List[str],
         classified_signals: Dict,
-        sorted_timestamps: List[float],
+        time_ticks: List[int],
         statistics: Dict,
         signal_info: Dict
     ) -> str:
@@ -230,10 +338,10 @@ class CSVWriter:
         Args:
             sorted_groups: 排序后的分组
             classified_signals: 分类信号
-            sorted_timestamps: 时间戳
+            time_ticks: 升序的采样桶号
             statistics: 统计信息
             signal_info: 信号信息
-            
+        
         Returns:
             str: 文件路径
         """
@@ -247,9 +355,15 @@ class CSVWriter:
             writer.writerow(["分组规则", "按BatP+数字模式分组"])
             writer.writerow(["示例", "BatP3_BMS_xxx -> BatP3组"])
             writer.writerow(["空值填充间隔", f"{self.fill_interval}秒"])
+            if self.fill_strategy != "bucket":
+                writer.writerow(["空值填充方式", self.fill_strategy])
+                if self.fill_max_age > 0:
+                    writer.writerow(["最大填充时长", f"{self.fill_max_age}秒"])
+            for format_row in self._summary_format_rows():
+                writer.writerow(format_row)
             writer.writerow([])
             writer.writerow(["数据统计"])
-            writer.writerow(["采样后时间点数", len(sorted_timestamps)])
+            writer.writerow(["采样后时间点数", len(time_ticks)])
             writer.writerow(["信号总数", sum(len(s) for s in classified_signals.values())])
             writer.writerow(["分组数量", len(sorted_groups)])
             writer.writerow([])
@@ -260,51 +374,134 @@ class CSVWriter:
                 writer.writerow([
                     group_name,
                     len(classified_signals[group_name]),
-                    f"{group_name}.csv"
+                    self._group_file_name(group_name)
                 ])
+            
+            if self.report is not None and self.report.stages:
+                writer.writerow([])
+                writer.writerow(["性能统计"])
+                for performance_row in self.report.summary_rows():
+                    writer.writerow(performance_row)
         
         print(f"  创建汇总文件: {summary_filename}")
         return summary_filename
     
-    def _write_all_signals_file(
-        self,
-        classified_signals: Dict,
-        sorted_timestamps: List[float],
-        filled_data: Dict,
-        signal_info: Dict
-    ) -> str:
+    def _stage(self, name: str):
         """
-        写入所有信号总览文件
+        性能统计阶段（未设置report时不记录）
         
         Args:
-            classified_signals: 分类信号
-            sorted_timestamps: 时间戳
-            filled_data: 填充后的数据
-            signal_info: 信号信息
-            
+            name: 阶段名称（见instrumentation.STAGE_NAMES）
+        
         Returns:
-            str: 文件路径
+            上下文管理器
+        """
+        if self.report is None:
+            return contextlib.nullcontext()
+        return self.report.stage(name)
+    
+    def _timed(self, name: str, rows: Iterator) -> Iterator:
         """
-        all_signals_filename = os.path.join(self.output_dir, "All_Signals.csv")
+        对写入过程中按需生成的行计时（未设置report时原样返回）
         
-        all_signals = []
-        for signals in classified_signals.values():
-            all_signals.extend(signals)
-        all_sorted_signals = sorted(all_signals)
+        Args:
+            name: 阶段名称
+            rows: 行迭代器
         
-        header = self._generate_header(all_sorted_signals, signal_info)
+        Returns:
+            Iterator: 与rows相同的行
+        """
+        if self.report is None:
+            return rows
+        return self.report.timed(name, rows)
+    
+    def _tracked(self, items: Iterator, time_ticks: List[int]) -> Iterator:
+        """
+        报告写入进度（未设置progress时原样返回）
         
-        with open(all_signals_filename, 'w', newline='', encoding=self.encoding) as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerow(header)
-            
-            for timestamp in sorted_timestamps:
-                data = filled_data.get(timestamp, {})
-                row = self._build_row(timestamp, all_sorted_signals, data)
-                writer.writerow(row)
+        Args:
+            items: 按采样桶号升序、第一个元素为采样桶号的行或观测
+            time_ticks: 升序的采样桶号
         
-        print(f"  创建总览文件: {all_signals_filename}")
-        return all_signals_filename
+        Returns:
+            Iterator: 与items相同的各项
+        """
+        if self.progress is None or not time_ticks:
+            return items
+        return self._progress_items(items, time_ticks[0], time_ticks[-1])
+    
+    def _progress_items(self, items: Iterator, first_tick: int, last_tick: int) -> Iterator:
+        """
+        逐项转发并按已写入的时间跨度报告进度
+        
+        Args:
+            items: 第一个元素为采样桶号的行或观测
+            first_tick: 第一个采样桶号
+            last_tick: 最后一个采样桶号
+        
+        Returns:
+            Iterator: 与items相同的各项
+        """
+        reporter = ProgressReporter(self.progress, "write", last_tick - first_tick + 1)
+        for count, item in enumerate(items, 1):
+            if not count % PROGRESS_ROWS:
+                reporter.update(item[0] - first_tick + 1)
+            yield item
+        reporter.finish()
+    
+    def _open_output(self, file_path: str):
+        """
+        打开分组文件或总览文件（按compression压缩），并记录压缩统计
+        
+        Args:
+            file_path: 文件路径
+        
+        Returns:
+            文本流（newline=''）
+        """
+        csvfile, output = open_text_output(
+            file_path, self.compression, self.compression_level,
+            self.compression_threads, self.encoding, WRITE_BUFFER_SIZE
+        )
+        if output is not None:
+            self._outputs.append((file_path, output))
+        return csvfile
+    
+    def _summary_format_rows(self) -> List[List[str]]:
+        """
+        汇总文件中的输出格式信息（CSV为默认格式，不压缩时不输出）
+        
+        Returns:
+            List[List[str]]: 汇总文件行
+        """
+        if self.compression == "none" or not self._outputs:
+            return []
+        
+        level = self.compression_level
+        if level is None:
+            level = COMPRESSION_LEVELS[self.compression][2]
+        raw_bytes = sum(output.raw_bytes for _, output in self._outputs)
+        compressed_bytes = sum(os.path.getsize(file_path) for file_path, _ in self._outputs)
+        seconds = sum(output.seconds for _, output in self._outputs)
+        megabyte = 1024 * 1024
+        return [
+            ["输出压缩", f"{self.compression}（级别 {level}）"],
+            ["未压缩大小", f"{raw_bytes / megabyte:.2f} MB"],
+            ["压缩后大小", f"{compressed_bytes / megabyte:.2f} MB（{compressed_bytes / max(raw_bytes, 1):.1%}）"],
+            ["压缩吞吐量", f"{raw_bytes / megabyte / max(seconds, 1e-9):.1f} MB/s（未压缩数据）"],
+        ]
+    
+    def _group_file_name(self, group_name: str) -> str:
+        """
+        分组数据所在的文件名（汇总文件中列出）
+        
+        Args:
+            group_name: 分组名称
+        
+        Returns:
+            str: 文件名
+        """
+        return f"{group_name}{self.extension}"
     
     def _generate_header(self, signals: List[str], signal_info: Dict) -> List[str]:
         """
@@ -313,7 +510,7 @@ class CSVWriter:
         Args:
             signals: 信号列表
             signal_info: 信号信息
-            
+        
         Returns:
             List[str]: 表头列表
         """
@@ -327,27 +524,17 @@ class CSVWriter:
                 header.append(short_name)
         return header
     
-    def _build_row(
-        self,
-        timestamp: float,
-        signals: List[str],
-        data: Dict
-    ) -> List[Any]:
+    def _build_row(self, tick: int, values: List[Any]) -> List[Any]:
         """
         构建数据行
         
         Args:
-            timestamp: 时间戳
-            signals: 信号列表
-            data: 数据字典（已填充）
-            
+            tick: 采样桶号
+            values: 信号值列表（已填充，空值为None）
+        
         Returns:
             List[Any]: 数据行
         """
-        row = [round(timestamp, 1)]
-        for sig_name in signals:
-            if sig_name in data and data[sig_name] is not None:
-                row.append(safe_value(data[sig_name]))
-            else:
-                row.append("")
+        row = [round(tick * self.sample_interval, 1)]
+        row.extend([safe_value(value) for value in values])
         return row
@@ -9,6 +9,7 @@ from typing import Dict, List, Set
 from collections import defaultdict
 
 from utils import extract_batp_group, sort_group_key
+from sample_store import SampleStore, AggregatedView
 
 
 class DataProcessor:
@@ -25,23 +26,21 @@ class DataProcessor:
     
     def __init__(self):
         """初始化数据处理器"""
-        self.aggregated_data: Dict[float, Dict[str, any]] = {}
+        self.aggregated_data: AggregatedView = AggregatedView(None)
         self.classified_signals: Dict[str, List[str]] = defaultdict(list)
         self.sorted_groups: List[str] = []
     
-    def aggregate(self, sampled_data: Dict) -> None:
+    def aggregate(self, sampled_data: SampleStore) -> None:
         """
         聚合采样数据
         
-        取每个时间间隔内的最后一个值
+        值已在解析阶段按配置的聚合方式（默认取最后一个值）在线聚合，
+        aggregated_data直接引用其按桶号索引的视图 {桶号: {信号: 值}}，不复制数据。
         
         Args:
             sampled_data: 采样数据（来自ASCParser）
         """
-        for sampled_time, signals in sampled_data.items():
-            self.aggregated_data[sampled_time] = {}
-            for signal_name, values in signals.items():
-                self.aggregated_data[sampled_time][signal_name] = values[-1]
+        self.aggregated_data = sampled_data.rows()
     
     def classify_signals(self, found_signals: Set[str]) -> None:
         """
@@ -56,14 +55,26 @@ class DataProcessor:
         
         self.sorted_groups = sorted(self.classified_signals.keys(), key=sort_group_key)
     
+    def get_time_ticks(self) -> List[int]:
+        """
+        获取有数据的采样桶号列表
+        
+        桶号 = round(时间戳 / 采样间隔)，视图本身按桶号升序迭代，无需排序。
+        
+        Returns:
+            List[int]: 升序的桶号
+        """
+        return list(self.aggregated_data)
+    
     def get_sorted_timestamps(self) -> List[float]:
         """
-        获取排序后的时间戳列表
+        获取排序后的采样时间列表（秒）
         
         Returns:
-            List[float]: 排序后的时间戳
+            List[float]: 升序的采样时间
         """
-        return sorted(self.aggregated_data.keys())
+        sample_interval = self.aggregated_data.sample_interval
+        return [tick * sample_interval for tick in self.aggregated_data]
     
     def get_group_statistics(self) -> Dict[str, int]:
         """
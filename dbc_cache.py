@@ -0,0 +1,214 @@
+# asc_to_csv/dbc_cache.py
+"""
+DBC缓存模块
+将cantools解析后的DBC消息定义序列化到本地缓存目录，重复转换时跳过DBC解析
+
+用法（清空缓存）:
+    python dbc_cache.py --purge [--cache-dir DIR]
+"""
+
+import os
+import sys
+import pickle
+import hashlib
+import argparse
+from typing import List, Optional
+
+import cantools
+
+
+# 缓存格式版本，条目结构变化时递增使旧缓存失效
+CACHE_FORMAT = 1
+CACHE_SUFFIX = ".pickle"
+
+
+def default_cache_dir() -> str:
+    """
+    获取默认缓存目录
+    
+    Windows下为%LOCALAPPDATA%\\asc_to_csv\\dbc_cache，其他系统为~/.cache/asc_to_csv/dbc_cache
+    
+    Returns:
+        str: 缓存目录路径
+    """
+    base = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME")
+    if not base:
+        base = os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "asc_to_csv", "dbc_cache")
+
+
+def file_sha256(file_path: str) -> str:
+    """
+    计算文件内容的SHA-256
+    
+    Args:
+        file_path: 文件路径
+    
+    Returns:
+        str: 十六进制摘要
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class DBCCache:
+    """
+    DBC解析结果缓存
+    
+    每个DBC文件对应一个缓存条目（文件名为绝对路径的哈希），条目中保存
+    文件的修改时间、大小、内容SHA-256、cantools版本和解析出的消息列表。
+    读取时修改时间和大小一致即直接使用；不一致时比较内容哈希，
+    内容未变（如仅被复制或touch）则更新条目后使用，否则重新解析并覆盖条目。
+    
+    Attributes:
+        cache_dir: 缓存目录
+    """
+    
+    def __init__(self, cache_dir: Optional[str] = None):
+        """
+        初始化DBC缓存
+        
+        Args:
+            cache_dir: 缓存目录，None或空字符串表示默认目录（见default_cache_dir）
+        """
+        self.cache_dir = cache_dir or default_cache_dir()
+    
+    def _entry_path(self, dbc_file: str) -> str:
+        """获取DBC文件对应的缓存条目路径"""
+        key = hashlib.sha256(os.path.abspath(dbc_file).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, key + CACHE_SUFFIX)
+    
+    def _read_entry(self, entry_path: str) -> Optional[dict]:
+        """
+        读取缓存条目
+        
+        Args:
+            entry_path: 条目路径
+        
+        Returns:
+            Optional[dict]: 条目，不存在、损坏或版本不符时返回None
+        """
+        try:
+            with open(entry_path, 'rb') as f:
+                entry = pickle.load(f)
+        except Exception:
+            # 不存在或损坏（如写入中断、Python版本不兼容）均视为未命中
+            return None
+        
+        if not isinstance(entry, dict):
+            return None
+        if entry.get('format') != CACHE_FORMAT or entry.get('cantools') != cantools.__version__:
+            return None
+        return entry
+    
+    def _write_entry(self, entry_path: str, entry: dict) -> None:
+        """
+        写入缓存条目（先写临时文件再替换，避免并发读到半个文件）
+        
+        写入失败（磁盘或权限错误、对象无法序列化、对象图过深等）只会使下次未命中，
+        不影响已经完成的DBC加载，因此任何异常都只打印警告并删除临时文件。
+        
+        Args:
+            entry_path: 条目路径
+            entry: 条目
+        """
+        temp_path = f"{entry_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(temp_path, 'wb') as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, entry_path)
+        except Exception as e:
+            print(f"  警告：写入DBC缓存失败 - {type(e).__name__}: {e}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+    
+    def load_messages(self, dbc_file: str) -> Optional[List]:
+        """
+        从缓存读取DBC文件的消息列表
+        
+        Args:
+            dbc_file: DBC文件路径
+        
+        Returns:
+            Optional[List]: cantools消息对象列表，未命中时返回None
+        """
+        entry_path = self._entry_path(dbc_file)
+        entry = self._read_entry(entry_path)
+        if entry is None:
+            return None
+        
+        stat = os.stat(dbc_file)
+        if entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            return entry['messages']
+        
+        if entry['size'] != stat.st_size or entry['sha256'] != file_sha256(dbc_file):
+            return None
+        
+        entry['mtime_ns'] = stat.st_mtime_ns
+        self._write_entry(entry_path, entry)
+        return entry['messages']
+    
+    def store_messages(self, dbc_file: str, messages: List) -> None:
+        """
+        将DBC文件的消息列表写入缓存
+        
+        Args:
+            dbc_file: DBC文件路径
+            messages: cantools消息对象列表
+        """
+        stat = os.stat(dbc_file)
+        entry = {
+            'format': CACHE_FORMAT,
+            'cantools': cantools.__version__,
+            'path': os.path.abspath(dbc_file),
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'sha256': file_sha256(dbc_file),
+            'messages': messages,
+        }
+        self._write_entry(self._entry_path(dbc_file), entry)
+    
+    def purge(self) -> int:
+        """
+        清空缓存目录中的所有缓存条目
+        
+        Returns:
+            int: 删除的条目数
+        """
+        if not os.path.isdir(self.cache_dir):
+            return 0
+        
+        removed = 0
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(CACHE_SUFFIX) or name.endswith(".tmp"):
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                    removed += 1
+                except OSError as e:
+                    print(f"警告：无法删除缓存文件 {name} - {e}")
+        return removed
+
+
+def main() -> int:
+    """命令行入口"""
+    arg_parser = argparse.ArgumentParser(description="DBC缓存管理")
+    arg_parser.add_argument("--purge", action="store_true", help="清空DBC缓存")
+    arg_parser.add_argument("--cache-dir", default="", help="缓存目录（默认为用户缓存目录）")
+    args = arg_parser.parse_args()
+    
+    cache = DBCCache(args.cache_dir)
+    if args.purge:
+        print(f"已清空DBC缓存: {cache.cache_dir}（删除 {cache.purge()} 个文件）")
+    else:
+        print(f"DBC缓存目录: {cache.cache_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,25 +5,100 @@ DBC文件加载模块
 """
 
 import os
-from typing import Dict, Any
+import re
+import fnmatch
+from typing import Dict, Any, FrozenSet, List, Optional, Tuple
 import cantools
 
+from dbc_cache import DBCCache
+
+
+class SignalSelector:
+    """
+    信号选择器
+    
+    按完整信号名称（dbc::message::signal）选择信号。模式默认为通配符
+    （大小写敏感，匹配整个名称），以"re:"开头时为正则表达式（在名称中搜索）。
+    include为空表示全部选中，exclude在include之后生效。
+    
+    >>> selector = SignalSelector(["*::BatP3_*"], ["re:Temp$"])
+    >>> selector.selects("pcan.dbc::BatP3_BMS::P3_MaxCellVlt")
+    True
+    >>> selector.selects("pcan.dbc::BatP3_BMS::P3_Temp")
+    False
+    >>> selector.selects("pcan.dbc::BatP4_BMS::P4_Current")
+    False
+    """
+    
+    REGEX_PREFIX = "re:"
+    
+    def __init__(self, include: Optional[List[str]] = None, exclude: Optional[List[str]] = None):
+        """
+        初始化信号选择器
+        
+        Args:
+            include: 白名单模式列表
+            exclude: 黑名单模式列表
+        
+        Raises:
+            re.error: 正则表达式无效
+        """
+        self.include = [self._compile(pattern) for pattern in include or []]
+        self.exclude = [self._compile(pattern) for pattern in exclude or []]
+    
+    @classmethod
+    def _compile(cls, pattern: str):
+        """将模式编译为正则表达式的search方法"""
+        if pattern.startswith(cls.REGEX_PREFIX):
+            return re.compile(pattern[len(cls.REGEX_PREFIX):]).search
+        return re.compile(fnmatch.translate(pattern)).match
+    
+    def is_active(self) -> bool:
+        """是否设置了任何模式"""
+        return bool(self.include or self.exclude)
+    
+    def selects(self, full_name: str) -> bool:
+        """
+        判断信号是否被选中
+        
+        Args:
+            full_name: 完整信号名称
+        
+        Returns:
+            bool: 是否选中
+        """
+        if self.include and not any(match(full_name) for match in self.include):
+            return False
+        return not any(match(full_name) for match in self.exclude)
+
 
 class DBCLoader:
     """
     DBC文件加载器
     
-    负责加载DBC文件并创建消息映射和信号信息
+    负责加载DBC文件并创建消息映射和信号信息。
+    设置信号选择器时只登记选中的信号，没有选中信号的消息不进入message_map，
+    message_map中每个消息的'signals'为需要解码的信号名称集合（None表示全部）。
     
     Attributes:
         message_map: 消息ID到消息对象的映射
         signal_info: 信号名称到信号信息的映射
+        selector: 信号选择器
+        cache: DBC解析结果缓存
     """
     
-    def __init__(self):
-        """初始化DBC加载器"""
+    def __init__(self, selector: Optional[SignalSelector] = None, cache: Optional[DBCCache] = None):
+        """
+        初始化DBC加载器
+        
+        Args:
+            selector: 信号选择器，None表示全部信号
+            cache: DBC解析结果缓存，None表示每次都解析DBC文件
+        """
         self.message_map: Dict[int, Dict[str, Any]] = {}
         self.signal_info: Dict[str, Dict[str, str]] = {}
+        self.selector = selector if selector is not None and selector.is_active() else None
+        self.cache = cache
     
     def load(self, dbc_files: list) -> bool:
         """
@@ -31,7 +106,7 @@ class DBCLoader:
         
         Args:
             dbc_files: DBC文件路径列表
-            
+        
         Returns:
             bool: 是否成功加载所有文件
         """
@@ -51,23 +126,32 @@ class DBCLoader:
         
         Args:
             dbc_file: DBC文件路径
-            
+        
         Returns:
             bool: 是否成功加载
         """
         try:
             dbc_name = os.path.basename(dbc_file)
-            db = cantools.database.load_file(dbc_file, strict=False)
+            messages, cached = self._load_messages(dbc_file)
+            selected_count = 0
             
-            for msg in db.messages:
+            for msg in messages:
+                signals = self._select_signals(dbc_name, msg)
+                if signals is not None and not signals:
+                    continue
+                selected_count += 1
+                
                 # 存储消息对象
                 self.message_map[msg.frame_id] = {
                     'message': msg,
-                    'dbc_name': dbc_name
+                    'dbc_name': dbc_name,
+                    'signals': signals
                 }
                 
                 # 存储信号信息
                 for signal in msg.signals:
+                    if signals is not None and signal.name not in signals:
+                        continue
                     full_name = f"{dbc_name}::{msg.name}::{signal.name}"
                     self.signal_info[full_name] = {
                         'unit': signal.unit if signal.unit else '',
@@ -75,13 +159,55 @@ class DBCLoader:
                         'dbc': dbc_name
                     }
             
-            print(f"  已加载DBC: {dbc_file} - 消息数: {len(db.messages)}")
+            source = "（缓存）" if cached else ""
+            if self.selector is not None:
+                print(f"  已加载DBC{source}: {dbc_file} - 消息数: {len(messages)}（选中 {selected_count}）")
+            else:
+                print(f"  已加载DBC{source}: {dbc_file} - 消息数: {len(messages)}")
             return True
-            
+        
         except Exception as e:
             print(f"  加载DBC文件失败: {dbc_file} - 错误: {e}")
             return False
     
+    def _load_messages(self, dbc_file: str) -> Tuple[List, bool]:
+        """
+        读取DBC文件的消息定义，优先使用缓存
+        
+        Args:
+            dbc_file: DBC文件路径
+        
+        Returns:
+            Tuple[List, bool]: (cantools消息对象列表, 是否来自缓存)
+        """
+        if self.cache is not None:
+            messages = self.cache.load_messages(dbc_file)
+            if messages is not None:
+                return messages, True
+        
+        messages = cantools.database.load_file(dbc_file, strict=False).messages
+        if self.cache is not None:
+            self.cache.store_messages(dbc_file, messages)
+        return messages, False
+    
+    def _select_signals(self, dbc_name: str, msg) -> Optional[FrozenSet[str]]:
+        """
+        确定消息中被选中的信号
+        
+        Args:
+            dbc_name: DBC文件名
+            msg: cantools消息对象
+        
+        Returns:
+            Optional[FrozenSet[str]]: 选中的信号名称集合，未设置选择器时返回None
+        """
+        if self.selector is None:
+            return None
+        return frozenset(
+            signal.name for signal in msg.signals
+            if self.selector.selects(f"{dbc_name}::{msg.name}::{signal.name}")
+        )
+    
     def get_message_count(self) -> int:
         """获取消息总数"""
         return len(self.message_map)
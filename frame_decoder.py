@@ -0,0 +1,229 @@
+# asc_to_csv/frame_decoder.py
+"""
+帧解码模块
+在DBCLoader.message_map之上提供带缓存的解码层，可选为每个消息生成专用解码器
+"""
+
+import struct
+from functools import lru_cache
+from typing import Any, Callable, Collection, Dict, List, Optional, Tuple
+
+
+DEFAULT_CACHE_SIZE = 4096
+
+# 浮点信号的原始位长到struct格式
+_FLOAT_FORMATS = {32: 'f', 64: 'd'}
+
+
+def signal_conversion(signal) -> Callable[[Any], Any]:
+    """
+    生成信号的原始值到物理值的转换函数
+    
+    与所用cantools版本的Message.decode结果保持一致（包括int/float类型和枚举值）。
+    
+    Args:
+        signal: cantools信号对象
+    
+    Returns:
+        Callable[[Any], Any]: 转换函数
+    """
+    conversion = getattr(signal, 'conversion', None)
+    if conversion is not None:
+        if conversion.choices:
+            return conversion.raw_to_scaled
+        if conversion.scale == 1 and conversion.offset == 0:
+            return lambda raw: raw
+        scale, offset = conversion.scale, conversion.offset
+        return lambda raw: raw * scale + offset
+    
+    # cantools 38之前的版本：先查枚举，再线性变换
+    choices = signal.choices or {}
+    scale, offset = signal.scale, signal.offset
+    
+    def convert(raw):
+        choice = choices.get(raw)
+        if choice is not None:
+            return choice
+        return scale * raw + offset
+    
+    return convert
+
+
+def compile_message(message, signal_names: Optional[Collection[str]] = None) -> Optional[Callable[[bytes], Dict[str, Any]]]:
+    """
+    为消息生成专用解码器
+    
+    预先计算每个信号在整帧整数中的位偏移、掩码、符号位和物理值转换，
+    解码时只做一次int.from_bytes和若干移位运算。
+    多路复用、容器消息和非32/64位浮点信号不支持，返回None。
+    
+    Args:
+        message: cantools消息对象
+        signal_names: 只解码这些信号，None表示全部
+    
+    Returns:
+        Optional[Callable[[bytes], Dict[str, Any]]]: 解码函数，不支持时返回None
+    """
+    if message.is_multiplexed() or getattr(message, 'is_container', False):
+        return None
+    
+    length = message.length
+    fields: List[Tuple] = []
+    has_little = has_big = False
+    
+    for signal in message.signals:
+        if signal_names is not None and signal.name not in signal_names:
+            continue
+        
+        float_format = None
+        if signal.is_float:
+            float_format = _FLOAT_FORMATS.get(signal.length)
+            if float_format is None:
+                return None
+        
+        big_endian = signal.byte_order != 'little_endian'
+        if big_endian:
+            msb = (length - 1 - signal.start // 8) * 8 + signal.start % 8
+            shift = msb - signal.length + 1
+            has_big = True
+        else:
+            shift = signal.start
+            has_little = True
+        
+        if shift < 0 or shift + signal.length > length * 8:
+            return None
+        
+        fields.append((
+            signal.name,
+            big_endian,
+            shift,
+            (1 << signal.length) - 1,
+            1 << (signal.length - 1) if signal.is_signed and not signal.is_float else 0,
+            '<' + float_format if float_format else None,
+            signal.length // 8,
+            signal_conversion(signal),
+        ))
+    
+    from_bytes = int.from_bytes
+    unpack = struct.unpack
+    
+    def decode(data: bytes) -> Dict[str, Any]:
+        if len(data) < length:
+            raise ValueError(f"Wrong data size: {len(data)} instead of {length} bytes")
+        payload = data[:length]
+        little = from_bytes(payload, 'little') if has_little else 0
+        big = from_bytes(payload, 'big') if has_big else 0
+        
+        decoded: Dict[str, Any] = {}
+        for name, big_endian, shift, mask, sign_bit, float_format, byte_count, convert in fields:
+            value = ((big if big_endian else little) >> shift) & mask
+            if sign_bit and value & sign_bit:
+                value -= mask + 1
+            elif float_format is not None:
+                value = unpack(float_format, value.to_bytes(byte_count, 'little'))[0]
+            decoded[name] = convert(value)
+        return decoded
+    
+    return decode
+
+
+class FrameDecoder:
+    """
+    帧解码器
+    
+    包装message_map中的cantools消息解码：
+    1. 按 (帧ID, 数据域) 在有界LRU缓存中记忆解码结果，BMS状态帧常连续重复相同数据，
+       命中时无需再次解码；
+    2. 可选地为每个消息生成专用解码器（见compile_message），不支持的消息回退到cantools。
+    message_map中的消息带有'signals'（见DBCLoader的信号选择）时只返回这些信号，
+    专用解码器只提取这些信号。
+    
+    返回的字典在缓存命中时为同一对象，调用方不得修改。
+    
+    Attributes:
+        message_map: 消息映射（来自DBCLoader）
+        cache_size: 缓存条目上限，0表示不缓存
+        compiled: 是否使用专用解码器
+    """
+    
+    def __init__(
+        self,
+        message_map: Dict,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        compiled: bool = False
+    ):
+        """
+        初始化帧解码器
+        
+        Args:
+            message_map: 消息映射（来自DBCLoader）
+            cache_size: 缓存条目上限，0表示不缓存
+            compiled: 是否为每个消息生成专用解码器
+        """
+        self.message_map = message_map
+        self.cache_size = cache_size
+        self.compiled = compiled
+        self._decoders: Dict[int, Callable[[bytes], Dict[str, Any]]] = {}
+        
+        if cache_size > 0:
+            self.decode = lru_cache(maxsize=cache_size)(self._decode_uncached)
+        else:
+            self.decode = self._decode_uncached
+    
+    def _decode_uncached(self, frame_id: int, data: bytes) -> Dict[str, Any]:
+        """
+        解码一帧（不经过缓存）
+        
+        Args:
+            frame_id: 帧ID
+            data: 数据域
+        
+        Returns:
+            Dict[str, Any]: 信号名称到物理值的映射
+        """
+        decoder = self._decoders.get(frame_id)
+        if decoder is None:
+            decoder = self._decoders[frame_id] = self._build_decoder(frame_id)
+        return decoder(data)
+    
+    def _build_decoder(self, frame_id: int) -> Callable[[bytes], Dict[str, Any]]:
+        """
+        创建消息的解码函数
+        
+        Args:
+            frame_id: 帧ID
+        
+        Returns:
+            Callable[[bytes], Dict[str, Any]]: 解码函数
+        """
+        msg_info = self.message_map[frame_id]
+        message = msg_info['message']
+        signal_names = msg_info.get('signals')
+        
+        if self.compiled:
+            decoder = compile_message(message, signal_names)
+            if decoder is not None:
+                return decoder
+        
+        if signal_names is None:
+            return message.decode
+        
+        def decode_selected(data: bytes) -> Dict[str, Any]:
+            return {
+                name: value
+                for name, value in message.decode(data).items()
+                if name in signal_names
+            }
+        
+        return decode_selected
+    
+    def cache_info(self) -> Optional[Tuple]:
+        """
+        获取缓存统计
+        
+        Returns:
+            Optional[Tuple]: functools的CacheInfo (hits, misses, maxsize, currsize)，未启用缓存时为None
+        """
+        if self.cache_size > 0:
+            return self.decode.cache_info()
+        return None
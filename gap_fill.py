@@ -0,0 +1,435 @@
+# asc_to_csv/gap_fill.py
+"""
+空值填充模块
+按填充区间分块流式填充：每块内按列（信号）用NumPy计算每个采样时间点的填充来源，
+再按行输出填充后的数据，内存占用与记录时长无关（需要安装numpy）
+"""
+
+import math
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from sample_store import SampleStore, SignalColumn, _NUMBER, _OBJECT
+
+
+# 填充方式：
+#   bucket  同一填充区间内用该区间最后一个有效值填充（默认，与旧版一致）
+#   ffill   用之前最近的有效值填充，可限制最大时长
+#   linear  在前后两个有效数值之间按时间线性插值，可限制最大间隔
+#   none    不填充
+FILL_STRATEGIES = ('bucket', 'ffill', 'linear', 'none')
+
+# 每块包含的采样区间位置数（向后对齐到填充区间边界）
+ROW_CHUNK = 4096
+
+
+def fill_available() -> bool:
+    """判断是否可以使用按列填充（numpy已安装）"""
+    return np is not None
+
+
+class _SignalState:
+    """
+    单个信号跨块的填充状态
+    
+    Attributes:
+        column: 列存储，信号不存在时为None
+        value: 之前各块中最后一个有效值
+        tick: value所在的采样桶号，无有效值时为None
+        numeric: value是否为数值
+        next_found: 各present标记在列中下一次出现的位置缓存（-1表示之后不再出现）
+    """
+    
+    __slots__ = ('column', 'value', 'tick', 'numeric', 'next_found')
+    
+    def __init__(self, column: Optional[SignalColumn]):
+        self.column = column
+        self.value = None
+        self.tick: Optional[int] = None
+        self.numeric = False
+        self.next_found = {_NUMBER: None, _OBJECT: None}
+
+
+class ColumnFiller:
+    """
+    按列空值填充器
+    
+    采样区间按位置分块（块尾对齐到填充区间边界），逐块填充后按行输出，
+    同一时刻只有一块的数据在内存中。ffill和linear需要的块外数据
+    （之前最后一个有效值、之后第一个有效值）保存在每个信号的_SignalState中。
+    
+    块内每个信号的填充结果表示为"来源下标"数组：行r的值为table[source[r]]，
+    table[0]为之前各块中最后一个有效值（没有时为None），随后是该信号在块内有数据的行上的
+    原始值（保持int/float/枚举类型不变），线性插值的结果追加在其后，
+    table最后一个元素为None（对应下标-1，即空值）。
+    
+    Attributes:
+        store: 采样数据
+        signals: 信号名称列表（输出列顺序）
+        strategy: 填充方式（见FILL_STRATEGIES）
+        fill_interval: 填充区间长度（秒，bucket方式使用）
+        max_age: 最大填充时长（秒，ffill和linear方式使用），0表示不限制
+    """
+    
+    def __init__(
+        self,
+        store: SampleStore,
+        signals: Sequence[str],
+        strategy: str = "bucket",
+        fill_interval: float = 0.5,
+        max_age: float = 0.0
+    ):
+        """
+        初始化填充器
+        
+        Args:
+            store: 采样数据
+            signals: 信号名称列表
+            strategy: 填充方式
+            fill_interval: 填充区间长度（秒）
+            max_age: 最大填充时长（秒），0表示不限制
+        """
+        if strategy not in FILL_STRATEGIES:
+            raise ValueError(f"未知的填充方式: {strategy}")
+        
+        self.store = store
+        self.signals = list(signals)
+        self.strategy = strategy
+        self.fill_interval = fill_interval
+        self.max_age = max_age
+        
+        # 各段起始位置和段内"桶号 - 位置"，用于把位置换算为桶号
+        self._segment_positions = np.array(store.segment_positions, dtype=np.int64)
+        self._segment_offsets = np.array(
+            [bucket - position for bucket, position in zip(store.segment_buckets, store.segment_positions)],
+            dtype=np.int64
+        )
+        ratio = fill_interval / store.sample_interval
+        ticks_per_fill = round(ratio)
+        self._ticks_per_fill = ticks_per_fill if abs(ratio - ticks_per_fill) < 1e-9 and ticks_per_fill > 0 else None
+    
+    def rows(self) -> Iterator[Tuple[int, List[Any]]]:
+        """
+        按时间顺序输出填充后的行
+        
+        Yields:
+            Tuple[int, List[Any]]: (采样桶号, 与signals同序的值列表，空值为None)
+        """
+        states = []
+        for name in self.signals:
+            signal_id = self.store.signal_ids.get(name)
+            states.append(_SignalState(None if signal_id is None else self.store.columns[signal_id]))
+        
+        for positions in self._chunks():
+            ticks = self._ticks(positions)
+            tick_list = ticks.tolist()
+            if not states:
+                for tick in tick_list:
+                    yield tick, []
+                continue
+            
+            windows = self._windows(ticks) if self.strategy == 'bucket' else None
+            columns = []
+            for state in states:
+                table, source = self._fill_chunk(state, positions, ticks, windows)
+                columns.append([table[index] for index in source.tolist()])
+            
+            for tick, values in zip(tick_list, zip(*columns)):
+                yield tick, list(values)
+    
+    def _chunks(self) -> Iterator["np.ndarray"]:
+        """
+        按块遍历有数据的位置
+        
+        Yields:
+            np.ndarray: 块内有数据的位置（int64，升序，非空）
+        """
+        occupied = self.store.occupied
+        total = len(occupied)
+        start = 0
+        while start < total:
+            end = min(self._window_start(start + ROW_CHUNK), total)
+            segment = np.frombuffer(bytes(occupied[start:end]), dtype=np.uint8)
+            positions = np.flatnonzero(segment).astype(np.int64) + start
+            start = end
+            if len(positions):
+                yield positions
+    
+    def _ticks(self, positions: "np.ndarray") -> "np.ndarray":
+        """
+        位置对应的采样桶号
+        
+        Args:
+            positions: 列内位置（升序）
+        
+        Returns:
+            np.ndarray: int64数组
+        """
+        if len(self._segment_offsets) == 1:
+            return positions + self._segment_offsets[0]
+        index = np.searchsorted(self._segment_positions, positions, side='right') - 1
+        return positions + self._segment_offsets[index]
+    
+    def _window_start(self, position: int) -> int:
+        """
+        不小于position的第一个填充区间起点位置
+        
+        Args:
+            position: 列内位置
+        
+        Returns:
+            int: 列内位置
+        """
+        tick = self.store.bucket_at(position)
+        if self._ticks_per_fill is not None:
+            tick = -(-tick // self._ticks_per_fill) * self._ticks_per_fill
+        else:
+            interval, fill_interval = self.store.sample_interval, self.fill_interval
+            while (tick * interval) // fill_interval == ((tick - 1) * interval) // fill_interval:
+                tick += 1
+        return self.store.first_position_from(tick)
+    
+    def _windows(self, ticks: "np.ndarray") -> "np.ndarray":
+        """
+        计算每行所属的填充区间编号（与CSVWriter._get_time_bucket一致）
+        
+        Args:
+            ticks: 采样桶号
+        
+        Returns:
+            np.ndarray: int64数组
+        """
+        if self._ticks_per_fill is not None:
+            return ticks // self._ticks_per_fill
+        return ((ticks * self.store.sample_interval) // self.fill_interval).astype(np.int64)
+    
+    def _max_age_ticks(self) -> Optional[int]:
+        """最大填充时长换算为桶数，不限制时返回None"""
+        if self.max_age <= 0:
+            return None
+        return math.floor(self.max_age / self.store.sample_interval + 1e-9)
+    
+    def _fill_chunk(
+        self,
+        state: _SignalState,
+        positions: "np.ndarray",
+        ticks: "np.ndarray",
+        windows: Optional["np.ndarray"]
+    ) -> Tuple[List[Any], "np.ndarray"]:
+        """
+        计算一个信号在一块内的填充结果，并更新其跨块状态
+        
+        Args:
+            state: 信号的填充状态
+            positions: 块内有数据的位置
+            ticks: 对应的采样桶号
+            windows: 对应的填充区间编号（仅bucket方式）
+        
+        Returns:
+            Tuple[List[Any], np.ndarray]: (值表, 每行的来源下标)
+        """
+        if state.column is None:
+            return [None], np.full(len(positions), -1, dtype=np.int32)
+        
+        flags = self._chunk_flags(state.column, positions)
+        valid = flags != 0
+        valid_rows = np.flatnonzero(valid)
+        table = [state.value] + self._chunk_values(state.column, positions[valid_rows], flags[valid_rows])
+        
+        # 每行之前（含本行）最近的有效值在table中的下标，0为之前各块的最后一个有效值
+        previous = np.cumsum(valid, dtype=np.int64)
+        
+        if self.strategy == 'none':
+            source = np.where(valid, previous, -1)
+        elif self.strategy == 'bucket':
+            source = self._fill_bucket(valid, valid_rows, previous, windows)
+        elif self.strategy == 'ffill':
+            source = self._fill_forward(state, ticks, valid_rows, previous)
+        else:
+            source = self._fill_linear(state, table, positions, ticks, flags, valid_rows, previous)
+        
+        if len(valid_rows):
+            last = valid_rows[-1]
+            state.value = table[len(valid_rows)]
+            state.tick = int(ticks[last])
+            state.numeric = bool(flags[last] == _NUMBER)
+        
+        table.append(None)
+        return table, source.astype(np.int32)
+    
+    @staticmethod
+    def _chunk_flags(column: SignalColumn, positions: "np.ndarray") -> "np.ndarray":
+        """
+        获取列在块内各位置的present标记
+        
+        Args:
+            column: 列存储
+            positions: 块内有数据的位置
+        
+        Returns:
+            np.ndarray: uint8数组，0为空
+        """
+        first = int(positions[0])
+        segment = np.frombuffer(bytes(column.present[first:int(positions[-1]) + 1]), dtype=np.uint8)
+        offsets = positions - first
+        inside = offsets < len(segment)
+        flags = np.zeros(len(positions), dtype=np.uint8)
+        flags[inside] = segment[offsets[inside]]
+        return flags
+    
+    @staticmethod
+    def _chunk_values(column: SignalColumn, positions: "np.ndarray", flags: "np.ndarray") -> List[Any]:
+        """
+        读取列在有数据位置上的值
+        
+        未重写get的列（last/first/min/max/count）直接从数值数组取值，其余逐个调用get。
+        
+        Args:
+            column: 列存储
+            positions: 有数据的位置
+            flags: 对应的present标记
+        
+        Returns:
+            List[Any]: 值列表
+        """
+        if not len(positions):
+            return []
+        if type(column).get is not SignalColumn.get:
+            get = column.get
+            return [get(position) for position in positions.tolist()]
+        
+        first = int(positions[0])
+        segment = column.values[first:int(positions[-1]) + 1]
+        numbers = np.frombuffer(segment, dtype=np.int64 if segment.typecode == 'q' else np.float64)
+        values = numbers[positions - first].tolist()
+        objects = column.objects
+        for index in np.flatnonzero(flags == _OBJECT).tolist():
+            values[index] = objects[int(positions[index])]
+        return values
+    
+    def _fill_bucket(
+        self,
+        valid: "np.ndarray",
+        valid_rows: "np.ndarray",
+        previous: "np.ndarray",
+        windows: "np.ndarray"
+    ) -> "np.ndarray":
+        """bucket方式：空值取同一填充区间内最后一个有效值（块尾对齐填充区间，无需跨块状态）"""
+        if not len(valid_rows):
+            return np.full(len(valid), -1, dtype=np.int64)
+        
+        valid_windows = windows[valid_rows]
+        # 每个填充区间最后一个有效值在table中的下标
+        last = np.flatnonzero(np.append(valid_windows[1:] != valid_windows[:-1], True))
+        unique_windows = valid_windows[last]
+        
+        slot = np.searchsorted(unique_windows, windows)
+        slot_clipped = np.minimum(slot, len(unique_windows) - 1)
+        found = unique_windows[slot_clipped] == windows
+        fill = np.where(found, last[slot_clipped] + 1, -1)
+        return np.where(valid, previous, fill)
+    
+    def _fill_forward(
+        self,
+        state: _SignalState,
+        ticks: "np.ndarray",
+        valid_rows: "np.ndarray",
+        previous: "np.ndarray"
+    ) -> "np.ndarray":
+        """ffill方式：空值取之前最近的有效值（可来自之前的块），超过最大时长的不填充"""
+        source = previous if state.tick is not None else np.where(previous > 0, previous, -1)
+        max_age = self._max_age_ticks()
+        if max_age is None:
+            return source
+        
+        source_ticks = np.concatenate(([state.tick or 0], ticks[valid_rows]))[previous]
+        return np.where(ticks - source_ticks <= max_age, source, -1)
+    
+    def _fill_linear(
+        self,
+        state: _SignalState,
+        table: List[Any],
+        positions: "np.ndarray",
+        ticks: "np.ndarray",
+        flags: "np.ndarray",
+        valid_rows: "np.ndarray",
+        previous: "np.ndarray"
+    ) -> "np.ndarray":
+        """
+        linear方式：空值在前后两个有效数值之间按时间线性插值
+        
+        前后有效值可来自之前或之后的块。前后任一侧缺失、为非数值（如枚举），
+        或间隔超过最大时长时不填充。插值结果追加到table末尾。
+        """
+        valid = flags != 0
+        source = np.where(valid, previous, -1)
+        valid_count = len(valid_rows)
+        
+        # 块内最后一个有效行之后的空行需要之后块中的第一个有效值
+        following = previous + 1 - valid
+        next_value, next_tick, next_numeric = None, 0, False
+        if valid_count == 0 or valid_rows[-1] < len(valid) - 1:
+            found = self._next_valid(state, int(positions[-1]) + 1)
+            if found is not None:
+                next_value, next_tick, next_numeric = found
+        
+        numeric = np.concatenate((
+            [state.tick is not None and state.numeric],
+            flags[valid_rows] == _NUMBER,
+            [next_numeric]
+        ))
+        gap = ~valid & numeric[previous] & numeric[following]
+        
+        edge_ticks = np.concatenate(([state.tick or 0], ticks[valid_rows], [next_tick]))
+        max_age = self._max_age_ticks()
+        if max_age is not None:
+            gap &= edge_ticks[following] - edge_ticks[previous] <= max_age
+        
+        gap_rows = np.flatnonzero(gap)
+        if not len(gap_rows):
+            return source
+        
+        edge_values = table + [next_value]
+        numbers = np.array(
+            [value if numeric[index] else math.nan for index, value in enumerate(edge_values)],
+            dtype=np.float64
+        )
+        left, right = previous[gap_rows], following[gap_rows]
+        t0, t1 = edge_ticks[left], edge_ticks[right]
+        v0, v1 = numbers[left], numbers[right]
+        interpolated = v0 + (v1 - v0) * (ticks[gap_rows] - t0) / (t1 - t0)
+        
+        source[gap_rows] = np.arange(len(table), len(table) + len(gap_rows))
+        table.extend(interpolated.tolist())
+        return source
+    
+    def _next_valid(self, state: _SignalState, position: int) -> Optional[Tuple[Any, int, bool]]:
+        """
+        查找列中不小于position的第一个有效值
+        
+        每种present标记的查找结果被缓存，直到块越过该位置，整个填充过程中每列只被扫描一遍。
+        
+        Args:
+            state: 信号的填充状态
+            position: 起始位置
+        
+        Returns:
+            Optional[Tuple[Any, int, bool]]: (值, 采样桶号, 是否为数值)，之后没有有效值时返回None
+        """
+        present = state.column.present
+        nearest = -1
+        for flag in (_NUMBER, _OBJECT):
+            found = state.next_found[flag]
+            if found is None or (found != -1 and found < position):
+                found = present.find(flag, position)
+                state.next_found[flag] = found
+            if found != -1 and (nearest == -1 or found < nearest):
+                nearest = found
+        
+        if nearest == -1:
+            return None
+        return state.column.get(nearest), self.store.bucket_at(nearest), present[nearest] == _NUMBER
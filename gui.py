@@ -7,13 +7,21 @@
 import os
 import sys
 import threading
+import multiprocessing
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from typing import Optional
 import traceback
 import gc
 
-from config import Config, get_config, resolve_path
+from config import Config, get_config, resolve_path, ASC_READERS
+from sample_store import REDUCERS
+from arrow_writer import OUTPUT_FORMATS, arrow_available
+from long_writer import OUTPUT_LAYOUTS
+from output_compression import CSV_COMPRESSIONS, compression_available
+from input_compression import INPUT_COMPRESSIONS, detect_input_compression, find_compressed_input, input_compression_available
+from instrumentation import PerformanceReport, PERFORMANCE_FILE
+from progress import Progress, format_progress
 
 
 class ASCToCSVApp:
@@ -79,6 +87,7 @@ class ASCToCSVApp:
         self._create_file_section(main_frame)
         self._create_param_section(main_frame)
         self._create_action_section(main_frame)
+        self._create_progress_section(main_frame)
         self._create_log_section(main_frame)
     
     def _create_file_section(self, parent):
@@ -133,6 +142,41 @@ class ASCToCSVApp:
         
         self.debug_var = tk.BooleanVar(value=False)
         ttk.Checkbutton(param_frame, text="调试模式", variable=self.debug_var).grid(row=1, column=2, columnspan=2, sticky=tk.W, padx=(20, 0), pady=2)
+        
+        ttk.Label(param_frame, text="解析进程数:").grid(row=2, column=0, sticky=tk.W, pady=2)
+        self.workers_var = tk.StringVar(value="1")
+        workers_spin = ttk.Spinbox(param_frame, textvariable=self.workers_var, from_=1, to=os.cpu_count() or 1, width=13)
+        workers_spin.grid(row=2, column=1, sticky=tk.W, padx=5, pady=2)
+        
+        ttk.Label(param_frame, text="读取方式:").grid(row=2, column=2, sticky=tk.W, padx=(20, 0), pady=2)
+        self.reader_var = tk.StringVar(value="mmap")
+        reader_combo = ttk.Combobox(param_frame, textvariable=self.reader_var, width=12, state="readonly")
+        reader_combo["values"] = ASC_READERS
+        reader_combo.grid(row=2, column=3, sticky=tk.W, padx=5, pady=2)
+        
+        ttk.Label(param_frame, text="聚合方式:").grid(row=3, column=0, sticky=tk.W, pady=2)
+        self.reducer_var = tk.StringVar(value="last")
+        reducer_combo = ttk.Combobox(param_frame, textvariable=self.reducer_var, width=12, state="readonly")
+        reducer_combo["values"] = tuple(REDUCERS)
+        reducer_combo.grid(row=3, column=1, sticky=tk.W, padx=5, pady=2)
+        
+        ttk.Label(param_frame, text="输出格式:").grid(row=3, column=2, sticky=tk.W, padx=(20, 0), pady=2)
+        self.format_var = tk.StringVar(value="csv")
+        format_combo = ttk.Combobox(param_frame, textvariable=self.format_var, width=12, state="readonly")
+        format_combo["values"] = tuple(OUTPUT_FORMATS)
+        format_combo.grid(row=3, column=3, sticky=tk.W, padx=5, pady=2)
+        
+        ttk.Label(param_frame, text="输出布局:").grid(row=4, column=0, sticky=tk.W, pady=2)
+        self.layout_var = tk.StringVar(value="wide")
+        layout_combo = ttk.Combobox(param_frame, textvariable=self.layout_var, width=12, state="readonly")
+        layout_combo["values"] = OUTPUT_LAYOUTS
+        layout_combo.grid(row=4, column=1, sticky=tk.W, padx=5, pady=2)
+        
+        ttk.Label(param_frame, text="CSV压缩:").grid(row=4, column=2, sticky=tk.W, padx=(20, 0), pady=2)
+        self.compression_var = tk.StringVar(value="none")
+        compression_combo = ttk.Combobox(param_frame, textvariable=self.compression_var, width=12, state="readonly")
+        compression_combo["values"] = tuple(CSV_COMPRESSIONS)
+        compression_combo.grid(row=4, column=3, sticky=tk.W, padx=5, pady=2)
     
     def _create_action_section(self, parent):
         """创建操作按钮区域"""
@@ -162,6 +206,44 @@ class ASCToCSVApp:
             width=12
         ).pack(side=tk.RIGHT, padx=5)
     
+    def _create_progress_section(self, parent):
+        """创建进度显示区域"""
+        progress_frame = ttk.Frame(parent)
+        progress_frame.pack(fill=tk.X, pady=(0, 5))
+        
+        self.progress_bar = ttk.Progressbar(progress_frame, mode="determinate", maximum=100)
+        self.progress_bar.pack(fill=tk.X)
+        
+        self.progress_label = ttk.Label(progress_frame, text="")
+        self.progress_label.pack(anchor=tk.W, pady=(2, 0))
+    
+    def _on_progress(self, progress: Progress):
+        """
+        解析和写入的进度回调（在后台线程中调用，转交给界面线程显示）
+        
+        Args:
+            progress: 进度
+        """
+        self.root.after(0, self._show_progress, progress)
+    
+    def _show_progress(self, progress: Optional[Progress]):
+        """
+        显示进度
+        
+        Args:
+            progress: 进度，None表示清空
+        """
+        try:
+            if progress is None:
+                self.progress_bar.configure(value=0)
+                self.progress_label.configure(text="")
+                return
+            fraction = progress.fraction
+            self.progress_bar.configure(value=0 if fraction is None else fraction * 100)
+            self.progress_label.configure(text=format_progress(progress))
+        except tk.TclError:
+            pass
+    
     def _create_log_section(self, parent):
         """创建日志输出区域"""
         log_frame = ttk.LabelFrame(parent, text="运行日志", style="Section.TLabelframe", padding="10")
@@ -203,7 +285,11 @@ class ASCToCSVApp:
         """浏览ASC文件"""
         filename = filedialog.askopenfilename(
             title="选择ASC文件",
-            filetypes=[("ASC文件", "*.asc"), ("所有文件", "*.*")]
+            filetypes=[
+                ("ASC文件", "*.asc"),
+                ("压缩的ASC文件", " ".join(f"*.asc{suffix}" for suffix, _ in INPUT_COMPRESSIONS.values())),
+                ("所有文件", "*.*")
+            ]
         )
         if filename:
             self.asc_entry.delete(0, tk.END)
@@ -245,6 +331,12 @@ class ASCToCSVApp:
                 self.group_size_var.set(str(self.config.group_size))
                 self.encoding_var.set(self.config.csv_encoding)
                 self.debug_var.set(self.config.debug)
+                self.workers_var.set(str(self.config.workers))
+                self.reader_var.set(self.config.asc_reader)
+                self.reducer_var.set(self.config.default_reducer)
+                self.format_var.set(self.config.output_format)
+                self.layout_var.set(self.config.output_layout)
+                self.compression_var.set(self.config.csv_compression)
                 self._log("已加载配置文件")
         except FileNotFoundError:
             self._log("未找到配置文件，将使用默认设置")
@@ -254,16 +346,26 @@ class ASCToCSVApp:
     def _save_config(self):
         """保存配置到文件"""
         import json
+        import dataclasses
         
-        config_data = {
+        # 以当前配置的全部字段为基础，只用界面上的值覆盖对应字段，
+        # 界面上没有的字段（聚合规则、填充、压缩、批量、性能分析等）原样保留
+        config_data = dataclasses.asdict(self.config or Config())
+        config_data.update({
             "asc_file": self.asc_entry.get(),
             "dbc_files": list(self.dbc_listbox.get(0, tk.END)),
             "output_dir": self.output_entry.get(),
             "sample_interval": float(self.sample_interval_var.get()),
             "group_size": int(self.group_size_var.get()),
             "csv_encoding": self.encoding_var.get(),
-            "debug": self.debug_var.get()
-        }
+            "debug": self.debug_var.get(),
+            "workers": int(self.workers_var.get()),
+            "asc_reader": self.reader_var.get(),
+            "default_reducer": self.reducer_var.get(),
+            "output_format": self.format_var.get(),
+            "output_layout": self.layout_var.get(),
+            "csv_compression": self.compression_var.get()
+        })
         
         config_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.json")
         
@@ -292,13 +394,23 @@ class ASCToCSVApp:
             return False
         
         if not os.path.exists(asc_file):
-            messagebox.showerror("错误", f"ASC文件不存在: {asc_file}")
-            return False
+            compressed_file = find_compressed_input(asc_file)
+            if compressed_file is None:
+                messagebox.showerror("错误", f"ASC文件不存在: {asc_file}")
+                return False
+            asc_file = compressed_file
+            self.asc_entry.delete(0, tk.END)
+            self.asc_entry.insert(0, asc_file)
         
         if not os.access(asc_file, os.R_OK):
             messagebox.showerror("错误", f"无权限读取ASC文件: {asc_file}")
             return False
         
+        asc_compression = detect_input_compression(asc_file)
+        if asc_compression is not None and not input_compression_available(asc_compression):
+            messagebox.showerror("错误", f"读取{asc_compression}压缩的ASC文件所需的库未安装")
+            return False
+        
         if self.dbc_listbox.size() == 0:
             messagebox.showerror("错误", "请至少添加一个DBC文件")
             return False
@@ -334,6 +446,27 @@ class ASCToCSVApp:
             messagebox.showerror("错误", "分组大小必须是有效的整数")
             return False
         
+        try:
+            workers = int(self.workers_var.get())
+            if workers <= 0:
+                messagebox.showerror("错误", "解析进程数必须大于0")
+                return False
+        except ValueError:
+            messagebox.showerror("错误", "解析进程数必须是有效的整数")
+            return False
+        
+        if self.layout_var.get() == "long" and self.format_var.get() != "csv":
+            messagebox.showerror("错误", "长表布局仅支持csv输出格式")
+            return False
+        
+        if not compression_available(self.compression_var.get()):
+            messagebox.showerror("错误", f"CSV压缩方式{self.compression_var.get()}所需的库未安装")
+            return False
+        
+        if self.format_var.get() != "csv" and not arrow_available():
+            messagebox.showerror("错误", f"输出{self.format_var.get()}格式需要安装pyarrow")
+            return False
+        
         return True
     
     def _start_convert(self):
@@ -348,6 +481,7 @@ class ASCToCSVApp:
         self.is_converting = True
         self.convert_btn.configure(state=tk.DISABLED)
         self._clear_log()
+        self._show_progress(None)
         
         thread = threading.Thread(target=self._do_convert, daemon=True)
         thread.start()
@@ -357,12 +491,14 @@ class ASCToCSVApp:
         dbc_loader = None
         asc_parser = None
         data_processor = None
+        config = None
+        profiler = None
         
         try:
             from dbc_loader import DBCLoader
-            from asc_parser import ASCParser
+            from parallel_parser import create_asc_parser
             from data_processor import DataProcessor
-            from csv_writer import CSVWriter
+            from arrow_writer import create_writer
             
             config = Config(
                 asc_file=self.asc_entry.get(),
@@ -371,17 +507,49 @@ class ASCToCSVApp:
                 sample_interval=float(self.sample_interval_var.get()),
                 group_size=int(self.group_size_var.get()),
                 csv_encoding=self.encoding_var.get(),
-                debug=self.debug_var.get()
+                debug=self.debug_var.get(),
+                workers=int(self.workers_var.get()),
+                asc_reader=self.reader_var.get(),
+                default_reducer=self.reducer_var.get(),
+                signal_reducers=dict(self.config.signal_reducers) if self.config else {},
+                decode_cache_size=self.config.decode_cache_size if self.config else 4096,
+                compiled_decoders=self.config.compiled_decoders if self.config else False,
+                batch_decode=self.config.batch_decode if self.config else False,
+                signal_include=list(self.config.signal_include) if self.config else [],
+                signal_exclude=list(self.config.signal_exclude) if self.config else [],
+                dbc_cache=self.config.dbc_cache if self.config else True,
+                dbc_cache_dir=self.config.dbc_cache_dir if self.config else "",
+                fill_interval=self.config.fill_interval if self.config else 0.5,
+                fill_strategy=self.config.fill_strategy if self.config else "bucket",
+                fill_max_age=self.config.fill_max_age if self.config else 0.0,
+                output_format=self.format_var.get(),
+                arrow_compression=self.config.arrow_compression if self.config else "zstd",
+                output_layout=self.layout_var.get(),
+                csv_compression=self.compression_var.get(),
+                csv_compression_level=self.config.csv_compression_level if self.config else None,
+                csv_compression_threads=self.config.csv_compression_threads if self.config else -1,
+                trace_memory=self.config.trace_memory if self.config else False,
+                profile=self.config.profile if self.config else "none",
+                profile_stage=self.config.profile_stage if self.config else "all",
+                profile_interval=self.config.profile_interval if self.config else 0.005
             )
             
             self._log("开始转换...")
             self._log(f"分组规则: 按BatP+数字模式分组")
             self._log(f"采样间隔: {config.sample_interval}秒")
+            self._log(f"解析进程数: {config.workers}")
             self._log("")
             
             self._log("正在加载DBC文件...")
-            dbc_loader = DBCLoader()
-            if not dbc_loader.load(config.dbc_files):
+            report = PerformanceReport(config.trace_memory)
+            profiler = config.get_profiler()
+            report.profiler = profiler
+            if config.profile_stage == "all":
+                profiler.start()
+            dbc_loader = DBCLoader(config.get_signal_selector(), config.get_dbc_cache())
+            with report.stage("dbc_load"):
+                loaded = dbc_loader.load(config.dbc_files)
+            if not loaded:
                 self._log("DBC文件加载失败")
                 return
             
@@ -390,11 +558,11 @@ class ASCToCSVApp:
             self._log("")
             
             self._log("正在解析ASC文件...")
-            asc_parser = ASCParser(
-                sample_interval=config.sample_interval,
-                debug=config.debug
-            )
-            if not asc_parser.parse(config.asc_file, dbc_loader.message_map):
+            asc_parser = create_asc_parser(config)
+            asc_parser.progress = self._on_progress
+            with report.stage("parse"):
+                parsed = asc_parser.parse(config.asc_file, dbc_loader.message_map)
+            if not parsed:
                 self._log("ASC文件解析失败")
                 return
             
@@ -407,26 +575,26 @@ class ASCToCSVApp:
             
             self._log("正在处理数据...")
             data_processor = DataProcessor()
-            data_processor.aggregate(asc_parser.sampled_data)
-            data_processor.classify_signals(asc_parser.found_signals)
+            with report.stage("aggregate"):
+                data_processor.aggregate(asc_parser.sampled_data)
+            with report.stage("classify"):
+                data_processor.classify_signals(asc_parser.found_signals)
             
             self._log("分组结果：")
             for group_name, count in data_processor.get_group_statistics().items():
                 self._log(f"  {group_name}: {count}个信号")
             self._log("")
             
-            self._log("正在创建CSV文件...")
+            self._log(f"正在创建{config.output_format.upper()}文件...")
             config.create_output_dir()
-            csv_writer = CSVWriter(
-                output_dir=config.output_dir,
-                encoding=config.csv_encoding,
-                group_size=config.group_size
-            )
+            csv_writer = create_writer(config)
+            csv_writer.report = report
+            csv_writer.progress = self._on_progress
             
             created_files = csv_writer.write_all(
                 sorted_groups=data_processor.sorted_groups,
                 classified_signals=data_processor.classified_signals,
-                sorted_timestamps=data_processor.get_sorted_timestamps(),
+                time_ticks=data_processor.get_time_ticks(),
                 aggregated_data=data_processor.aggregated_data,
                 signal_info=dbc_loader.signal_info,
                 statistics={
@@ -436,6 +604,20 @@ class ASCToCSVApp:
                 }
             )
             
+            report.add_files(created_files)
+            created_files.append(report.write_json(
+                os.path.join(config.output_dir, PERFORMANCE_FILE),
+                asc_files=[config.asc_file],
+                original_count=original_count,
+                sampled_count=sampled_count,
+                signal_count=signal_count
+            ))
+            
+            self._log("")
+            self._log("性能统计：")
+            for line in report.format_lines():
+                self._log(line)
+            
             self._log("")
             self._log("=" * 50)
             self._log("转换完成！")
@@ -444,7 +626,7 @@ class ASCToCSVApp:
             self._log("=" * 50)
             
             self.root.after(0, lambda: messagebox.showinfo("成功", f"转换完成！\n输出目录: {config.output_dir}"))
-            
+        
         except MemoryError:
             self._log("错误：内存不足，请尝试增加采样间隔或处理较小的文件")
             self.root.after(0, lambda: messagebox.showerror("错误", "内存不足，请尝试增加采样间隔"))
@@ -459,6 +641,9 @@ class ASCToCSVApp:
             self.root.after(0, lambda: messagebox.showerror("错误", f"转换失败: {error_msg}"))
         
         finally:
+            if profiler is not None and profiler.enabled and os.path.isdir(config.output_dir):
+                for profile_file in profiler.write(config.output_dir):
+                    self._log(f"性能剖析文件: {profile_file}")
             if asc_parser:
                 asc_parser.clear()
             if data_processor:
@@ -483,7 +668,7 @@ def get_resource_path(relative_path: str) -> str:
     
     Args:
         relative_path: 相对路径
-        
+    
     Returns:
         str: 绝对路径
     """
@@ -494,6 +679,7 @@ def get_resource_path(relative_path: str) -> str:
 
 def main():
     """GUI主函数"""
+    multiprocessing.freeze_support()
     root = tk.Tk()
     app = ASCToCSVApp(root)
     root.mainloop()
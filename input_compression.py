@@ -0,0 +1,136 @@
+# asc_to_csv/input_compression.py
+"""
+输入解压模块
+识别压缩的ASC文件（gzip、bz2、xz，以及可选的zstd、lz4），以流方式解压读取，不生成临时文件
+"""
+
+import io
+import os
+import bz2
+import gzip
+import lzma
+from typing import BinaryIO, Optional, Union
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+
+# 压缩方式 -> (文件扩展名, 文件头魔数)
+INPUT_COMPRESSIONS = {
+    "gzip": (".gz", b"\x1f\x8b"),
+    "bz2": (".bz2", b"BZh"),
+    "xz": (".xz", b"\xfd7zXZ\x00"),
+    "zstd": (".zst", b"\x28\xb5\x2f\xfd"),
+    "lz4": (".lz4", b"\x04\x22\x4d\x18"),
+}
+
+# 解压读取缓冲大小
+READ_BUFFER_SIZE = 1024 * 1024
+
+_MAGIC_SIZE = max(len(magic) for _, magic in INPUT_COMPRESSIONS.values())
+
+
+def input_compression_available(compression: str) -> bool:
+    """
+    判断解压方式是否可用
+    
+    Args:
+        compression: 压缩方式（见INPUT_COMPRESSIONS）
+    
+    Returns:
+        bool: zstd需要安装zstandard，lz4需要安装lz4，其余总是可用
+    """
+    if compression == "zstd":
+        return zstandard is not None
+    if compression == "lz4":
+        return lz4_frame is not None
+    return compression in INPUT_COMPRESSIONS
+
+
+def detect_input_compression(file_path: str) -> Optional[str]:
+    """
+    识别文件的压缩方式
+    
+    先按文件头魔数识别（扩展名被改过也能识别），文件不可读时再按扩展名识别。
+    
+    Args:
+        file_path: 文件路径
+    
+    Returns:
+        Optional[str]: 压缩方式，未压缩时返回None
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            head = f.read(_MAGIC_SIZE)
+    except OSError:
+        head = b""
+    
+    for compression, (_, magic) in INPUT_COMPRESSIONS.items():
+        if head.startswith(magic):
+            return compression
+    if head:
+        return None
+    
+    lower_path = file_path.lower()
+    for compression, (suffix, _) in INPUT_COMPRESSIONS.items():
+        if lower_path.endswith(suffix):
+            return compression
+    return None
+
+
+def find_compressed_input(file_path: str) -> Optional[str]:
+    """
+    为不存在的文件查找同名的压缩文件（如 trace.asc -> trace.asc.gz）
+    
+    Args:
+        file_path: 文件路径
+    
+    Returns:
+        Optional[str]: 存在的压缩文件路径，未找到时返回None
+    """
+    for suffix, _ in INPUT_COMPRESSIONS.values():
+        candidate = file_path + suffix
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+def open_compressed_input(source: Union[str, BinaryIO], compression: str) -> BinaryIO:
+    """
+    以二进制流方式打开压缩文件，读取到的是解压后的内容
+    
+    Args:
+        source: 文件路径，或已打开的二进制文件（不会随返回的流关闭，
+            其tell()即为已读取的压缩数据字节数，可用于报告进度）
+        compression: 压缩方式（见INPUT_COMPRESSIONS）
+    
+    Returns:
+        BinaryIO: 支持按行迭代的二进制读取流
+    
+    Raises:
+        RuntimeError: 压缩方式依赖的库未安装
+    """
+    if not input_compression_available(compression):
+        raise RuntimeError(f"压缩方式{compression}需要安装{'zstandard' if compression == 'zstd' else compression}")
+    
+    if compression == "gzip":
+        return gzip.open(source, 'rb')
+    if compression == "bz2":
+        return bz2.open(source, 'rb')
+    if compression == "xz":
+        return lzma.open(source, 'rb')
+    if compression == "zstd":
+        owned = isinstance(source, (str, os.PathLike))
+        raw = open(source, 'rb') if owned else source
+        reader = zstandard.ZstdDecompressor().stream_reader(raw, closefd=owned)
+        return io.BufferedReader(reader, READ_BUFFER_SIZE)
+    if compression == "lz4":
+        return lz4_frame.open(source, 'rb')
+    raise ValueError(f"未知的压缩方式: {compression}")
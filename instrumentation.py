@@ -0,0 +1,271 @@
+# asc_to_csv/instrumentation.py
+"""
+性能统计模块
+记录转换各阶段的耗时、CPU时间和内存峰值，输出到汇总文件、JSON文件和日志
+"""
+
+import os
+import sys
+import json
+import time
+import contextlib
+import tracemalloc
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+# 性能统计JSON文件名（写在输出目录中）
+PERFORMANCE_FILE = "Performance.json"
+
+# 阶段名称 -> 显示名称
+STAGE_NAMES = {
+    "dbc_load": "加载DBC",
+    "parse": "解析ASC",
+    "aggregate": "聚合",
+    "classify": "分组",
+    "infer_kinds": "推断列类型",
+    "fill": "空值填充",
+    "write": "写入数据文件",
+    "summary": "写入汇总文件",
+}
+
+_MB = 1024 * 1024
+
+
+def peak_rss_mb() -> Optional[float]:
+    """
+    进程峰值常驻内存
+    
+    Returns:
+        Optional[float]: 峰值内存（MB），平台不支持（Windows）时返回None
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux单位为KB，macOS为字节
+    return peak / _MB if sys.platform == "darwin" else peak / 1024
+
+
+@dataclass
+class StageTiming:
+    """
+    单个阶段的性能数据
+    
+    Attributes:
+        name: 阶段名称（见STAGE_NAMES）
+        seconds: 耗时（秒，不含嵌套的子阶段）
+        cpu_seconds: 本进程CPU时间（秒，不含嵌套的子阶段）
+        peak_rss_mb: 阶段结束时的进程峰值常驻内存（MB），不支持时为None
+        traced_peak_mb: 阶段内tracemalloc记录的Python内存分配峰值（MB），未启用时为None
+    """
+    
+    name: str
+    seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    peak_rss_mb: Optional[float] = None
+    traced_peak_mb: Optional[float] = None
+    
+    @property
+    def display_name(self) -> str:
+        """显示名称"""
+        return STAGE_NAMES.get(self.name, self.name)
+
+
+class PerformanceReport:
+    """
+    转换性能报告
+    
+    用stage()包裹各阶段；嵌套的阶段（如写入过程中流式进行的填充，用timed()计时）
+    单独记录并从外层阶段中扣除，各阶段耗时之和即为总耗时。
+    峰值常驻内存由getrusage读取，是进程自启动以来的峰值，不随阶段重置；
+    tracemalloc峰值按顶层阶段重置，但会使转换明显变慢，默认不启用。
+    
+    Attributes:
+        stages: 按完成顺序排列的阶段数据
+        files: 输出文件名到字节数的映射
+        trace_memory: 是否记录tracemalloc峰值
+        profiler: 性能剖析器（profiler.Profiler），设置后在其剖析范围对应的阶段中剖析，None表示不剖析
+    """
+    
+    def __init__(self, trace_memory: bool = False):
+        """
+        初始化性能报告
+        
+        Args:
+            trace_memory: 是否记录各阶段的tracemalloc峰值
+        """
+        self.stages: List[StageTiming] = []
+        self.files: Dict[str, int] = {}
+        self.trace_memory = trace_memory
+        self.profiler = None
+        # 正在进行的阶段的子阶段累计 [耗时, CPU时间]
+        self._children: List[List[float]] = []
+    
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        记录一个阶段
+        
+        Args:
+            name: 阶段名称
+        """
+        children = [0.0, 0.0]
+        self._children.append(children)
+        traced = self.trace_memory and len(self._children) == 1
+        started = False
+        if traced:
+            started = not tracemalloc.is_tracing()
+            if started:
+                tracemalloc.start()
+            elif hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+        
+        profile = self.profiler.profile(name) if self.profiler is not None else contextlib.nullcontext()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            with profile:
+                yield
+        finally:
+            seconds = time.perf_counter() - wall_start
+            cpu_seconds = time.process_time() - cpu_start
+            self._children.pop()
+            
+            timing = StageTiming(name, seconds - children[0], cpu_seconds - children[1], peak_rss_mb())
+            if traced:
+                timing.traced_peak_mb = tracemalloc.get_traced_memory()[1] / _MB
+                if started:
+                    tracemalloc.stop()
+            self._add_child(seconds, cpu_seconds)
+            self.stages.append(timing)
+    
+    def timed(self, name: str, iterable: Iterable) -> Iterator:
+        """
+        逐项计时地迭代，记录为一个子阶段
+        
+        用于在外层阶段中按需生成数据的流式处理（如写入时逐块填充），
+        只累计生成每一项所花的时间，不含使用方处理该项的时间。
+        
+        Args:
+            name: 阶段名称
+            iterable: 被计时的可迭代对象
+        
+        Returns:
+            Iterator: 与iterable相同的各项
+        """
+        timing = StageTiming(name)
+        iterator = iter(iterable)
+        perf_counter = time.perf_counter
+        process_time = time.process_time
+        try:
+            while True:
+                wall_start = perf_counter()
+                cpu_start = process_time()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+                finally:
+                    timing.seconds += perf_counter() - wall_start
+                    timing.cpu_seconds += process_time() - cpu_start
+                yield item
+        finally:
+            timing.peak_rss_mb = peak_rss_mb()
+            self._add_child(timing.seconds, timing.cpu_seconds)
+            self.stages.append(timing)
+    
+    def _add_child(self, seconds: float, cpu_seconds: float) -> None:
+        """将子阶段耗时计入正在进行的外层阶段"""
+        if self._children:
+            self._children[-1][0] += seconds
+            self._children[-1][1] += cpu_seconds
+    
+    def add_files(self, file_paths: Iterable[str]) -> None:
+        """
+        记录输出文件大小
+        
+        Args:
+            file_paths: 文件路径列表
+        """
+        for file_path in file_paths:
+            if os.path.exists(file_path):
+                self.files[os.path.basename(file_path)] = os.path.getsize(file_path)
+    
+    @property
+    def total_seconds(self) -> float:
+        """各阶段耗时之和（秒）"""
+        return sum(timing.seconds for timing in self.stages)
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        转换为可序列化为JSON的字典
+        
+        Returns:
+            Dict[str, Any]: 性能数据
+        """
+        return {
+            'stages': [asdict(timing) for timing in self.stages],
+            'total_seconds': self.total_seconds,
+            'total_cpu_seconds': sum(timing.cpu_seconds for timing in self.stages),
+            'peak_rss_mb': peak_rss_mb(),
+            'files': dict(self.files)
+        }
+    
+    def write_json(self, file_path: str, **extra: Any) -> str:
+        """
+        写入JSON文件
+        
+        Args:
+            file_path: 文件路径
+            **extra: 额外写入的顶层字段（如输入文件、配置）
+        
+        Returns:
+            str: 文件路径
+        """
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(dict(extra, **self.as_dict()), f, ensure_ascii=False, indent=2)
+        return file_path
+    
+    def summary_rows(self) -> List[List[Any]]:
+        """
+        汇总文件中的性能统计表
+        
+        Returns:
+            List[List[Any]]: 表头和每个阶段一行，没有阶段数据时为空
+        """
+        if not self.stages:
+            return []
+        rows = [["阶段", "耗时(秒)", "CPU时间(秒)", "峰值内存(MB)", "tracemalloc峰值(MB)"]]
+        for timing in self.stages:
+            rows.append([
+                timing.display_name,
+                f"{timing.seconds:.3f}",
+                f"{timing.cpu_seconds:.3f}",
+                "" if timing.peak_rss_mb is None else f"{timing.peak_rss_mb:.1f}",
+                "" if timing.traced_peak_mb is None else f"{timing.traced_peak_mb:.1f}"
+            ])
+        return rows
+    
+    def format_lines(self) -> List[str]:
+        """
+        日志中的性能统计（每个阶段一行，耗时占比从高到低可一眼看出瓶颈）
+        
+        Returns:
+            List[str]: 文本行
+        """
+        total = self.total_seconds or 1e-9
+        lines = []
+        for timing in self.stages:
+            line = f"  {timing.display_name}: {timing.seconds:.3f}秒（{timing.seconds / total:.0%}）CPU {timing.cpu_seconds:.3f}秒"
+            if timing.peak_rss_mb is not None:
+                line += f"  峰值内存 {timing.peak_rss_mb:.1f} MB"
+            if timing.traced_peak_mb is not None:
+                line += f"  tracemalloc峰值 {timing.traced_peak_mb:.1f} MB"
+            lines.append(line)
+        lines.append(f"  合计: {self.total_seconds:.3f}秒")
+        return lines
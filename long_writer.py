@@ -0,0 +1,206 @@
+# asc_to_csv/long_writer.py
+"""
+长表输出模块
+只输出实际有值的观测，每行为 (时间, DBC, 消息, 信号, 值, 单位)，不做空值填充和宽表展开
+"""
+
+import os
+import re
+import csv
+from operator import itemgetter
+from typing import Any, Dict, Iterator, List, Tuple
+from collections.abc import Mapping
+
+from utils import safe_value
+from csv_writer import CSVWriter
+from sample_store import AggregatedView, SampleStore
+
+
+# 输出布局：wide 每个时间点一行、每个信号一列（默认）；long 每个观测一行
+OUTPUT_LAYOUTS = ("wide", "long")
+
+# 每次按时间排序的采样区间位置数
+LONG_CHUNK = 4096
+
+_NON_EMPTY = re.compile(rb'[^\x00]')
+
+
+class LongWriter(CSVWriter):
+    """
+    长表写入器
+    
+    直接遍历SampleStore中每个信号列的有值位置，按 (时间, 信号) 顺序输出观测，
+    稀疏信号不产生空单元格，输出大小与观测数成正比，而不是与"时间点数 × 信号数"成正比。
+    所有信号写入同一个文件（分组可由消息列区分），另写Summary.csv。
+    
+    Attributes:
+        record_count: 已写入的观测数
+    """
+    
+    def __init__(self, output_dir: str, **kwargs):
+        """
+        初始化长表写入器
+        
+        Args:
+            output_dir: 输出目录
+            **kwargs: 传给CSVWriter的其他参数（空值填充参数被忽略）
+        """
+        kwargs['fill_strategy'] = "none"
+        super().__init__(output_dir, **kwargs)
+        self.record_count = 0
+    
+    def write_all(
+        self,
+        sorted_groups: List[str],
+        classified_signals: Dict[str, List[str]],
+        time_ticks: List[int],
+        aggregated_data: Mapping,
+        signal_info: Dict[str, Dict[str, str]],
+        statistics: Dict[str, int]
+    ) -> List[str]:
+        """
+        写入长表文件和汇总文件
+        
+        Args:
+            sorted_groups: 排序后的分组列表
+            classified_signals: 分类后的信号
+            time_ticks: 升序的采样桶号
+            aggregated_data: 聚合后的数据
+            signal_info: 信号信息
+            statistics: 统计信息
+        
+        Returns:
+            List[str]: 生成的文件列表
+        """
+        all_signals = sorted({sig_name for signals in classified_signals.values() for sig_name in signals})
+        
+        with self._stage("write"):
+            long_file = self._write_long_file(
+                self._tracked(self._observations(time_ticks, aggregated_data, all_signals), time_ticks),
+                all_signals, signal_info
+            )
+        print(f"  创建长表文件: {long_file}（观测数: {self.record_count}）")
+        
+        with self._stage("summary"):
+            summary_file = self._write_summary_file(
+                sorted_groups, classified_signals, time_ticks,
+                statistics, signal_info
+            )
+        return [summary_file, long_file]
+    
+    def _observations(
+        self,
+        time_ticks: List[int],
+        aggregated_data: Mapping,
+        signals: List[str]
+    ) -> Iterator[Tuple[int, int, Any]]:
+        """
+        按 (时间, 信号) 顺序遍历所有观测
+        
+        Args:
+            time_ticks: 升序的采样桶号
+            aggregated_data: 聚合后的数据
+            signals: 排序后的信号列表
+        
+        Returns:
+            Iterator[Tuple[int, int, Any]]: (采样桶号, 信号在signals中的下标, 值)
+        """
+        store = aggregated_data.store if isinstance(aggregated_data, AggregatedView) else None
+        if store is not None:
+            return self._store_observations(store, signals)
+        
+        signal_index = {sig_name: index for index, sig_name in enumerate(signals)}
+        return (
+            (tick, index, value)
+            for tick in time_ticks
+            for index, value in sorted(
+                (signal_index[sig_name], value)
+                for sig_name, value in aggregated_data.get(tick, {}).items()
+                if value is not None and sig_name in signal_index
+            )
+        )
+    
+    @staticmethod
+    def _store_observations(store: SampleStore, signals: List[str]) -> Iterator[Tuple[int, int, Any]]:
+        """
+        从SampleStore按列读取观测
+        
+        每LONG_CHUNK个位置为一块，块内逐列用正则在present标记中查找非空位置，
+        再按位置稳定排序（同一位置保持信号顺序），内存中只保留一块的观测。
+        
+        Args:
+            store: 采样数据
+            signals: 排序后的信号列表
+        
+        Returns:
+            Iterator[Tuple[int, int, Any]]: (采样桶号, 信号下标, 值)
+        """
+        columns = [
+            (index, store.columns[store.signal_ids[sig_name]])
+            for index, sig_name in enumerate(signals)
+            if sig_name in store.signal_ids
+        ]
+        for segment_start, segment_end, offset in store.segments():
+            for start in range(segment_start, segment_end, LONG_CHUNK):
+                end = min(start + LONG_CHUNK, segment_end)
+                records = []
+                for index, column in columns:
+                    get = column.get
+                    for match in _NON_EMPTY.finditer(column.present, start, end):
+                        position = match.start()
+                        records.append((position + offset, index, get(position)))
+                records.sort(key=itemgetter(0))
+                yield from records
+    
+    def _write_long_file(
+        self,
+        observations: Iterator[Tuple[int, int, Any]],
+        signals: List[str],
+        signal_info: Dict
+    ) -> str:
+        """
+        写入长表文件
+        
+        Args:
+            observations: (采样桶号, 信号下标, 值)
+            signals: 排序后的信号列表
+            signal_info: 信号信息
+        
+        Returns:
+            str: 文件路径
+        """
+        # 每个信号的固定列：DBC、消息、信号短名称和单位
+        signal_columns = []
+        for sig_name in signals:
+            info = signal_info.get(sig_name, {})
+            parts = sig_name.split('::')
+            signal_columns.append((
+                info.get('dbc', parts[0] if len(parts) > 2 else ''),
+                info.get('message', parts[-2] if len(parts) > 1 else ''),
+                parts[-1],
+                info.get('unit', '')
+            ))
+        
+        interval = self.sample_interval
+        long_filename = os.path.join(self.output_dir, f"All_Signals{self.extension}")
+        record_count = 0
+        with self._open_output(long_filename) as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(["Time[s]", "DBC", "Message", "Signal", "Value", "Unit"])
+            writerow = writer.writerow
+            for tick, index, value in observations:
+                dbc_name, message, short_name, unit = signal_columns[index]
+                writerow((round(tick * interval, 1), dbc_name, message, short_name, safe_value(value), unit))
+                record_count += 1
+        
+        self.record_count = record_count
+        return long_filename
+    
+    def _summary_format_rows(self) -> List[List[str]]:
+        """汇总文件中的输出布局信息"""
+        layout_rows = [["输出布局", "long（时间, DBC, 消息, 信号, 值, 单位）"], ["观测数", str(self.record_count)]]
+        return layout_rows + super()._summary_format_rows()
+    
+    def _group_file_name(self, group_name: str) -> str:
+        """长表中所有分组都在同一个文件"""
+        return f"All_Signals{self.extension}"
@@ -4,11 +4,27 @@
 协调各模块完成ASC到CSV的转换
 """
 
-from config import Config, get_default_config
+import os
+import sys
+import argparse
+import dataclasses
+import multiprocessing
+from typing import List, Optional
+
+from config import Config, get_default_config, get_config_path, load_config, resolve_path, ASC_READERS
+from sample_store import REDUCERS
+from gap_fill import FILL_STRATEGIES
+from arrow_writer import OUTPUT_FORMATS
+from long_writer import OUTPUT_LAYOUTS
+from output_compression import CSV_COMPRESSIONS
+from dbc_cache import DBCCache
+from instrumentation import PerformanceReport, PERFORMANCE_FILE
+from profiler import PROFILE_MODES, PROFILE_STAGES
+from progress import console_progress
 from dbc_loader import DBCLoader
-from asc_parser import ASCParser
+from parallel_parser import create_asc_parser
 from data_processor import DataProcessor
-from csv_writer import CSVWriter
+from arrow_writer import create_writer
 
 
 class ASCToCSVConverter:
@@ -18,18 +34,23 @@ class ASCToCSVConverter:
     协调各模块完成完整的转换流程
     """
     
-    def __init__(self, config: Config = None):
+    def __init__(self, config: Config = None, dbc_loader: DBCLoader = None):
         """
         初始化转换器
         
         Args:
             config: 配置对象，如果为None则使用默认配置
+            dbc_loader: 已加载的DBC加载器（批量转换时共享），如果为None则按配置加载
         """
         self.config = config or get_default_config()
-        self.dbc_loader = DBCLoader()
+        self.dbc_loader = dbc_loader
         self.asc_parser = None
         self.data_processor = DataProcessor()
         self.csv_writer = None
+        self.report = PerformanceReport(self.config.trace_memory)
+        self.profiler = self.config.get_profiler()
+        self.report.profiler = self.profiler
+        self.progress = console_progress(self.config.show_progress)
     
     def run(self) -> bool:
         """
@@ -48,21 +69,42 @@ class ASCToCSVConverter:
         # 创建输出目录
         self.config.create_output_dir()
         
+        with self.profiler.profile("all"):
+            success = self._convert()
+        
+        if self.profiler.enabled:
+            self._write_profile()
+        return success
+    
+    def _convert(self) -> bool:
+        """
+        执行转换（加载DBC、解析、处理和写入）
+        
+        Returns:
+            bool: 是否成功完成转换
+        """
         # 加载DBC文件
-        print("\n正在加载DBC文件...")
-        if not self.dbc_loader.load(self.config.dbc_files):
-            return False
+        if self.dbc_loader is None:
+            print("\n正在加载DBC文件...")
+            self.dbc_loader = DBCLoader(self.config.get_signal_selector(), self.config.get_dbc_cache())
+            with self.report.stage("dbc_load"):
+                loaded = self.dbc_loader.load(self.config.dbc_files)
+            if not loaded:
+                return False
         
         print(f"\n总消息定义数: {self.dbc_loader.get_message_count()}")
         print(f"总信号定义数: {self.dbc_loader.get_signal_count()}")
         
         # 解析ASC文件
         print("\n正在解析ASC文件...")
-        self.asc_parser = ASCParser(
-            sample_interval=self.config.sample_interval,
-            debug=self.config.debug
-        )
-        if not self.asc_parser.parse(self.config.asc_file, self.dbc_loader.message_map):
+        self.asc_parser = create_asc_parser(self.config)
+        self.asc_parser.progress = self.progress
+        with self.report.stage("parse"):
+            if self.config.merge_files:
+                parsed = self.asc_parser.parse_merged(self.config.merge_files, self.dbc_loader.message_map)
+            else:
+                parsed = self.asc_parser.parse(self.config.asc_file, self.dbc_loader.message_map)
+        if not parsed:
             return False
         
         # 打印解析统计
@@ -74,26 +116,26 @@ class ASCToCSVConverter:
         
         # 处理数据
         print("\n正在处理数据...")
-        self.data_processor.aggregate(self.asc_parser.sampled_data)
-        self.data_processor.classify_signals(self.asc_parser.found_signals)
+        with self.report.stage("aggregate"):
+            self.data_processor.aggregate(self.asc_parser.sampled_data)
+        with self.report.stage("classify"):
+            self.data_processor.classify_signals(self.asc_parser.found_signals)
         
         # 打印分组结果
         print("\n分组结果：")
         for group_name, count in self.data_processor.get_group_statistics().items():
             print(f"  {group_name}: {count}个信号")
         
-        # 写入CSV文件
-        print("\n正在创建CSV文件...")
-        self.csv_writer = CSVWriter(
-            output_dir=self.config.output_dir,
-            encoding=self.config.csv_encoding,
-            group_size=self.config.group_size
-        )
+        # 写入输出文件
+        print(f"\n正在创建{self.config.output_format.upper()}文件...")
+        self.csv_writer = create_writer(self.config)
+        self.csv_writer.report = self.report
+        self.csv_writer.progress = self.progress
         
         created_files = self.csv_writer.write_all(
             sorted_groups=self.data_processor.sorted_groups,
             classified_signals=self.data_processor.classified_signals,
-            sorted_timestamps=self.data_processor.get_sorted_timestamps(),
+            time_ticks=self.data_processor.get_time_ticks(),
             aggregated_data=self.data_processor.aggregated_data,
             signal_info=self.dbc_loader.signal_info,
             statistics={
@@ -103,6 +145,16 @@ class ASCToCSVConverter:
             }
         )
         
+        # 写入性能统计
+        self.report.add_files(created_files)
+        created_files.append(self.report.write_json(
+            os.path.join(self.config.output_dir, PERFORMANCE_FILE),
+            asc_files=self.config.merge_files or [self.config.asc_file],
+            original_count=original_count,
+            sampled_count=sampled_count,
+            signal_count=signal_count
+        ))
+        
         # 打印完成信息
         self._print_summary(created_files)
         
@@ -114,9 +166,40 @@ class ASCToCSVConverter:
         print(f"分组规则: 按BatP+数字模式分组")
         print(f"采样间隔: {self.config.sample_interval}秒")
         print(f"分组大小: {self.config.group_size}个数据/组")
-        print(f"输出格式: CSV文件")
+        if self.config.merge_files:
+            print(f"合并输入: {len(self.config.merge_files)}个ASC文件（按时间戳合并，单进程解析）")
+        print(f"解析进程数: {self.config.workers}")
+        if self.config.profile != "none":
+            print(f"性能剖析: {self.config.profile}（范围: {self.config.profile_stage}）")
+            if self.config.workers > 1 and not self.config.merge_files:
+                print("  多进程解析时只剖析主进程，工作进程中的解码不在剖析范围内")
+        print(f"读取方式: {self.config.asc_reader}")
+        print(f"默认聚合方式: {self.config.default_reducer}")
+        print(f"空值填充: {self.config.fill_strategy}（填充间隔: {self.config.fill_interval}秒）")
+        if self.config.signal_include:
+            print(f"信号白名单: {', '.join(self.config.signal_include)}")
+        if self.config.signal_exclude:
+            print(f"信号黑名单: {', '.join(self.config.signal_exclude)}")
+        if self.config.output_format != "csv":
+            print(f"输出格式: {self.config.output_format}文件（压缩: {self.config.arrow_compression}）")
+            return
+        if self.config.output_layout == "long":
+            print(f"输出格式: CSV长表文件（每个观测一行，不填充空值）")
+        else:
+            print(f"输出格式: CSV文件")
+        if self.config.csv_compression != "none":
+            print(f"CSV压缩: {self.config.csv_compression}")
         print(f"文件编码: {self.config.csv_encoding}")
     
+    def _write_profile(self) -> None:
+        """写入性能剖析结果"""
+        profile_files = self.profiler.write(self.config.output_dir)
+        print(f"\n性能剖析（{self.config.profile}，范围: {self.config.profile_stage}，剖析时长: {self.profiler.seconds:.2f}秒）：")
+        if not profile_files:
+            print(f"  没有剖析数据（阶段{self.config.profile_stage}未执行）")
+        for profile_file in profile_files:
+            print(f"  创建剖析文件: {profile_file}")
+    
     def _print_summary(self, created_files: list) -> None:
         """
         打印转换摘要
@@ -128,22 +211,219 @@ class ASCToCSVConverter:
         print(f"输出目录: {self.config.output_dir}")
         print(f"生成文件数: {len(created_files)}")
         
+        print(f"\n性能统计：")
+        for line in self.report.format_lines():
+            print(line)
+        
         print(f"\n生成的文件：")
         print(f"  1. Summary.csv - 汇总报告")
-        print(f"  2. All_Signals.csv - 所有信号总览")
-        for i, group_name in enumerate(self.data_processor.sorted_groups, 3):
+        print(f"  2. {PERFORMANCE_FILE} - 各阶段耗时和内存")
+        if self.config.output_layout == "long":
+            print(f"  3. All_Signals{self.csv_writer.extension} - 所有信号观测值（长表）")
+            return
+        print(f"  3. All_Signals{self.csv_writer.extension} - 所有信号总览")
+        for i, group_name in enumerate(self.data_processor.sorted_groups, 4):
             signal_count = len(self.data_processor.classified_signals[group_name])
-            print(f"  {i}. {group_name}.csv - {signal_count}个信号")
+            print(f"  {i}. {group_name}{self.csv_writer.extension} - {signal_count}个信号")
+
+
+def _add_switch(group, name: str, help: str, dest: Optional[str] = None) -> None:
+    """
+    添加成对的开关参数 --name / --no-name（同argparse.BooleanOptionalAction，兼容Python 3.8）
+    
+    未指定时为None，沿用配置文件中的值；两者都可以覆盖配置文件中的true或false。
+    
+    Args:
+        group: 参数解析器或参数组
+        name: 参数名（不含--）
+        help: 帮助文本
+        dest: 目标属性名，None表示由name生成
+    """
+    dest = dest or name.replace("-", "_")
+    group.add_argument(f"--{name}", dest=dest, action="store_true", default=None, help=help)
+    group.add_argument(f"--no-{name}", dest=dest, action="store_false", default=None, help=f"关闭--{name}")
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    """
+    创建命令行参数解析器
+    
+    未指定的参数沿用配置文件（--config，默认按get_config_path查找）中的值。
+    
+    Returns:
+        argparse.ArgumentParser: 参数解析器
+    """
+    arg_parser = argparse.ArgumentParser(
+        description="ASC到CSV转换工具（命令行参数覆盖配置文件中的同名参数）"
+    )
+    arg_parser.add_argument(
+        "asc", nargs="*",
+        help="ASC文件；多个文件、目录或通配符模式时批量转换（--merge时合并为一个数据流）"
+    )
+    arg_parser.add_argument("-c", "--config", help="配置文件路径（默认为ASC_TO_CSV_CONFIG或脚本目录下的config.json）")
+    arg_parser.add_argument(
+        "-d", "--dbc", action="append", metavar="DBC",
+        help="DBC文件，多个文件时重复指定（替换配置文件中的dbc_files）"
+    )
+    arg_parser.add_argument("-o", "--output-dir", help="输出目录")
+    arg_parser.add_argument("--merge", action="store_true", help="将多个ASC文件按时间戳合并为一次转换")
+    
+    group = arg_parser.add_argument_group("解析")
+    group.add_argument("-s", "--sample-interval", type=float, help="采样间隔（秒）")
+    group.add_argument("-j", "--workers", type=int, help="单个文件的解析进程数")
+    group.add_argument("--batch-workers", type=int, help="批量转换的进程数（-1为全部CPU核心）")
+    group.add_argument("--reader", choices=ASC_READERS, help="ASC读取方式")
+    group.add_argument("--reducer", choices=list(REDUCERS), help="默认聚合方式")
+    _add_switch(group, "batch-decode", "按消息批量解码（需要numpy）")
+    _add_switch(group, "compiled-decoders", "为每个消息生成专用解码器")
+    _add_switch(group, "dbc-cache", "使用DBC缓存")
+    group.add_argument("--purge-dbc-cache", action="store_true", help="清空DBC缓存后退出")
+    
+    group = arg_parser.add_argument_group("信号筛选")
+    group.add_argument(
+        "--include", action="append", metavar="PATTERN",
+        help="信号白名单模式，多个模式时重复指定（替换配置文件中的signal_include）"
+    )
+    group.add_argument(
+        "--exclude", action="append", metavar="PATTERN",
+        help="信号黑名单模式，多个模式时重复指定（替换配置文件中的signal_exclude）"
+    )
+    
+    group = arg_parser.add_argument_group("输出")
+    group.add_argument("-f", "--format", choices=list(OUTPUT_FORMATS), help="输出格式")
+    group.add_argument("--layout", choices=OUTPUT_LAYOUTS, help="输出布局")
+    group.add_argument("--group-size", type=int, help="分组大小")
+    group.add_argument("--fill", choices=FILL_STRATEGIES, help="空值填充方式")
+    group.add_argument("--fill-interval", type=float, help="空值填充间隔（秒）")
+    group.add_argument("--fill-max-age", type=float, help="最大填充时长（秒，0为不限制）")
+    group.add_argument("--encoding", help="CSV文件编码")
+    group.add_argument("--compression", choices=list(CSV_COMPRESSIONS), help="CSV压缩方式")
+    group.add_argument("--compression-level", type=int, help="CSV压缩级别")
+    group.add_argument("--arrow-compression", help="parquet/feather压缩方式")
+    
+    group = arg_parser.add_argument_group("性能分析")
+    group.add_argument("--profile", choices=PROFILE_MODES, help="性能剖析方式（结果写入输出目录）")
+    group.add_argument(
+        "--profile-stage", choices=PROFILE_STAGES,
+        help="剖析范围（all为整个转换，parse为ASCParser.parse，write为写入数据文件）"
+    )
+    group.add_argument("--profile-interval", type=float, help="sample方式的调用栈采样间隔（秒）")
+    _add_switch(group, "trace-memory", "用tracemalloc记录各阶段的内存分配峰值（明显降低转换速度）")
+    
+    _add_switch(arg_parser, "progress", "显示解析和写入进度", dest="show_progress")
+    _add_switch(arg_parser, "debug", "启用调试模式")
+    return arg_parser
+
 
+# 命令行参数名 -> Config字段名（值为None表示未指定，沿用配置文件）
+_ARGUMENT_FIELDS = {
+    "sample_interval": "sample_interval",
+    "workers": "workers",
+    "batch_workers": "batch_workers",
+    "reader": "asc_reader",
+    "reducer": "default_reducer",
+    "batch_decode": "batch_decode",
+    "compiled_decoders": "compiled_decoders",
+    "dbc_cache": "dbc_cache",
+    "include": "signal_include",
+    "exclude": "signal_exclude",
+    "format": "output_format",
+    "layout": "output_layout",
+    "group_size": "group_size",
+    "fill": "fill_strategy",
+    "fill_interval": "fill_interval",
+    "fill_max_age": "fill_max_age",
+    "encoding": "csv_encoding",
+    "compression": "csv_compression",
+    "compression_level": "csv_compression_level",
+    "arrow_compression": "arrow_compression",
+    "debug": "debug",
+    "trace_memory": "trace_memory",
+    "profile": "profile",
+    "profile_stage": "profile_stage",
+    "profile_interval": "profile_interval",
+    "show_progress": "show_progress",
+}
 
-def main():
-    """主函数"""
-    # 使用默认配置
-    config = get_default_config()
+_GLOB_CHARS = ('*', '?', '[')
+
+
+def apply_arguments(config: Config, args: argparse.Namespace) -> Config:
+    """
+    用命令行参数覆盖配置
+    
+    Args:
+        config: 配置文件中的配置
+        args: 命令行参数
+    
+    Returns:
+        Config: 覆盖后的新配置对象（命令行中的相对路径相对于当前目录）
+    """
+    overrides = {
+        field_name: getattr(args, arg_name)
+        for arg_name, field_name in _ARGUMENT_FIELDS.items()
+        if getattr(args, arg_name) is not None
+    }
+    
+    if args.dbc:
+        overrides["dbc_files"] = [resolve_path(dbc_file) for dbc_file in args.dbc]
+    if args.output_dir:
+        overrides["output_dir"] = resolve_path(args.output_dir)
+    
+    if args.asc:
+        asc_inputs = [resolve_path(asc_input) for asc_input in args.asc]
+        overrides.update(asc_file="", merge_files=[], asc_files=[])
+        if args.merge:
+            overrides["merge_files"] = asc_inputs
+        elif len(asc_inputs) == 1 and not os.path.isdir(asc_inputs[0]) and not any(
+            char in asc_inputs[0] for char in _GLOB_CHARS
+        ):
+            overrides["asc_file"] = asc_inputs[0]
+        else:
+            overrides["asc_files"] = asc_inputs
+    
+    return dataclasses.replace(config, **overrides)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    主函数
+    
+    Args:
+        argv: 命令行参数，None表示使用sys.argv
+    
+    Returns:
+        int: 退出码（0为成功）
+    """
+    multiprocessing.freeze_support()
+    
+    args = build_arg_parser().parse_args(argv)
+    
+    # 配置文件中的配置，再用命令行参数覆盖
+    if args.config:
+        if not os.path.exists(args.config):
+            print(f"错误：配置文件不存在 - {args.config}")
+            return 1
+        config = load_config(args.config)
+    elif args.asc or args.dbc:
+        config_path = get_config_path()
+        config = load_config(config_path) if config_path else Config()
+    else:
+        config = get_default_config()
+    config = apply_arguments(config, args)
+    
+    if args.purge_dbc_cache:
+        cache = DBCCache(config.dbc_cache_dir)
+        print(f"已清空DBC缓存: {cache.cache_dir}（删除 {cache.purge()} 个文件）")
+        return 0
     
-    # 创建转换器并运行
-    converter = ASCToCSVConverter(config)
-    success = converter.run()
+    # 配置了asc_files时批量转换，否则转换单个文件
+    if config.asc_files:
+        from batch_converter import BatchConverter
+        success = BatchConverter(config).run()
+    else:
+        converter = ASCToCSVConverter(config)
+        success = converter.run()
     
     if not success:
         print("\n❌ 转换失败！")
@@ -153,4 +433,4 @@ def main():
 
 
 if __name__ == "__main__":
-    exit(main())
\ No newline at end of file
+    sys.exit(main())
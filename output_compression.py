@@ -0,0 +1,162 @@
+# asc_to_csv/output_compression.py
+"""
+输出压缩模块
+以文本流方式打开压缩的输出文件（gzip、xz，以及可选的zstd、lz4），并统计压缩吞吐量
+"""
+
+import io
+import gzip
+import lzma
+import time
+from typing import Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+
+# 压缩方式到文件扩展名后缀的映射
+CSV_COMPRESSIONS = {
+    "none": "",
+    "gzip": ".gz",
+    "xz": ".xz",
+    "zstd": ".zst",
+    "lz4": ".lz4",
+}
+
+# 各压缩方式的级别范围和默认级别：(最小, 最大, 默认)
+COMPRESSION_LEVELS = {
+    "gzip": (1, 9, 6),
+    "xz": (0, 9, 6),
+    "zstd": (1, 22, 3),
+    "lz4": (0, 16, 0),
+}
+
+
+def compression_available(compression: str) -> bool:
+    """
+    判断压缩方式是否可用
+    
+    Args:
+        compression: 压缩方式（见CSV_COMPRESSIONS）
+    
+    Returns:
+        bool: zstd需要安装zstandard，lz4需要安装lz4，其余总是可用
+    """
+    if compression == "zstd":
+        return zstandard is not None
+    if compression == "lz4":
+        return lz4_frame is not None
+    return compression in CSV_COMPRESSIONS
+
+
+class CompressedOutput(io.RawIOBase):
+    """
+    压缩输出流
+    
+    包装压缩库的二进制写入流，统计写入的未压缩字节数和在压缩流中花费的时间
+    （包括压缩和写盘），由上层BufferedWriter按块写入。
+    
+    Attributes:
+        raw_bytes: 已写入的未压缩字节数
+        seconds: 压缩和写盘耗时（秒）
+    """
+    
+    def __init__(self, stream):
+        """
+        初始化压缩输出流
+        
+        Args:
+            stream: 压缩库的二进制写入流
+        """
+        super().__init__()
+        self._stream = stream
+        self.raw_bytes = 0
+        self.seconds = 0.0
+    
+    def writable(self) -> bool:
+        return True
+    
+    def write(self, data) -> int:
+        start = time.perf_counter()
+        self._stream.write(data)
+        self.seconds += time.perf_counter() - start
+        size = len(data)
+        self.raw_bytes += size
+        return size
+    
+    def close(self) -> None:
+        if not self.closed:
+            start = time.perf_counter()
+            self._stream.close()
+            self.seconds += time.perf_counter() - start
+        super().close()
+
+
+def _open_binary(file_path: str, compression: str, level: int, threads: int):
+    """
+    打开压缩库的二进制写入流
+    
+    Args:
+        file_path: 文件路径
+        compression: 压缩方式
+        level: 压缩级别
+        threads: zstd工作线程数
+    
+    Returns:
+        二进制写入流
+    """
+    if compression == "gzip":
+        return gzip.open(file_path, 'wb', compresslevel=level)
+    if compression == "xz":
+        return lzma.open(file_path, 'wb', preset=level)
+    if compression == "zstd":
+        compressor = zstandard.ZstdCompressor(level=level, threads=threads)
+        return compressor.stream_writer(open(file_path, 'wb'), closefd=True)
+    if compression == "lz4":
+        return lz4_frame.open(file_path, 'wb', compression_level=level)
+    raise ValueError(f"未知的压缩方式: {compression}")
+
+
+def open_text_output(
+    file_path: str,
+    compression: str = "none",
+    level: Optional[int] = None,
+    threads: int = 0,
+    encoding: str = "utf-8-sig",
+    buffering: int = io.DEFAULT_BUFFER_SIZE
+) -> Tuple[io.TextIOBase, Optional[CompressedOutput]]:
+    """
+    以文本方式打开输出文件（newline=''，供csv模块使用）
+    
+    Args:
+        file_path: 文件路径（应已包含压缩后缀）
+        compression: 压缩方式（见CSV_COMPRESSIONS）
+        level: 压缩级别，None表示默认级别
+        threads: zstd工作线程数（0为单线程，-1为全部CPU核心），其他压缩方式忽略
+        encoding: 文本编码
+        buffering: 写缓冲大小
+    
+    Returns:
+        Tuple[io.TextIOBase, Optional[CompressedOutput]]: (文本流, 压缩统计)，不压缩时统计为None
+    
+    Raises:
+        RuntimeError: 压缩方式依赖的库未安装
+    """
+    if compression == "none":
+        return open(file_path, 'w', newline='', encoding=encoding, buffering=buffering), None
+    
+    if not compression_available(compression):
+        raise RuntimeError(f"压缩方式{compression}需要安装{'zstandard' if compression == 'zstd' else compression}")
+    if level is None:
+        level = COMPRESSION_LEVELS[compression][2]
+    
+    output = CompressedOutput(_open_binary(file_path, compression, level, threads))
+    text = io.TextIOWrapper(io.BufferedWriter(output, buffering), encoding=encoding, newline='')
+    return text, output
@@ -0,0 +1,265 @@
+# asc_to_csv/parallel_parser.py
+"""
+并行ASC解析模块
+将ASC文件按行对齐的字节区间切分，在多个进程中解析后按顺序合并
+"""
+
+import io
+import os
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from config import Config
+from asc_parser import ASCParser
+from input_compression import detect_input_compression
+from dbc_loader import DBCLoader, SignalSelector
+from dbc_cache import DBCCache
+from sample_store import SampleStore
+
+
+MIN_CHUNK_SIZE = 4 * 1024 * 1024
+
+# 工作进程内的消息映射，由_init_worker在进程启动时加载一次
+_worker_message_map: Dict = {}
+
+
+def split_file_ranges(file_path: str, chunk_count: int, min_chunk_size: int = MIN_CHUNK_SIZE) -> List[Tuple[int, int]]:
+    """
+    将文件切分为按行对齐的字节区间
+    
+    每个边界都落在换行符之后，保证任意一行完整地属于某一个区间。
+    
+    Args:
+        file_path: 文件路径
+        chunk_count: 期望的区间数量
+        min_chunk_size: 单个区间的最小字节数
+    
+    Returns:
+        List[Tuple[int, int]]: (起始偏移, 结束偏移) 列表，按文件顺序排列
+    """
+    file_size = os.path.getsize(file_path)
+    if file_size == 0:
+        return []
+    
+    chunk_count = max(1, min(chunk_count, file_size // max(1, min_chunk_size)))
+    step = file_size // chunk_count
+    
+    boundaries = [0]
+    with open(file_path, 'rb') as f:
+        for i in range(1, chunk_count):
+            f.seek(i * step)
+            f.readline()
+            position = f.tell()
+            if boundaries[-1] < position < file_size:
+                boundaries.append(position)
+    boundaries.append(file_size)
+    
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+def create_asc_parser(config: Config) -> ASCParser:
+    """
+    按配置创建ASC解析器
+    
+    Args:
+        config: 配置对象
+    
+    Returns:
+        ASCParser: workers大于1时为ParallelASCParser
+    """
+    parser_options = dict(
+        sample_interval=config.sample_interval,
+        debug=config.debug,
+        reader=config.asc_reader,
+        default_reducer=config.default_reducer,
+        signal_reducers=config.signal_reducers,
+        decode_cache_size=config.decode_cache_size,
+        compiled_decoders=config.compiled_decoders,
+        batch_decode=config.batch_decode
+    )
+    if config.workers > 1:
+        return ParallelASCParser(
+            config.dbc_files,
+            workers=config.workers,
+            signal_include=config.signal_include,
+            signal_exclude=config.signal_exclude,
+            dbc_cache_dir=config.dbc_cache_dir if config.dbc_cache else None,
+            **parser_options
+        )
+    return ASCParser(**parser_options)
+
+
+def _init_worker(
+    dbc_files: List[str],
+    signal_include: List[str],
+    signal_exclude: List[str],
+    dbc_cache_dir: Optional[str]
+) -> None:
+    """
+    工作进程初始化：加载一次DBC文件
+    
+    Args:
+        dbc_files: DBC文件路径列表
+        signal_include: 信号白名单模式
+        signal_exclude: 信号黑名单模式
+        dbc_cache_dir: DBC缓存目录（空字符串为默认目录），None表示不使用缓存
+    """
+    global _worker_message_map
+    cache = DBCCache(dbc_cache_dir) if dbc_cache_dir is not None else None
+    loader = DBCLoader(SignalSelector(signal_include, signal_exclude), cache)
+    with contextlib.redirect_stdout(io.StringIO()):
+        if not loader.load(dbc_files):
+            raise RuntimeError(f"工作进程加载DBC文件失败: {dbc_files}")
+    _worker_message_map = loader.message_map
+
+
+def _parse_chunk(task: Tuple[str, int, int, Optional[str], Dict[str, Any]]) -> Tuple[SampleStore, Set[str], int]:
+    """
+    在工作进程中解析一个字节区间
+    
+    Args:
+        task: (ASC文件路径, 起始偏移, 结束偏移, 编码, ASCParser构造参数)
+    
+    Returns:
+        Tuple[SampleStore, Set[str], int]: (采样数据, 发现的信号, 原始数据点数)
+    """
+    asc_file, start, end, encoding, parser_options = task
+    parser = ASCParser(**parser_options)
+    parser.parse_range(asc_file, _worker_message_map, start, end, encoding)
+    
+    # 取走结果并替换为空对象，避免解析器析构时清空待返回的数据
+    sampled_data, found_signals = parser.sampled_data, parser.found_signals
+    parser.sampled_data, parser.found_signals = SampleStore(), set()
+    return sampled_data, found_signals, parser.original_count
+
+
+class ParallelASCParser(ASCParser):
+    """
+    多进程ASC解析器
+    
+    接口与ASCParser相同。文件被切分为按行对齐的字节区间，
+    每个工作进程加载一次DBC后解析若干区间，结果按文件顺序合并，
+    因此跨区间边界的同一采样区间仍保留"最后一个值"的语义。
+    
+    Attributes:
+        dbc_files: DBC文件路径列表（工作进程据此加载消息映射）
+        workers: 工作进程数
+        signal_include: 信号白名单模式（工作进程加载DBC时使用，须与主进程一致）
+        signal_exclude: 信号黑名单模式
+        dbc_cache_dir: 工作进程使用的DBC缓存目录，None表示不使用缓存
+    """
+    
+    def __init__(
+        self,
+        dbc_files: List[str],
+        workers: int = 2,
+        signal_include: Optional[List[str]] = None,
+        signal_exclude: Optional[List[str]] = None,
+        dbc_cache_dir: Optional[str] = None,
+        **parser_options
+    ):
+        """
+        初始化并行解析器
+        
+        Args:
+            dbc_files: DBC文件路径列表
+            workers: 工作进程数
+            signal_include: 信号白名单模式
+            signal_exclude: 信号黑名单模式
+            dbc_cache_dir: DBC缓存目录（空字符串为默认目录），None表示不使用缓存
+            **parser_options: ASCParser的构造参数，原样传给每个工作进程
+        """
+        super().__init__(**parser_options)
+        self.dbc_files = list(dbc_files)
+        self.workers = max(1, workers)
+        self.signal_include = list(signal_include or [])
+        self.signal_exclude = list(signal_exclude or [])
+        self.dbc_cache_dir = dbc_cache_dir
+        self.parser_options = parser_options
+    
+    def parse(self, asc_file: str, message_map: Dict) -> bool:
+        """
+        并行解析ASC文件
+        
+        区间只有一个时直接在当前进程解析，避免进程池开销；
+        压缩文件无法按字节区间切分，也在当前进程流式解析。
+        
+        Args:
+            asc_file: ASC文件路径
+            message_map: 消息映射（来自DBCLoader，单区间时使用）
+        
+        Returns:
+            bool: 是否成功解析
+        """
+        try:
+            if detect_input_compression(asc_file) is not None:
+                print("  压缩的ASC文件无法并行切分，改为单进程流式解析")
+                return super().parse(asc_file, message_map)
+            
+            ranges = split_file_ranges(asc_file, self.workers)
+            if len(ranges) <= 1:
+                return super().parse(asc_file, message_map)
+            
+            encoding = None
+            if self.reader != "mmap":
+                encoding = self.detect_encoding(asc_file)
+                if encoding is None:
+                    print(f"错误：无法识别文件编码 - {asc_file}")
+                    return False
+            
+            tasks = [
+                (asc_file, start, end, encoding, self.parser_options)
+                for start, end in ranges
+            ]
+            print(f"  并行解析: {len(tasks)}个区间, {min(self.workers, len(tasks))}个进程")
+            
+            # 进度按已合并的区间报告（区间按文件顺序合并，已合并部分的末尾即已完成的字节数）
+            self._start_progress(ranges[-1][1])
+            with ProcessPoolExecutor(
+                max_workers=min(self.workers, len(tasks)),
+                initializer=_init_worker,
+                initargs=(self.dbc_files, self.signal_include, self.signal_exclude, self.dbc_cache_dir)
+            ) as executor:
+                chunk_results = executor.map(_parse_chunk, tasks)
+                for (_, end), (chunk_data, chunk_signals, chunk_count) in zip(ranges, chunk_results):
+                    self._merge_chunk(chunk_data, chunk_signals, chunk_count)
+                    self._progress.update(end, self.original_count)
+            
+            self._check_memory_usage()
+            self._progress.finish(frames=self.original_count)
+            return True
+        
+        except FileNotFoundError:
+            print(f"错误：文件不存在 - {asc_file}")
+            return False
+        except PermissionError:
+            print(f"错误：无权限访问文件 - {asc_file}")
+            return False
+        except MemoryError:
+            print("错误：内存不足，请尝试增加采样间隔或处理较小的文件")
+            self.clear()
+            return False
+        except BrokenProcessPool as e:
+            print(f"并行解析失败，工作进程异常退出: {e}")
+            return False
+        except Exception as e:
+            print(f"解析ASC文件失败: {type(e).__name__}: {e}")
+            return False
+    
+    def _merge_chunk(self, chunk_data: SampleStore, chunk_signals: Set[str], chunk_count: int) -> None:
+        """
+        合并一个区间的解析结果
+        
+        必须按文件顺序调用：同一采样区间两边都有值时后一个区间的值覆盖前一个，
+        即保留文件中最后出现的值。
+        
+        Args:
+            chunk_data: 区间采样数据
+            chunk_signals: 区间发现的信号
+            chunk_count: 区间原始数据点数
+        """
+        self.sampled_data.merge(chunk_data)
+        self.found_signals.update(chunk_signals)
+        self.original_count += chunk_count
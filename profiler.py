@@ -0,0 +1,202 @@
+# asc_to_csv/profiler.py
+"""
+性能剖析模块
+用cProfile或周期性调用栈采样剖析整个转换或其中一个阶段，剖析结果写入输出目录
+"""
+
+import os
+import sys
+import time
+import pstats
+import cProfile
+import threading
+import contextlib
+from collections import Counter
+from typing import Dict, Iterator, List, Optional
+
+from instrumentation import STAGE_NAMES
+
+
+# 剖析方式：none不剖析，cprofile记录每次函数调用（.pstats），sample周期性采样调用栈（折叠栈，用于火焰图）
+PROFILE_MODES = ("none", "cprofile", "sample")
+
+# 可剖析的范围：all为整个转换，其余为PerformanceReport中的阶段
+# （parse即ASCParser.parse，write为写入数据文件，包括写入过程中流式进行的空值填充）
+PROFILE_STAGES = ("all",) + tuple(name for name in STAGE_NAMES if name != "fill")
+
+# 剖析结果文件名（不含扩展名）
+PROFILE_FILE = "Profile"
+
+# pstats文本报告中列出的函数数
+PROFILE_REPORT_LIMIT = 40
+
+
+class Profiler:
+    """
+    转换性能剖析器
+    
+    cprofile方式确定性地记录剖析范围内的每次函数调用，结果为Profile.pstats
+    （可用snakeviz等工具查看）和按累计耗时排序的Profile.txt；cProfile只记录调用者与被调用者的关系，
+    不记录完整调用栈，因此折叠栈文件由sample方式生成：后台线程每隔interval秒
+    采集一次被剖析线程的调用栈，结果为Profile.collapsed（每行"栈帧;栈帧;... 采样数"，
+    可直接用flamegraph.pl或speedscope生成火焰图）。采样开销小，适合剖析大文件。
+    
+    只剖析调用start()的线程，多进程解析时工作进程中的解码不在剖析范围内。
+    
+    Attributes:
+        mode: 剖析方式（见PROFILE_MODES）
+        stage: 剖析范围（见PROFILE_STAGES）
+        interval: 采样间隔（秒，仅sample方式）
+        seconds: 已剖析的时长（秒）
+    """
+    
+    def __init__(self, mode: str = "none", stage: str = "all", interval: float = 0.005):
+        """
+        初始化剖析器
+        
+        Args:
+            mode: 剖析方式
+            stage: 剖析范围
+            interval: 采样间隔（秒）
+        """
+        self.mode = mode
+        self.stage = stage
+        self.interval = interval
+        self.seconds = 0.0
+        
+        self._profile: Optional[cProfile.Profile] = None
+        self._stacks: Counter = Counter()
+        self._labels: Dict[object, str] = {}
+        self._sampler: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._thread_id: Optional[int] = None
+        self._start_time: Optional[float] = None
+    
+    @property
+    def enabled(self) -> bool:
+        """是否启用剖析"""
+        return self.mode in PROFILE_MODES[1:]
+    
+    @property
+    def running(self) -> bool:
+        """是否正在剖析"""
+        return self._start_time is not None
+    
+    @contextlib.contextmanager
+    def profile(self, stage: str) -> Iterator[None]:
+        """
+        剖析一个范围（stage与剖析范围一致时才剖析）
+        
+        Args:
+            stage: 范围名称（all或阶段名称）
+        """
+        if not self.enabled or stage != self.stage or self.running:
+            yield
+            return
+        
+        self.start()
+        try:
+            yield
+        finally:
+            self.stop()
+    
+    def start(self) -> None:
+        """在当前线程开始剖析（同一阶段多次进入时结果累计）"""
+        if not self.enabled or self.running:
+            return
+        
+        self._start_time = time.perf_counter()
+        if self.mode == "cprofile":
+            if self._profile is None:
+                self._profile = cProfile.Profile()
+            self._profile.enable()
+        else:
+            self._thread_id = threading.get_ident()
+            self._stop_event.clear()
+            self._sampler = threading.Thread(target=self._sample_loop, name="profile-sampler", daemon=True)
+            self._sampler.start()
+    
+    def stop(self) -> None:
+        """停止剖析"""
+        if not self.running:
+            return
+        
+        if self.mode == "cprofile":
+            self._profile.disable()
+        else:
+            self._stop_event.set()
+            self._sampler.join()
+            self._sampler = None
+        self.seconds += time.perf_counter() - self._start_time
+        self._start_time = None
+    
+    def _sample_loop(self) -> None:
+        """采样线程：周期性记录被剖析线程的调用栈"""
+        thread_id = self._thread_id
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(thread_id)
+            if frame is not None:
+                self._stacks[self._collapse(frame)] += 1
+    
+    def _collapse(self, frame) -> str:
+        """
+        将调用栈折叠为一行（从最外层到最内层，以;分隔）
+        
+        Args:
+            frame: 最内层栈帧
+        
+        Returns:
+            str: 折叠后的调用栈
+        """
+        labels = []
+        while frame is not None:
+            code = frame.f_code
+            label = self._labels.get(code)
+            if label is None:
+                # 折叠栈格式以;分隔栈帧
+                label = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+                self._labels[code] = label
+            labels.append(label)
+            frame = frame.f_back
+        labels.reverse()
+        return ";".join(labels)
+    
+    @property
+    def sample_count(self) -> int:
+        """采样次数"""
+        return sum(self._stacks.values())
+    
+    def write(self, output_dir: str) -> List[str]:
+        """
+        将剖析结果写入输出目录
+        
+        Args:
+            output_dir: 输出目录
+        
+        Returns:
+            List[str]: 生成的文件列表，没有剖析数据时为空
+        """
+        self.stop()
+        base_name = os.path.join(output_dir, PROFILE_FILE)
+        created_files = []
+        
+        if self.mode == "cprofile" and self._profile is not None:
+            stats_file = base_name + ".pstats"
+            self._profile.dump_stats(stats_file)
+            created_files.append(stats_file)
+            
+            report_file = base_name + ".txt"
+            with open(report_file, 'w', encoding='utf-8') as f:
+                f.write(f"剖析范围: {self.stage}  剖析时长: {self.seconds:.3f}秒\n\n")
+                stats = pstats.Stats(self._profile, stream=f)
+                stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(PROFILE_REPORT_LIMIT)
+            created_files.append(report_file)
+        
+        elif self.mode == "sample" and self._stacks:
+            collapsed_file = base_name + ".collapsed"
+            with open(collapsed_file, 'w', encoding='utf-8') as f:
+                for stack, count in self._stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+            created_files.append(collapsed_file)
+        
+        return created_files
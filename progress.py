@@ -0,0 +1,231 @@
+# asc_to_csv/progress.py
+"""
+进度报告模块
+解析和写入过程中按时间节流地回调进度（已处理量、总量、速率和预计剩余时间）
+"""
+
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional, TextIO
+
+
+# 两次进度回调之间的最短间隔（秒）
+PROGRESS_INTERVAL = 0.5
+
+# 检查是否需要报告进度的步长：mmap读取时每处理这么多字节，流式读取时每这么多行，写入时每这么多行
+PROGRESS_BYTES = 1024 * 1024
+PROGRESS_LINES = 16384
+PROGRESS_ROWS = 1024
+
+# 阶段名称 -> 显示名称
+PROGRESS_STAGES = {
+    "parse": "解析ASC",
+    "write": "写入文件",
+}
+
+_MB = 1024 * 1024
+
+
+@dataclass
+class Progress:
+    """
+    一次进度报告
+    
+    Attributes:
+        stage: 阶段（见PROGRESS_STAGES）
+        done: 已处理量（parse为已读取的输入文件字节数，压缩文件按压缩后的字节数；
+            write为已写入的采样时间跨度，单位为采样间隔）
+        total: 总量，未知时为None
+        frames: 已解码的数据帧数（write阶段为0）
+        elapsed: 已用时间（秒）
+        finished: 阶段是否已完成
+    """
+    
+    stage: str
+    done: int
+    total: Optional[int]
+    frames: int = 0
+    elapsed: float = 0.0
+    finished: bool = False
+    
+    @property
+    def fraction(self) -> Optional[float]:
+        """完成比例（0~1），总量未知时为None"""
+        if self.finished:
+            return 1.0
+        if not self.total:
+            return None
+        return min(1.0, self.done / self.total)
+    
+    @property
+    def rate(self) -> float:
+        """处理速率（每秒的done增量）"""
+        return self.done / self.elapsed if self.elapsed > 0 else 0.0
+    
+    @property
+    def eta(self) -> Optional[float]:
+        """预计剩余时间（秒），总量未知或尚无速率时为None"""
+        if self.finished:
+            return 0.0
+        if not self.total or self.done <= 0:
+            return None
+        return max(0, self.total - self.done) / self.rate
+
+
+# 进度回调，在执行解析或写入的线程中调用
+ProgressCallback = Callable[[Progress], None]
+
+
+class ProgressReporter:
+    """
+    按时间节流的进度报告器
+    
+    update()可以频繁调用，距上次回调不足interval秒时直接返回；
+    finish()总是回调。callback为None时两者都不做任何事。
+    """
+    
+    def __init__(
+        self,
+        callback: Optional[ProgressCallback],
+        stage: str,
+        total: Optional[int] = None,
+        interval: float = PROGRESS_INTERVAL
+    ):
+        """
+        初始化进度报告器
+        
+        Args:
+            callback: 进度回调，None表示不报告
+            stage: 阶段名称
+            total: 总量，未知时为None
+            interval: 两次回调之间的最短间隔（秒）
+        """
+        self.callback = callback
+        self.stage = stage
+        self.total = total
+        self.interval = interval
+        self._start = time.perf_counter()
+        self._next = self._start + interval
+    
+    def update(self, done: int, frames: int = 0) -> None:
+        """
+        报告当前进度（节流）
+        
+        Args:
+            done: 已处理量
+            frames: 已解码的数据帧数
+        """
+        if self.callback is None:
+            return
+        now = time.perf_counter()
+        if now < self._next:
+            return
+        self._next = now + self.interval
+        self.callback(Progress(self.stage, done, self.total, frames, now - self._start))
+    
+    def finish(self, done: Optional[int] = None, frames: int = 0) -> None:
+        """
+        报告阶段完成
+        
+        Args:
+            done: 已处理量，None表示等于总量
+            frames: 已解码的数据帧数
+        """
+        if self.callback is None:
+            return
+        if done is None:
+            done = self.total or 0
+        self.callback(Progress(self.stage, done, self.total, frames, time.perf_counter() - self._start, True))
+
+
+def format_duration(seconds: float) -> str:
+    """
+    格式化时长
+    
+    Args:
+        seconds: 秒数
+    
+    Returns:
+        str: mm:ss，超过1小时时为h:mm:ss
+    """
+    minutes, seconds = divmod(int(seconds + 0.5), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes:02d}:{seconds:02d}"
+
+
+def format_progress(progress: Progress) -> str:
+    """
+    将进度格式化为一行文本
+    
+    Args:
+        progress: 进度
+    
+    Returns:
+        str: 如"解析ASC  45.2%  1180.3/2611.0 MB  35.1 MB/秒  12,345,678帧  剩余 00:41"
+    """
+    parts = [PROGRESS_STAGES.get(progress.stage, progress.stage)]
+    fraction = progress.fraction
+    if fraction is not None:
+        parts.append(f"{fraction:6.1%}")
+    
+    if progress.stage == "parse":
+        size = f"{progress.done / _MB:.1f}"
+        if progress.total:
+            size += f"/{progress.total / _MB:.1f}"
+        parts.append(f"{size} MB")
+        parts.append(f"{progress.rate / _MB:.1f} MB/秒")
+        parts.append(f"{progress.frames:,}帧")
+    
+    if progress.finished:
+        parts.append(f"用时 {format_duration(progress.elapsed)}")
+    elif progress.eta is not None:
+        parts.append(f"剩余 {format_duration(progress.eta)}")
+    return "  ".join(parts)
+
+
+class ConsoleProgress:
+    """
+    命令行单行进度显示
+    
+    用回车符在同一行上覆盖更新，阶段完成时换行。
+    """
+    
+    def __init__(self, stream: Optional[TextIO] = None):
+        """
+        初始化进度显示
+        
+        Args:
+            stream: 输出流，None表示sys.stderr
+        """
+        self.stream = stream or sys.stderr
+        self._width = 0
+    
+    def __call__(self, progress: Progress) -> None:
+        """
+        显示一次进度
+        
+        Args:
+            progress: 进度
+        """
+        line = format_progress(progress)
+        padding = " " * max(0, self._width - len(line))
+        self._width = 0 if progress.finished else len(line)
+        self.stream.write(f"\r{line}{padding}" + ("\n" if progress.finished else ""))
+        self.stream.flush()
+
+
+def console_progress(enabled: bool = True) -> Optional[ProgressCallback]:
+    """
+    创建命令行进度显示
+    
+    Args:
+        enabled: 是否显示进度
+    
+    Returns:
+        Optional[ProgressCallback]: stderr为终端时返回ConsoleProgress，
+            否则（重定向到文件、批量转换的工作进程等）返回None
+    """
+    if not enabled or not sys.stderr or not sys.stderr.isatty():
+        return None
+    return ConsoleProgress(sys.stderr)
@@ -21,7 +21,7 @@ call venv\Scripts\activate.bat
 REM 运行程序
 echo [信息] 启动转换程序...
 echo.
-python main.py
+python main.py %*
 
 echo.
 echo ========================================
@@ -20,7 +20,7 @@ source venv/bin/activate
 # 运行程序
 echo "[信息] 启动转换程序..."
 echo
-python main.py
+python main.py "$@"
 
 echo
 echo "========================================"
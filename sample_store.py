@@ -0,0 +1,727 @@
+# asc_to_csv/sample_store.py
+"""
+采样数据存储模块
+以列式结构保存每个信号在每个采样区间内的聚合值
+"""
+
+import math
+import bisect
+import fnmatch
+from array import array
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+# present标记：0 无数据，1 数值存于values，2 非数值（如枚举值）存于objects
+_EMPTY = 0
+_NUMBER = 1
+_OBJECT = 2
+
+# 两个有数据的采样区间之间超过这么多个空区间时另起一段，空区间不占用位置
+SEGMENT_GAP = 1024
+
+
+def _as_number(value: Any) -> Optional[Any]:
+    """
+    取值的数值形式（枚举值取其原始数值）
+    
+    Args:
+        value: 解码值
+    
+    Returns:
+        Optional[Any]: int或float，无法转换时返回None
+    """
+    if type(value) is int or type(value) is float:
+        return value
+    number = getattr(value, 'value', None)
+    if type(number) is int or type(number) is float:
+        return number
+    return None
+
+
+class SignalColumn:
+    """
+    单个信号的列存储（聚合方式：last）
+    
+    按采样区间位置保存该区间的最后一个值。整数信号使用array('q')，
+    出现浮点值后转为array('d')；枚举等非数值按位置存放在objects中。
+    其他聚合方式通过子类重写put/get/merge_from实现，在解码时在线累积，
+    每个区间只保存固定大小的状态。
+    
+    Attributes:
+        values: 数值列
+        present: 每个位置的标记（见_EMPTY/_NUMBER/_OBJECT）
+        objects: 位置到非数值的映射
+    """
+    
+    __slots__ = ('values', 'present', 'objects')
+    
+    def __init__(self):
+        """初始化空列"""
+        self.values = array('q')
+        self.present = bytearray()
+        self.objects: Dict[int, Any] = {}
+    
+    def __len__(self) -> int:
+        return len(self.present)
+    
+    def grow(self, size: int) -> None:
+        """
+        扩展列长度，新位置均为空
+        
+        Args:
+            size: 目标长度
+        """
+        missing = size - len(self.present)
+        if missing > 0:
+            self.present.extend(bytes(missing))
+            self.values.frombytes(bytes(missing * self.values.itemsize))
+            self._grow_state(missing)
+    
+    def _grow_state(self, missing: int) -> None:
+        """扩展子类的附加状态列"""
+    
+    def _insert_state(self, position: int, count: int) -> None:
+        """在子类的附加状态列中插入空位置"""
+    
+    def insert(self, position: int, count: int) -> None:
+        """
+        在position处插入空位置（采样区间插入到已有区间之前时使用）
+        
+        Args:
+            position: 插入位置
+            count: 插入的位置数
+        """
+        if position >= len(self.present):
+            return
+        self.present[position:position] = bytes(count)
+        self.values[position:position] = array(self.values.typecode, bytes(count * self.values.itemsize))
+        self.objects = {
+            (index + count if index >= position else index): value
+            for index, value in self.objects.items()
+        }
+        self._insert_state(position, count)
+    
+    def put(self, position: int, value: Any) -> None:
+        """
+        写入一个值，覆盖该位置已有的值
+        
+        Args:
+            position: 采样区间位置
+            value: 解码值
+        """
+        if position >= len(self.present):
+            self.grow(position + 1)
+        
+        value_type = type(value)
+        if value_type is float:
+            if self.values.typecode == 'q':
+                self.values = array('d', self.values)
+        elif value_type is not int:
+            self.objects[position] = value
+            self.present[position] = _OBJECT
+            return
+        
+        try:
+            self.values[position] = value
+        except OverflowError:
+            self.objects[position] = value
+            self.present[position] = _OBJECT
+            return
+        
+        if self.present[position] == _OBJECT:
+            del self.objects[position]
+        self.present[position] = _NUMBER
+    
+    def get(self, position: int) -> Any:
+        """
+        读取一个位置的值
+        
+        Args:
+            position: 采样区间位置
+        
+        Returns:
+            Any: 值，无数据时返回None
+        """
+        if position >= len(self.present):
+            return None
+        flag = self.present[position]
+        if flag == _NUMBER:
+            return self.values[position]
+        if flag == _OBJECT:
+            return self.objects[position]
+        return None
+    
+    def has(self, position: int) -> bool:
+        """判断某位置是否有值"""
+        return position < len(self.present) and self.present[position] != _EMPTY
+    
+    def merge_from(self, source: 'SignalColumn', targets: Sequence[int]) -> None:
+        """
+        合并另一列（按时间顺序位于本列之后的数据）
+        
+        Args:
+            source: 同类型的源列
+            targets: 源列位置到本列位置的映射
+        """
+        self.grow(max(targets, default=-1) + 1)
+        for position, flag in enumerate(source.present):
+            if flag != _EMPTY:
+                self.put(targets[position], source.get(position))
+
+
+class FirstColumn(SignalColumn):
+    """聚合方式：first，保留区间内的第一个值"""
+    
+    __slots__ = ()
+    
+    def put(self, position: int, value: Any) -> None:
+        if not self.has(position):
+            super().put(position, value)
+    
+    def merge_from(self, source: SignalColumn, targets: Sequence[int]) -> None:
+        self.grow(max(targets, default=-1) + 1)
+        for position, flag in enumerate(source.present):
+            if flag != _EMPTY and not self.has(targets[position]):
+                super().put(targets[position], source.get(position))
+
+
+class MinColumn(SignalColumn):
+    """聚合方式：min，保留区间内的最小值（枚举值按原始数值比较）"""
+    
+    __slots__ = ()
+    
+    def put(self, position: int, value: Any) -> None:
+        number = _as_number(value)
+        if number is None:
+            super().put(position, value)
+        elif not (position < len(self.present) and self.present[position] == _NUMBER
+                  and self.values[position] <= number):
+            super().put(position, number)
+
+
+class MaxColumn(SignalColumn):
+    """聚合方式：max，保留区间内的最大值（枚举值按原始数值比较）"""
+    
+    __slots__ = ()
+    
+    def put(self, position: int, value: Any) -> None:
+        number = _as_number(value)
+        if number is None:
+            super().put(position, value)
+        elif not (position < len(self.present) and self.present[position] == _NUMBER
+                  and self.values[position] >= number):
+            super().put(position, number)
+
+
+class CountColumn(SignalColumn):
+    """聚合方式：count，统计区间内的解码次数"""
+    
+    __slots__ = ()
+    
+    def put(self, position: int, value: Any) -> None:
+        if position >= len(self.present):
+            self.grow(position + 1)
+        self.values[position] += 1
+        self.present[position] = _NUMBER
+    
+    def merge_from(self, source: SignalColumn, targets: Sequence[int]) -> None:
+        self.grow(max(targets, default=-1) + 1)
+        for position, flag in enumerate(source.present):
+            if flag != _EMPTY:
+                self.values[targets[position]] += source.values[position]
+                self.present[targets[position]] = _NUMBER
+
+
+class MeanColumn(SignalColumn):
+    """
+    聚合方式：mean，区间内数值的算术平均
+    
+    values保存累加和，counts保存计数，读取时计算平均值。
+    无法转换为数值的值被忽略。
+    """
+    
+    __slots__ = ('counts',)
+    
+    def __init__(self):
+        super().__init__()
+        self.values = array('d')
+        self.counts = array('q')
+    
+    def _grow_state(self, missing: int) -> None:
+        self.counts.frombytes(bytes(missing * self.counts.itemsize))
+    
+    def _insert_state(self, position: int, count: int) -> None:
+        self.counts[position:position] = array('q', bytes(count * self.counts.itemsize))
+    
+    def _accumulate(self, number: float) -> float:
+        """单个值对累加和的贡献"""
+        return number
+    
+    def put(self, position: int, value: Any) -> None:
+        number = _as_number(value)
+        if number is None:
+            return
+        if position >= len(self.present):
+            self.grow(position + 1)
+        self.values[position] += self._accumulate(number)
+        self.counts[position] += 1
+        self.present[position] = _NUMBER
+    
+    def get(self, position: int) -> Any:
+        if position >= len(self.present) or self.present[position] != _NUMBER:
+            return None
+        return self.values[position] / self.counts[position]
+    
+    def merge_from(self, source: SignalColumn, targets: Sequence[int]) -> None:
+        self.grow(max(targets, default=-1) + 1)
+        for position, flag in enumerate(source.present):
+            if flag == _NUMBER:
+                target = targets[position]
+                self.values[target] += source.values[position]
+                self.counts[target] += source.counts[position]
+                self.present[target] = _NUMBER
+
+
+class RmsColumn(MeanColumn):
+    """聚合方式：rms，区间内数值的均方根"""
+    
+    __slots__ = ()
+    
+    def _accumulate(self, number: float) -> float:
+        return number * number
+    
+    def get(self, position: int) -> Any:
+        mean_square = super().get(position)
+        if mean_square is None:
+            return None
+        return math.sqrt(mean_square)
+
+
+# 聚合方式名称到列类型的注册表，可在此扩展新的聚合方式
+REDUCERS: Dict[str, type] = {
+    'last': SignalColumn,
+    'first': FirstColumn,
+    'mean': MeanColumn,
+    'min': MinColumn,
+    'max': MaxColumn,
+    'count': CountColumn,
+    'rms': RmsColumn,
+}
+
+
+def resolve_reducer(signal_name: str, default_reducer: str, signal_reducers: Dict[str, str]) -> str:
+    """
+    确定信号使用的聚合方式
+    
+    signal_reducers的键为通配符模式（fnmatch语法），匹配完整信号名称
+    "DBC文件名::消息名::信号名"，按字典顺序取第一个匹配项。
+    
+    Args:
+        signal_name: 完整信号名称
+        default_reducer: 默认聚合方式
+        signal_reducers: 模式到聚合方式的映射
+    
+    Returns:
+        str: 聚合方式名称
+    
+    Examples:
+        >>> resolve_reducer("a.dbc::BatP3_Volt::P3_MaxCellVlt", "last", {"*CellVlt": "max"})
+        'max'
+        >>> resolve_reducer("a.dbc::VCU::Speed", "last", {"*CellVlt": "max"})
+        'last'
+    """
+    for pattern, reducer in signal_reducers.items():
+        if fnmatch.fnmatchcase(signal_name, pattern):
+            return reducer
+    return default_reducer
+
+
+class SampleStore:
+    """
+    列式采样数据存储
+    
+    信号以整数ID编号，采样区间以整数桶号（round(时间戳 / 采样间隔)）表示。
+    有数据的桶号分为若干段，段内位置连续（位置 = 段起始位置 + 桶号 - 段起始桶号），
+    段与段之间相隔超过SEGMENT_GAP个空区间，这些空区间不占用位置，
+    因此记录中的长时间中断或个别错误时间戳不会使列长度随时间跨度增长。
+    位置按桶号升序排列。每个信号每个区间只保留聚合状态，
+    内存占用与"信号数 × 区间数"成正比，而不是与帧数成正比。
+    
+    Attributes:
+        sample_interval: 采样间隔（秒）
+        default_reducer: 默认聚合方式（REDUCERS中的名称）
+        signal_reducers: 信号名称通配符模式到聚合方式的映射
+        signal_names: 信号ID到完整信号名称的列表
+        signal_ids: 完整信号名称到信号ID的映射
+        columns: 信号ID到列存储的列表
+        segment_buckets: 每段起点的桶号（升序）
+        segment_positions: 每段起点的位置（升序），段的终点为下一段的起点或总位置数
+        occupied: 每个位置是否有任意信号的数据
+    """
+    
+    def __init__(
+        self,
+        sample_interval: float = 0.1,
+        default_reducer: str = "last",
+        signal_reducers: Optional[Dict[str, str]] = None
+    ):
+        """
+        初始化存储
+        
+        Args:
+            sample_interval: 采样间隔（秒）
+            default_reducer: 默认聚合方式
+            signal_reducers: 信号名称通配符模式到聚合方式的映射
+        """
+        self.sample_interval = sample_interval
+        self.default_reducer = default_reducer
+        self.signal_reducers: Dict[str, str] = dict(signal_reducers or {})
+        self.signal_names: List[str] = []
+        self.signal_ids: Dict[str, int] = {}
+        self.columns: List[SignalColumn] = []
+        self.segment_buckets: List[int] = []
+        self.segment_positions: List[int] = []
+        self.occupied = bytearray()
+        self._occupied_count = 0
+        self._layout_version = 0
+    
+    def __len__(self) -> int:
+        """有数据的采样区间数"""
+        return self._occupied_count
+    
+    def column(self, signal_name: str) -> SignalColumn:
+        """
+        获取信号的列，不存在时按其聚合方式创建
+        
+        Args:
+            signal_name: 完整信号名称
+        
+        Returns:
+            SignalColumn: 列存储
+        """
+        signal_id = self.signal_ids.get(signal_name)
+        if signal_id is None:
+            signal_id = len(self.signal_names)
+            self.signal_ids[signal_name] = signal_id
+            self.signal_names.append(signal_name)
+            reducer = resolve_reducer(signal_name, self.default_reducer, self.signal_reducers)
+            self.columns.append(REDUCERS[reducer]())
+        return self.columns[signal_id]
+    
+    def locate(self, bucket: int) -> int:
+        """
+        将桶号转换为列内位置，并标记该区间有数据
+        
+        返回的位置在下一次定位前有效：定位到已有位置之前的桶号时，其后的位置会后移。
+        
+        Args:
+            bucket: 桶号
+        
+        Returns:
+            int: 列内位置
+        """
+        starts = self.segment_buckets
+        occupied = self.occupied
+        if starts and bucket >= starts[-1]:
+            # 最常见的情况：桶号不早于最后一段的起点
+            position = self.segment_positions[-1] + bucket - starts[-1]
+            size = len(occupied)
+            if position >= size:
+                if position - size > SEGMENT_GAP:
+                    starts.append(bucket)
+                    self.segment_positions.append(size)
+                    position = size
+                occupied.extend(bytes(position + 1 - size))
+        else:
+            position = self._locate_before(bucket)
+        
+        if not occupied[position]:
+            occupied[position] = 1
+            self._occupied_count += 1
+        return position
+    
+    def _locate_before(self, bucket: int) -> int:
+        """
+        定位早于最后一段起点的桶号（或第一个桶号），必要时插入位置或新的段
+        
+        Args:
+            bucket: 桶号
+        
+        Returns:
+            int: 列内位置
+        """
+        starts, positions = self.segment_buckets, self.segment_positions
+        if not starts:
+            starts.append(bucket)
+            positions.append(0)
+            self.occupied.append(0)
+            return 0
+        
+        index = bisect.bisect_right(starts, bucket) - 1
+        following = index + 1
+        if index >= 0:
+            position = positions[index] + bucket - starts[index]
+            end = positions[following]
+            if position < end:
+                return position
+            if position - end <= SEGMENT_GAP:
+                # 向后延长前一段
+                self._insert(end, position + 1 - end, following)
+                return position
+        
+        position = positions[following]
+        if starts[following] - bucket - 1 <= SEGMENT_GAP:
+            # 向前延长后一段
+            self._insert(position, starts[following] - bucket, following + 1)
+            starts[following] = bucket
+        else:
+            self._insert(position, 1, following)
+            starts.insert(following, bucket)
+            positions.insert(following, position)
+        return position
+    
+    def _insert(self, position: int, count: int, first_segment: int) -> None:
+        """
+        在position处插入count个空位置
+        
+        Args:
+            position: 插入位置
+            count: 插入的位置数
+            first_segment: 起点需要后移的第一段
+        """
+        self.occupied[position:position] = bytes(count)
+        for column in self.columns:
+            column.insert(position, count)
+        positions = self.segment_positions
+        for index in range(first_segment, len(positions)):
+            positions[index] += count
+        self._layout_version += 1
+    
+    def locate_many(self, buckets: Sequence[int]) -> List[int]:
+        """
+        批量转换桶号为列内位置
+        
+        定位过程中插入过位置时，之前返回的位置可能已经后移，此时按桶号重新查找一遍，
+        返回的位置在本次调用后均有效。
+        
+        Args:
+            buckets: 桶号序列
+        
+        Returns:
+            List[int]: 与buckets同序的列内位置
+        """
+        version = self._layout_version
+        locate = self.locate
+        located = [locate(bucket) for bucket in buckets]
+        if self._layout_version != version:
+            position_of = self.position_of
+            located = [position_of(bucket) for bucket in buckets]
+        return located
+    
+    def segments(self) -> Iterator[Tuple[int, int, int]]:
+        """
+        按时间顺序遍历各段
+        
+        Yields:
+            Tuple[int, int, int]: (起始位置, 结束位置（不含）, 桶号与位置之差)
+        """
+        starts, positions = self.segment_buckets, self.segment_positions
+        for index, start in enumerate(positions):
+            end = positions[index + 1] if index + 1 < len(positions) else len(self.occupied)
+            yield start, end, starts[index] - start
+    
+    def positions(self) -> Iterator[int]:
+        """按时间顺序遍历有数据的位置"""
+        occupied = self.occupied
+        position = occupied.find(1)
+        while position != -1:
+            yield position
+            position = occupied.find(1, position + 1)
+    
+    def buckets(self) -> Iterator[int]:
+        """按时间顺序遍历有数据的桶号"""
+        occupied = self.occupied
+        for start, end, offset in self.segments():
+            position = occupied.find(1, start, end)
+            while position != -1:
+                yield offset + position
+                position = occupied.find(1, position + 1, end)
+    
+    def bucket_at(self, position: int) -> int:
+        """
+        列内位置对应的桶号（超出最后一段时按最后一段外推）
+        
+        Args:
+            position: 列内位置
+        
+        Returns:
+            int: 桶号
+        """
+        index = max(0, bisect.bisect_right(self.segment_positions, position) - 1)
+        return self.segment_buckets[index] + position - self.segment_positions[index]
+    
+    def first_position_from(self, bucket: int) -> int:
+        """
+        桶号不小于bucket的第一个位置
+        
+        Args:
+            bucket: 桶号
+        
+        Returns:
+            int: 列内位置，落在最后一段之后时按最后一段外推
+        """
+        starts, positions = self.segment_buckets, self.segment_positions
+        index = bisect.bisect_right(starts, bucket) - 1
+        if index < 0:
+            return 0
+        position = positions[index] + bucket - starts[index]
+        if index + 1 < len(positions):
+            return min(position, positions[index + 1])
+        return position
+    
+    def time_of(self, bucket: int) -> float:
+        """
+        桶号对应的采样时间
+        
+        与旧版 round(timestamp / interval) * interval 的计算方式一致。
+        
+        Args:
+            bucket: 桶号
+        
+        Returns:
+            float: 采样时间（秒）
+        """
+        return bucket * self.sample_interval
+    
+    def position_of(self, bucket: int) -> Optional[int]:
+        """
+        桶号对应的列内位置
+        
+        Args:
+            bucket: 桶号
+        
+        Returns:
+            Optional[int]: 位置，该区间无数据时返回None
+        """
+        starts, positions = self.segment_buckets, self.segment_positions
+        index = bisect.bisect_right(starts, bucket) - 1
+        if index < 0:
+            return None
+        position = positions[index] + bucket - starts[index]
+        end = positions[index + 1] if index + 1 < len(positions) else len(self.occupied)
+        if position < end and self.occupied[position]:
+            return position
+        return None
+    
+    def merge(self, other: 'SampleStore') -> None:
+        """
+        合并另一个存储（按时间顺序位于本存储之后的数据）
+        
+        同一区间两边都有值时按各列的聚合方式合并（如last保留other的值，
+        first保留本存储的值，mean累加和与计数）。
+        
+        Args:
+            other: 待合并的存储
+        """
+        if not other.segment_buckets:
+            return
+        
+        targets = [-1] * len(other.occupied)
+        for position, target in zip(other.positions(), self.locate_many(list(other.buckets()))):
+            targets[position] = target
+        
+        for signal_name, source in zip(other.signal_names, other.columns):
+            self.column(signal_name).merge_from(source, targets)
+    
+    def rows(self) -> 'AggregatedView':
+        """
+        获取按桶号索引的只读视图（DataProcessor.aggregated_data）
+        
+        Returns:
+            AggregatedView: 视图
+        """
+        return AggregatedView(self)
+    
+    def clear(self) -> None:
+        """清空所有数据"""
+        self.signal_names.clear()
+        self.signal_ids.clear()
+        self.columns.clear()
+        self.segment_buckets = []
+        self.segment_positions = []
+        self.occupied = bytearray()
+        self._occupied_count = 0
+        self._layout_version += 1
+
+
+class RowView(Mapping):
+    """
+    单个采样区间的只读视图
+    
+    行为等同于 {完整信号名称: 值} 字典，只包含该区间有值的信号。
+    """
+    
+    __slots__ = ('_store', '_position')
+    
+    def __init__(self, store: SampleStore, position: int):
+        self._store = store
+        self._position = position
+    
+    def __getitem__(self, signal_name: str) -> Any:
+        signal_id = self._store.signal_ids.get(signal_name)
+        if signal_id is None or not self._store.columns[signal_id].has(self._position):
+            raise KeyError(signal_name)
+        return self._store.columns[signal_id].get(self._position)
+    
+    def __contains__(self, signal_name: object) -> bool:
+        signal_id = self._store.signal_ids.get(signal_name)
+        return signal_id is not None and self._store.columns[signal_id].has(self._position)
+    
+    def __iter__(self) -> Iterator[str]:
+        for signal_name, column in zip(self._store.signal_names, self._store.columns):
+            if column.has(self._position):
+                yield signal_name
+    
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+class AggregatedView(Mapping):
+    """
+    SampleStore的按桶号索引视图
+    
+    行为等同于 {桶号: {完整信号名称: 值}} 字典，按桶号升序迭代（无需排序），
+    按桶号查找即数组下标访问。供DataProcessor和CSVWriter直接使用，不复制数据。
+    """
+    
+    def __init__(self, store: Optional[SampleStore]):
+        self._store = store
+    
+    @property
+    def store(self) -> Optional[SampleStore]:
+        """底层的列式存储（已解除引用时为None）"""
+        return self._store
+    
+    @property
+    def sample_interval(self) -> float:
+        """采样间隔（秒），桶号 × 采样间隔 = 采样时间"""
+        return self._store.sample_interval if self._store else 0.0
+    
+    def __getitem__(self, bucket: int) -> RowView:
+        position = self._store.position_of(bucket) if self._store else None
+        if position is None:
+            raise KeyError(bucket)
+        return RowView(self._store, position)
+    
+    def __iter__(self) -> Iterator[int]:
+        if self._store is None:
+            return iter(())
+        return self._store.buckets()
+    
+    def __len__(self) -> int:
+        return len(self._store) if self._store else 0
+    
+    def clear(self) -> None:
+        """解除对存储的引用（不清空存储本身）"""
+        self._store = None
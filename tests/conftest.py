@@ -0,0 +1,79 @@
+# asc_to_csv/tests/conftest.py
+"""
+测试配置：将项目根目录加入模块搜索路径（项目模块以扁平方式导入），提供共用的合成工作负载和解码测试DBC
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+# 覆盖解码边界情况的DBC：大小端、跨字节、有符号、64位、32/64位浮点、枚举、短消息和多路复用
+EDGE_DBC = """VERSION ""
+
+NS_ :
+
+BS_:
+
+BU_: ECU
+
+BO_ 256 Mixed: 8 ECU
+ SG_ LeU12 : 3|12@1+ (1,0) [0|4095] "" Vector__XXX
+ SG_ LeS9 : 15|9@1- (0.5,-10) [-200|200] "" Vector__XXX
+ SG_ BeS13 : 39|13@0- (1,0) [-4096|4095] "" Vector__XXX
+ SG_ BeU7 : 53|7@0+ (2,1) [0|255] "" Vector__XXX
+ SG_ Mode : 56|3@1+ (1,0) [0|7] "" Vector__XXX
+
+BO_ 257 Floats: 8 ECU
+ SG_ F32 : 0|32@1- (1,0) [0|0] "" Vector__XXX
+ SG_ F32Scaled : 32|32@1- (0.5,1) [0|0] "" Vector__XXX
+
+BO_ 258 Double: 8 ECU
+ SG_ D64 : 0|64@1- (1,0) [0|0] "" Vector__XXX
+
+BO_ 259 Wide: 8 ECU
+ SG_ U64 : 0|64@1+ (1,0) [0|0] "" Vector__XXX
+
+BO_ 260 BeWide: 8 ECU
+ SG_ BeS64 : 7|64@0- (0.001,0) [0|0] "" Vector__XXX
+
+BO_ 261 Short: 5 ECU
+ SG_ S20 : 4|20@1- (0.01,0) [-5242.88|5242.87] "" Vector__XXX
+ SG_ BeU16 : 31|16@0+ (1,0) [0|65535] "" Vector__XXX
+
+BO_ 262 Muxed: 8 ECU
+ SG_ Mux M : 0|8@1+ (1,0) [0|255] "" Vector__XXX
+ SG_ A m0 : 8|8@1+ (1,0) [0|255] "" Vector__XXX
+ SG_ B m1 : 8|16@1+ (1,0) [0|65535] "" Vector__XXX
+
+VAL_ 256 Mode 0 "Off" 1 "On" 7 "Error" ;
+SIG_VALTYPE_ 257 F32 : 1;
+SIG_VALTYPE_ 257 F32Scaled : 1;
+SIG_VALTYPE_ 258 D64 : 2;
+"""
+
+
+@pytest.fixture(scope="session")
+def edge_database():
+    """EDGE_DBC加载后的cantools数据库"""
+    import cantools
+    return cantools.database.load_string(EDGE_DBC, 'dbc')
+
+
+@pytest.fixture(scope="session")
+def workload(tmp_path_factory):
+    """
+    小型合成工作负载（benchmarks.synthetic）：含扩展帧、未映射帧、注释行、
+    大端和有符号信号及枚举信号
+    
+    Returns:
+        Tuple[str, str]: (DBC文件路径, ASC文件路径)
+    """
+    from benchmarks.synthetic import WorkloadSpec, generate_workload
+    
+    spec = WorkloadSpec(duration=5.0, bus_load=2000.0, packs=3, comment_ratio=0.05)
+    dbc_file, asc_file, _ = generate_workload(spec, str(tmp_path_factory.mktemp("workload")))
+    return dbc_file, asc_file
@@ -0,0 +1,69 @@
+# asc_to_csv/tests/test_asc_parser.py
+"""
+ASCParser行解析测试：快速路径接受的行与ASC_PATTERN一致
+"""
+
+import re
+
+import pytest
+
+from asc_parser import ASCParser
+
+
+MESSAGE_MAP = {0x123: {}, 0x18FF50E5: {}}
+
+LINES = [
+    "0.010000 1  123             Rx   d 8 01 02 03 04 05 06 07 08",
+    "   12.5 2 18FF50E5x Tx d 2 0A ff",
+    "1.0 1 123 Rx d 2 0102",
+    "1.0 1 123 Rx d 2 01\t02  ",
+    "-5.000000 1 123 Rx d 1 01",
+    "1e1 1 123 Rx d 1 01",
+    "10 1 123 Rx d 1 01",
+    "10. 1 123 Rx d 1 01",
+    ".5 1 123 Rx d 1 01",
+    "inf 1 123 Rx d 1 01",
+    "nan 1 123 Rx d 1 01",
+    "1.0 CAN1 123 Rx d 1 01",
+    "1.0 -1 123 Rx d 1 01",
+    "1.0 1 0x123 Rx d 1 01",
+    "1.0 1 +123 Rx d 1 01",
+    "1.0 1 1_23 Rx d 1 01",
+    "1.0 1 123xx Rx d 1 01",
+    "1.0 1 456 Rx d 1 01",
+    "1.0 1 123 Rx r 1 01",
+    "1.0 1 123 TxRq d 1 01",
+    "1.0 1 123 Rx d x 01",
+    "1.0 1 123 Rx d 1 0",
+    "1.0 1 123 Rx d 1 01 Length = 1",
+    "// 1.0 1 123 Rx d 1 01",
+    "Begin Triggerblock",
+]
+
+
+def _reference(line):
+    """按ASC_PATTERN解析一行（正则实现），返回 (时间戳, 帧ID, 数据) 或None"""
+    match = re.match(ASCParser.ASC_PATTERN, line.strip())
+    if not match:
+        return None
+    id_token = match.group(3)
+    frame_id = int(id_token[:-1] if id_token.endswith('x') else id_token, 16)
+    if frame_id not in MESSAGE_MAP:
+        return None
+    return float(match.group(1)), frame_id, bytes.fromhex(match.group(6))
+
+
+@pytest.mark.parametrize("as_bytes", [False, True])
+def test_fast_path_accepts_same_lines_as_pattern(as_bytes):
+    parser = ASCParser()
+    decoded = []
+    parser._decode_frame = lambda timestamp, frame_id, data, message_map: decoded.append(
+        (timestamp, frame_id, data)
+    )
+    parse_line = parser._parse_line_bytes if as_bytes else parser._parse_line
+    
+    for line in LINES:
+        decoded.clear()
+        parse_line(line.encode('ascii') if as_bytes else line, MESSAGE_MAP)
+        expected = _reference(line)
+        assert decoded == ([expected] if expected else []), line
@@ -0,0 +1,94 @@
+# asc_to_csv/tests/test_batch_decoder.py
+"""
+批量解码测试：MessageBatch逐帧结果（包括int/float类型和枚举值）与cantools一致
+"""
+
+import random
+
+import cantools
+import pytest
+
+from asc_parser import ASCParser
+from batch_decoder import MessageBatch, numpy_available
+from dbc_loader import DBCLoader
+
+if not numpy_available():
+    pytest.skip("numpy未安装", allow_module_level=True)
+
+
+def _payloads(length, count=300, seed=0):
+    """随机数据域，另加全0和全1"""
+    rng = random.Random(seed)
+    payloads = [bytes(length), b'\xff' * length]
+    payloads += [rng.getrandbits(length * 8).to_bytes(length, 'little') for _ in range(count)]
+    return payloads
+
+
+def _batch_frames(message, payloads, signal_names=None):
+    """批量解码后按帧还原为 {信号: 值}，值以repr比较"""
+    batch = MessageBatch(message.frame_id, message, signal_names)
+    for bucket, data in enumerate(payloads):
+        batch.append(bucket, data)
+    buckets, signals = batch.decode()
+    assert list(buckets) == list(range(len(payloads)))
+    assert len(batch) == 0
+    return [{name: repr(values[row]) for name, values in signals} for row in range(len(payloads))]
+
+
+def _cantools_frames(message, payloads, signal_names=None):
+    return [
+        {
+            name: repr(value) for name, value in message.decode(data).items()
+            if signal_names is None or name in signal_names
+        }
+        for data in payloads
+    ]
+
+
+def test_batch_decode_matches_cantools(edge_database):
+    for message in edge_database.messages:
+        if not MessageBatch.supports(message):
+            continue
+        payloads = _payloads(message.length, seed=message.frame_id)
+        assert _batch_frames(message, payloads) == _cantools_frames(message, payloads), message.name
+
+
+def test_batch_decode_matches_cantools_on_workload_dbc(workload):
+    database = cantools.database.load_file(workload[0])
+    for message in database.messages:
+        assert MessageBatch.supports(message)
+        payloads = _payloads(message.length, count=100, seed=message.frame_id)
+        assert _batch_frames(message, payloads) == _cantools_frames(message, payloads), message.name
+
+
+def test_batch_decode_signal_subset(edge_database):
+    message = edge_database.get_message_by_name("Mixed")
+    selected = {"BeS13", "Mode"}
+    payloads = _payloads(message.length, count=50)
+    assert _batch_frames(message, payloads, selected) == _cantools_frames(message, payloads, selected)
+
+
+def test_supports(edge_database):
+    supported = {message.name for message in edge_database.messages if MessageBatch.supports(message)}
+    assert supported == {"Mixed", "Floats", "Double", "Wide", "BeWide", "Short"}
+
+
+def test_short_payload_is_rejected(edge_database):
+    message = edge_database.get_message_by_name("Mixed")
+    batch = MessageBatch(message.frame_id, message)
+    with pytest.raises(ValueError):
+        batch.append(0, bytes(4))
+    assert len(batch) == 0
+
+
+def test_parser_batch_decode_matches_frame_decode(workload):
+    dbc_file, asc_file = workload
+    loader = DBCLoader()
+    assert loader.load([dbc_file])
+    
+    results = []
+    for batch_decode in (False, True):
+        parser = ASCParser(batch_decode=batch_decode)
+        assert parser.parse(asc_file, loader.message_map)
+        results.append({bucket: dict(row) for bucket, row in parser.sampled_data.rows().items()})
+    assert results[0] and results[0] == results[1]
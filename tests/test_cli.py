@@ -0,0 +1,34 @@
+# asc_to_csv/tests/test_cli.py
+"""
+命令行参数测试
+"""
+
+from config import Config
+from main import apply_arguments, build_arg_parser
+
+
+def test_repeated_list_options_do_not_consume_asc_inputs():
+    args = build_arg_parser().parse_args(
+        ["-d", "a.dbc", "-d", "b.dbc", "--include", "*Volt", "--exclude", "a", "--exclude", "b", "x.asc"]
+    )
+    assert args.dbc == ["a.dbc", "b.dbc"]
+    assert args.include == ["*Volt"]
+    assert args.exclude == ["a", "b"]
+    assert args.asc == ["x.asc"]
+
+
+def test_switches_override_config_in_both_directions():
+    arg_parser = build_arg_parser()
+    enabled = Config(batch_decode=True, compiled_decoders=True, trace_memory=True, show_progress=True)
+    
+    config = apply_arguments(enabled, arg_parser.parse_args(
+        ["--no-batch-decode", "--no-compiled-decoders", "--no-trace-memory", "--no-progress"]
+    ))
+    assert (config.batch_decode, config.compiled_decoders, config.trace_memory, config.show_progress) == (
+        False, False, False, False
+    )
+    
+    config = apply_arguments(Config(), arg_parser.parse_args(["--batch-decode", "--trace-memory"]))
+    assert config.batch_decode and config.trace_memory
+    
+    assert apply_arguments(enabled, arg_parser.parse_args([])) == enabled
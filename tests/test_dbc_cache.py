@@ -0,0 +1,43 @@
+# asc_to_csv/tests/test_dbc_cache.py
+"""
+DBCCache测试：写入失败视为未命中，不留下临时文件
+"""
+
+import os
+
+import pytest
+
+from dbc_cache import DBCCache
+
+
+@pytest.fixture
+def dbc_file(tmp_path):
+    path = tmp_path / "test.dbc"
+    path.write_text('VERSION ""\n', encoding='utf-8')
+    return str(path)
+
+
+def _deep_list(depth):
+    root = node = []
+    for _ in range(depth):
+        child = []
+        node.append(child)
+        node = child
+    return root
+
+
+@pytest.mark.parametrize("messages", [[lambda: None], [_deep_list(200_000)]], ids=["unpicklable", "recursion"])
+def test_failed_store_is_a_cache_miss(tmp_path, dbc_file, messages, capsys):
+    cache = DBCCache(str(tmp_path / "cache"))
+    
+    cache.store_messages(dbc_file, messages)
+    
+    assert "警告：写入DBC缓存失败" in capsys.readouterr().out
+    assert os.listdir(cache.cache_dir) == []
+    assert cache.load_messages(dbc_file) is None
+
+
+def test_store_and_load_round_trip(tmp_path, dbc_file):
+    cache = DBCCache(str(tmp_path / "cache"))
+    cache.store_messages(dbc_file, ["message"])
+    assert cache.load_messages(dbc_file) == ["message"]
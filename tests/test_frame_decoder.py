@@ -0,0 +1,83 @@
+# asc_to_csv/tests/test_frame_decoder.py
+"""
+专用解码器（compile_message）与FrameDecoder测试：解码结果（包括int/float类型和枚举值）与cantools一致
+"""
+
+import random
+
+import cantools
+import pytest
+
+from frame_decoder import FrameDecoder, compile_message
+
+
+def _payloads(length, count=300, seed=0):
+    """随机数据域，另加全0和全1"""
+    rng = random.Random(seed)
+    payloads = [bytes(length), b'\xff' * length]
+    payloads += [rng.getrandbits(length * 8).to_bytes(length, 'little') for _ in range(count)]
+    return payloads
+
+
+def _typed(decoded):
+    """按repr比较，区分1与1.0并使NaN可比较"""
+    return {name: repr(value) for name, value in decoded.items()}
+
+
+def _messages(database):
+    return [message for message in database.messages if not message.is_multiplexed()]
+
+
+def test_compiled_decoder_matches_cantools(edge_database):
+    for message in _messages(edge_database):
+        decode = compile_message(message)
+        assert decode is not None, message.name
+        for data in _payloads(message.length, seed=message.frame_id):
+            assert _typed(decode(data)) == _typed(message.decode(data)), (message.name, data.hex())
+
+
+def test_compiled_decoder_matches_cantools_on_workload_dbc(workload):
+    database = cantools.database.load_file(workload[0])
+    for message in database.messages:
+        decode = compile_message(message)
+        for data in _payloads(message.length, count=100, seed=message.frame_id):
+            assert _typed(decode(data)) == _typed(message.decode(data)), (message.name, data.hex())
+
+
+def test_compiled_decoder_signal_subset(edge_database):
+    message = edge_database.get_message_by_name("Mixed")
+    selected = {"LeS9", "Mode"}
+    decode = compile_message(message, selected)
+    for data in _payloads(message.length, count=50):
+        expected = {name: value for name, value in message.decode(data).items() if name in selected}
+        assert _typed(decode(data)) == _typed(expected)
+
+
+def test_unsupported_messages_fall_back_to_cantools(edge_database):
+    message = edge_database.get_message_by_name("Muxed")
+    assert compile_message(message) is None
+    
+    decoder = FrameDecoder({message.frame_id: {'message': message}}, compiled=True)
+    for data in (bytes(8), bytes([1]) + bytes(7), bytes([1, 2, 3]) + bytes(5)):
+        assert decoder.decode(message.frame_id, data) == message.decode(data)
+
+
+@pytest.mark.parametrize("cache_size", [0, 16])
+def test_frame_decoder_matches_cantools(edge_database, cache_size):
+    message_map = {message.frame_id: {'message': message} for message in _messages(edge_database)}
+    decoder = FrameDecoder(message_map, cache_size=cache_size, compiled=True)
+    rng = random.Random(1)
+    for _ in range(2000):
+        message = message_map[rng.choice(list(message_map))]['message']
+        data = bytes(rng.choice([0, 0xff, 0x5a]) for _ in range(message.length)) if rng.random() < 0.5 else (
+            rng.getrandbits(message.length * 8).to_bytes(message.length, 'little')
+        )
+        assert _typed(decoder.decode(message.frame_id, data)) == _typed(message.decode(data))
+
+
+def test_short_payload_raises_like_cantools(edge_database):
+    message = edge_database.get_message_by_name("Mixed")
+    with pytest.raises(Exception):
+        message.decode(bytes(4))
+    with pytest.raises(ValueError):
+        compile_message(message)(bytes(4))
@@ -0,0 +1,73 @@
+# asc_to_csv/tests/test_gap_fill.py
+"""
+按列填充测试：bucket方式的ColumnFiller与逐行实现CSVWriter._fill_missing_values结果一致，
+包括跨ROW_CHUNK分块边界的填充区间
+"""
+
+import random
+
+import pytest
+
+from csv_writer import CSVWriter
+from sample_store import SampleStore
+
+gap_fill = pytest.importorskip("gap_fill")
+if not gap_fill.fill_available():
+    pytest.skip("numpy未安装", allow_module_level=True)
+
+
+SIGNALS = ["a", "b", "c", "missing"]
+
+
+def _random_store(bucket_count, seed=0, start=0):
+    """稀疏的随机存储：各信号取值频率不同，值包括int、float和枚举字符串"""
+    rng = random.Random(seed)
+    store = SampleStore(0.1)
+    for bucket in range(start, start + bucket_count):
+        if rng.random() < 0.3:
+            store.column("a").put(store.locate(bucket), rng.randint(-5, 5))
+        if rng.random() < 0.05:
+            store.column("b").put(store.locate(bucket), rng.random())
+        if rng.random() < 0.01:
+            store.column("c").put(store.locate(bucket), rng.choice(["On", "Off"]))
+    return store
+
+
+def _legacy_rows(store, fill_interval):
+    writer = CSVWriter(".", fill_interval=fill_interval, sample_interval=0.1)
+    data = {bucket: dict(row) for bucket, row in store.rows().items()}
+    return list(writer._fill_missing_values(sorted(data), data, SIGNALS))
+
+
+def _column_rows(store, fill_interval):
+    return list(gap_fill.ColumnFiller(store, SIGNALS, "bucket", fill_interval).rows())
+
+
+@pytest.mark.parametrize("fill_interval", [0.5, 0.25, 1.0, 3.0])
+def test_bucket_fill_matches_legacy_rows(fill_interval):
+    # 桶数超过ROW_CHUNK，且起点不在填充区间边界上
+    store = _random_store(3 * gap_fill.ROW_CHUNK + 123, seed=int(fill_interval * 100), start=7)
+    assert _column_rows(store, fill_interval) == _legacy_rows(store, fill_interval)
+
+
+def test_window_spanning_row_chunk_boundary():
+    # 填充区间 [4090, 4100) 跨过第一个分块边界ROW_CHUNK=4096，
+    # 区间内唯一的b值在边界之后，边界之前的行也应被填充
+    store = SampleStore(0.1)
+    for bucket in range(0, 4200, 3):
+        store.column("a").put(store.locate(bucket), bucket)
+    store.column("b").put(store.locate(gap_fill.ROW_CHUNK + 2), 1.5)
+    
+    rows = _column_rows(store, 1.0)
+    assert rows == _legacy_rows(store, 1.0)
+    filled = {tick: values[1] for tick, values in rows if 4090 <= tick < 4100}
+    assert filled and all(value == 1.5 for value in filled.values())
+
+
+@pytest.mark.parametrize("row_chunk", [1, 7, 64])
+def test_small_row_chunks_match_legacy_rows(monkeypatch, row_chunk):
+    # 填充区间比分块大得多，每个区间都跨过多个分块边界
+    monkeypatch.setattr(gap_fill, "ROW_CHUNK", row_chunk)
+    store = _random_store(2000, seed=row_chunk)
+    for fill_interval in (0.5, 2.0, 0.3):
+        assert _column_rows(store, fill_interval) == _legacy_rows(store, fill_interval)
@@ -0,0 +1,101 @@
+# asc_to_csv/tests/test_parallel_parser.py
+"""
+并行解析测试：split_file_ranges按行对齐切分且每行只属于一个区间，
+按区间解析后合并的结果与整个文件解析一致
+"""
+
+import functools
+
+import pytest
+
+import parallel_parser
+from asc_parser import ASCParser
+from dbc_loader import DBCLoader
+from parallel_parser import ParallelASCParser, split_file_ranges
+
+
+def _line_starts(path):
+    with open(path, 'rb') as f:
+        content = f.read()
+    starts, position = [], 0
+    for line in content.splitlines(keepends=True):
+        starts.append(position)
+        position += len(line)
+    return starts, len(content)
+
+
+def _assert_ranges_cover_lines(path, ranges):
+    starts, size = _line_starts(path)
+    assert ranges[0][0] == 0 and ranges[-1][1] == size
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert end == start
+        assert start in starts
+    for line_start in starts:
+        assert sum(start <= line_start < end for start, end in ranges) == 1
+
+
+def _sampled(parser):
+    return {bucket: dict(row) for bucket, row in parser.sampled_data.rows().items()}
+
+
+@pytest.fixture(scope="module")
+def message_map(workload):
+    loader = DBCLoader()
+    assert loader.load([workload[0]])
+    return loader.message_map
+
+
+@pytest.fixture(scope="module")
+def whole_file(workload, message_map):
+    parser = ASCParser()
+    assert parser.parse(workload[1], message_map)
+    return _sampled(parser), parser.original_count
+
+
+@pytest.mark.parametrize("chunk_count", [1, 2, 3, 7, 64])
+def test_split_covers_every_line_once(workload, chunk_count):
+    ranges = split_file_ranges(workload[1], chunk_count, min_chunk_size=1)
+    assert 1 <= len(ranges) <= chunk_count
+    _assert_ranges_cover_lines(workload[1], ranges)
+
+
+def test_split_boundary_on_line_start(tmp_path):
+    # 等长的行，i * step 恰好落在行首：该行整行归入前一个区间
+    line = b"1.000000 1  100  Rx   d 1 00\n"
+    path = tmp_path / "equal.asc"
+    path.write_bytes(line * 12)
+    
+    ranges = split_file_ranges(str(path), 4, min_chunk_size=1)
+    boundaries = [0, 4, 7, 10, 12]
+    assert ranges == [(start * len(line), end * len(line)) for start, end in zip(boundaries, boundaries[1:])]
+    _assert_ranges_cover_lines(str(path), ranges)
+
+
+def test_split_small_and_empty_files(tmp_path):
+    path = tmp_path / "small.asc"
+    path.write_bytes(b"no newline at end")
+    assert split_file_ranges(str(path), 8, min_chunk_size=1) == [(0, 17)]
+    path.write_bytes(b"")
+    assert split_file_ranges(str(path), 8, min_chunk_size=1) == []
+
+
+@pytest.mark.parametrize("reader", ["mmap", "text"])
+@pytest.mark.parametrize("chunk_count", [2, 5])
+def test_range_parse_matches_whole_file(workload, message_map, whole_file, reader, chunk_count):
+    asc_file = workload[1]
+    encoding = ASCParser.detect_encoding(asc_file)
+    merged = ParallelASCParser([workload[0]], reader=reader)
+    for start, end in split_file_ranges(asc_file, chunk_count, min_chunk_size=1):
+        parser = ASCParser(reader=reader)
+        parser.parse_range(asc_file, message_map, start, end, encoding)
+        merged._merge_chunk(parser.sampled_data, parser.found_signals, parser.original_count)
+    assert (_sampled(merged), merged.original_count) == whole_file
+
+
+def test_parallel_parse_matches_whole_file(monkeypatch, workload, message_map, whole_file):
+    monkeypatch.setattr(
+        parallel_parser, "split_file_ranges", functools.partial(split_file_ranges, min_chunk_size=1)
+    )
+    parser = ParallelASCParser([workload[0]], workers=3)
+    assert parser.parse(workload[1], message_map)
+    assert (_sampled(parser), parser.original_count) == whole_file
@@ -0,0 +1,106 @@
+# asc_to_csv/tests/test_sample_store.py
+"""
+SampleStore测试：长时间中断不占用位置，结果与逐区间字典一致
+"""
+
+import pytest
+
+from sample_store import SEGMENT_GAP, SampleStore
+
+
+GAP = 2_000_000  # 约200000秒（采样间隔0.1秒）
+
+
+def _store_from(observations, reducer="last"):
+    """按 (桶号, 信号, 值) 顺序写入一个存储"""
+    store = SampleStore(0.1, reducer)
+    for bucket, signal, value in observations:
+        store.column(signal).put(store.locate(bucket), value)
+    return store
+
+
+def _as_dict(store):
+    return {bucket: dict(row) for bucket, row in store.rows().items()}
+
+
+def test_large_gap_does_not_allocate_empty_buckets():
+    observations = [(bucket, "a", bucket) for bucket in range(10)]
+    observations += [(GAP + bucket, "a", bucket) for bucket in range(10)]
+    store = _store_from(observations)
+    
+    assert len(store.occupied) == 20
+    assert len(store.columns[0]) == 20
+    assert store.segment_buckets == [0, GAP]
+    assert list(store.buckets()) == list(range(10)) + [GAP + bucket for bucket in range(10)]
+    assert store.rows()[GAP + 3] == {"a": 3}
+    assert store.position_of(GAP // 2) is None
+
+
+def test_small_gap_stays_in_one_segment():
+    store = _store_from([(0, "a", 1), (SEGMENT_GAP + 1, "a", 2)])
+    assert store.segment_buckets == [0]
+    assert len(store.occupied) == SEGMENT_GAP + 2
+
+
+@pytest.mark.parametrize("reducer", ["last", "first", "mean", "count"])
+def test_out_of_order_buckets_across_segments(reducer):
+    # 先写入中断之后的数据，再写入之前、之间和两段边界附近的数据
+    buckets = [GAP, GAP + 5, 3, GAP - 2, 0, GAP // 2, 4, GAP + 1, GAP // 2 + 1, GAP, -GAP]
+    observations = [(bucket, "a", index) for index, bucket in enumerate(buckets)]
+    store = _store_from(observations, reducer)
+    
+    expected = {}
+    for bucket, _, value in observations:
+        expected.setdefault(bucket, []).append(value)
+    assert list(store.buckets()) == sorted(expected)
+    for bucket, values in expected.items():
+        row = store.rows()[bucket]
+        if reducer == "last":
+            assert row == {"a": values[-1]}
+        elif reducer == "first":
+            assert row == {"a": values[0]}
+        elif reducer == "mean":
+            assert row == {"a": pytest.approx(sum(values) / len(values))}
+        else:
+            assert row == {"a": len(values)}
+    assert len(store.occupied) < 100
+
+
+def test_merge_with_gaps_matches_single_store():
+    first = [(bucket, "a", bucket) for bucket in (0, 1, 5, GAP)]
+    second = [(bucket, "b", -bucket) for bucket in (GAP, GAP + 2, 3 * GAP)] + [(GAP + 2, "a", 7)]
+    merged = _store_from(first)
+    merged.merge(_store_from(second))
+    
+    assert _as_dict(merged) == _as_dict(_store_from(first + second))
+    assert len(merged.occupied) < 100
+
+
+def test_locate_many_positions_stay_valid_after_insert():
+    store = _store_from([(GAP, "a", 0)])
+    buckets = [GAP + 1, 10, 0, GAP + 1]
+    positions = store.locate_many(buckets)
+    assert positions == [store.position_of(bucket) for bucket in buckets]
+
+
+@pytest.mark.parametrize("strategy", ["bucket", "ffill", "linear"])
+def test_fill_across_segments_matches_contiguous_store(monkeypatch, strategy):
+    gap_fill = pytest.importorskip("gap_fill")
+    if not gap_fill.fill_available():
+        pytest.skip("numpy未安装")
+    
+    observations = [(bucket, "a", float(bucket)) for bucket in (0, 3, 9)]
+    observations += [(bucket, "b", 1) for bucket in (2, 40, 41)]
+    observations += [(bucket, "a", float(bucket)) for bucket in (45, 47)]
+    
+    monkeypatch.setattr("sample_store.SEGMENT_GAP", 3)
+    segmented = _store_from(observations)
+    monkeypatch.setattr("sample_store.SEGMENT_GAP", 10 ** 9)
+    contiguous = _store_from(observations)
+    assert len(segmented.segment_buckets) > 1
+    
+    def fill(store):
+        filler = gap_fill.ColumnFiller(store, ["a", "b"], strategy, fill_interval=0.5, max_age=1.0)
+        return list(filler.rows())
+    
+    assert fill(segmented) == fill(contiguous)